@@ -0,0 +1,75 @@
+"""
+Benchmark de rendimiento de execute_many.
+
+Compara el bucle genérico de DatabaseHandler (una sentencia por fila) con
+el execute_many nativo de cada handler (executemany / execute_values).
+
+Uso:
+    python benchmarks/bench_execute_many.py --connection mysql_local --rows 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.connection import DatabaseHandler
+from src.tools.crud_tools import _resolve_connection
+
+TABLE = "mcp_bench_execute_many"
+
+
+def _run(label: str, execute, handler, rows) -> float:
+    """Ejecuta una variante sobre la tabla vacía y devuelve filas/segundo"""
+    handler.execute_query(f"DELETE FROM {TABLE}")
+    handler.commit()
+    
+    started = time.perf_counter()
+    affected = execute(f"INSERT INTO {TABLE} (id, name, amount) VALUES (%s, %s, %s)", rows)
+    elapsed = time.perf_counter() - started
+    
+    rate = len(rows) / elapsed
+    print(f"  {label:<28} {affected:>8} filas  {elapsed:>8.3f} s  {rate:>12,.0f} filas/s")
+    return rate
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de execute_many")
+    parser.add_argument("--connection", default=None, help="Conexión configurada (default: la de por defecto)")
+    parser.add_argument("--rows", type=int, default=10000, help="Filas a insertar por variante")
+    parser.add_argument("--page-size", type=int, default=1000, help="Filas por página del execute_many nativo")
+    args = parser.parse_args()
+    
+    _, handler_class, handler_kwargs = _resolve_connection(args.connection)
+    handler = handler_class(**handler_kwargs)
+    handler.connect()
+    
+    rows = [(i, f"name-{i}", i * 0.5) for i in range(args.rows)]
+    
+    try:
+        handler.execute_query(f"DROP TABLE IF EXISTS {TABLE}")
+        handler.execute_query(f"CREATE TABLE {TABLE} (id INT PRIMARY KEY, name VARCHAR(64), amount DECIMAL(12, 2))")
+        handler.commit()
+        
+        print("=" * 70)
+        print(f"⏱️  execute_many con {handler_class.__name__}: {args.rows} filas")
+        print("=" * 70)
+        
+        loop = _run("bucle genérico", lambda q, r: DatabaseHandler.execute_many(handler, q, r), handler, rows)
+        native = _run(f"nativo (page_size={args.page_size})",
+                      lambda q, r: handler.execute_many(q, r, page_size=args.page_size), handler, rows)
+        
+        print(f"\n🚀 Aceleración: x{native / loop:.1f}")
+    finally:
+        handler.execute_query(f"DROP TABLE IF EXISTS {TABLE}")
+        handler.commit()
+        handler.disconnect()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
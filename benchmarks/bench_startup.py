@@ -0,0 +1,135 @@
+"""
+Benchmark del arranque en frío del servidor.
+
+Lanza intérpretes nuevos y mide:
+- el tiempo de importación de src.server (-X importtime), separando el coste
+  de los módulos propios del de fastmcp y demás dependencias;
+- que los drivers (pymysql, psycopg2) no se cargan al arrancar;
+- el tiempo hasta la primera respuesta de una herramienta (test_server y
+  list_connections), medido desde que se lanza el proceso.
+
+Sale con código 1 si se supera algún presupuesto o se carga un driver, para
+poder usarlo como comprobación en CI.
+
+Uso:
+    python benchmarks/bench_startup.py --runs 5 --budget-ms 2500 --own-budget-ms 200
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que no deben cargarse solo por arrancar el servidor
+LAZY_MODULES = ("pymysql", "psycopg2", "http.server")
+
+_FIRST_RESPONSE = """
+import json, sys, time
+started = time.perf_counter()
+from src import server
+imported = time.perf_counter()
+server.test_server()
+server.list_connections()
+answered = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_tool_ms": (answered - imported) * 1000,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+
+def _importtime() -> dict:
+    """Importa src.server con -X importtime y resume el resultado"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.server"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    own_us = 0
+    total_us = 0
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue  # cabecera
+        name = name.strip()
+        modules[name] = cumulative_us
+        if name == "src" or name.startswith("src."):
+            own_us += self_us
+        if name == "src.server":
+            total_us = cumulative_us
+    return {
+        "total_ms": total_us / 1000,
+        "own_ms": own_us / 1000,
+        "loaded": [m for m in LAZY_MODULES if m in modules]
+    }
+
+
+def _first_response() -> dict:
+    """Lanza el servidor en frío y mide hasta la primera respuesta de herramienta"""
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", _FIRST_RESPONSE],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["wall_ms"] = wall_ms
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de arranque en frío del servidor")
+    parser.add_argument("--runs", type=int, default=5, help="Procesos lanzados por medida")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Máximo (mediana) hasta la primera respuesta, desde el lanzamiento del proceso")
+    parser.add_argument("--own-budget-ms", type=float, default=None,
+                        help="Máximo (mediana) de importación de los módulos propios (src.*)")
+    args = parser.parse_args()
+    
+    imports = [_importtime() for _ in range(args.runs)]
+    responses = [_first_response() for _ in range(args.runs)]
+    
+    total_ms = statistics.median(r["total_ms"] for r in imports)
+    own_ms = statistics.median(r["own_ms"] for r in imports)
+    import_ms = statistics.median(r["import_ms"] for r in responses)
+    tool_ms = statistics.median(r["first_tool_ms"] for r in responses)
+    wall_ms = statistics.median(r["wall_ms"] for r in responses)
+    loaded = sorted({m for r in imports + responses for m in r["loaded"]})
+    
+    print("=" * 70)
+    print(f"🚀 Arranque en frío de src.server (mediana de {args.runs} procesos)")
+    print("=" * 70)
+    print(f"  import src.server (importtime)   {total_ms:>9.1f} ms")
+    print(f"    de ello módulos propios         {own_ms:>9.1f} ms")
+    print(f"  import src.server (reloj)         {import_ms:>9.1f} ms")
+    print(f"  primera herramienta               {tool_ms:>9.1f} ms")
+    print(f"  lanzamiento -> primera respuesta  {wall_ms:>9.1f} ms")
+    print(f"  módulos diferidos cargados        {', '.join(loaded) or 'ninguno'}")
+    
+    failures = []
+    if loaded:
+        failures.append(f"se cargaron al arrancar: {', '.join(loaded)}")
+    if args.budget_ms is not None and wall_ms > args.budget_ms:
+        failures.append(f"primera respuesta {wall_ms:.0f} ms > {args.budget_ms:.0f} ms")
+    if args.own_budget_ms is not None and own_ms > args.own_budget_ms:
+        failures.append(f"módulos propios {own_ms:.0f} ms > {args.own_budget_ms:.0f} ms")
+    
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Dentro de presupuesto")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+Suite de benchmarks de latencia y rendimiento de las herramientas.
+
+Ejercita las funciones de crud_tools y las herramientas async de server.py
+(incluido el executor y el pool) contra una conexión configurada. Si el
+servidor no responde, o con --standin, usa un handler SQLite en proceso.
+
+Mide ops/s y latencias p50/p95/p99 de:
+    - CRUD de una fila (insert, get_by_id, update, delete)
+    - bulk_insert con varios tamaños de lote
+    - select_records y paginate_records sobre una tabla grande
+    - contención del pool (llamadas concurrentes a las herramientas del servidor)
+
+Uso:
+    python benchmarks/bench_tools.py --connection mysql_local --save mysql
+    python benchmarks/bench_tools.py --standin --compare standin
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.config import get_config
+from src.tools import crud_tools
+from src import server
+
+from benchmarks.standin import SQLiteHandler
+
+BASELINE_DIR = os.path.join(ROOT, "benchmarks", "baselines")
+TABLE = "mcp_bench_tools"
+
+# DDL de la tabla de pruebas por handler
+_DDL = {
+    "MySQLHandler": f"CREATE TABLE {TABLE} (id INT PRIMARY KEY, name VARCHAR(64), "
+                    f"amount DECIMAL(12, 2), active TINYINT, note TEXT)",
+    "PostgreSQLHandler": f"CREATE TABLE {TABLE} (id INTEGER PRIMARY KEY, name VARCHAR(64), "
+                         f"amount NUMERIC(12, 2), active SMALLINT, note TEXT)",
+    "SQLiteHandler": f"CREATE TABLE {TABLE} (id INTEGER PRIMARY KEY, name TEXT, "
+                     f"amount REAL, active INTEGER, note TEXT)",
+}
+
+
+def _record(i: int) -> Dict[str, Any]:
+    """Fila de prueba determinista"""
+    return {"id": i, "name": f"name-{i}", "amount": round(i * 0.25, 2), "active": i % 2, "note": "x" * 32}
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentil por rango más cercano sobre valores ya ordenados"""
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def _summary(latencies: List[float], elapsed: float, rows: Optional[int] = None) -> Dict[str, Any]:
+    """Resume latencias (segundos) en ops/s y percentiles en milisegundos"""
+    ordered = sorted(latencies)
+    result = {
+        "ops": len(latencies),
+        "ops_per_sec": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(_percentile(ordered, 0.99) * 1000, 3),
+    }
+    if rows is not None:
+        result["rows_per_sec"] = round(rows / elapsed, 1) if elapsed else None
+    return result
+
+
+def _check(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Las herramientas devuelven errores como dict: abortar el benchmark si ocurre"""
+    if result.get("status") == "error":
+        raise RuntimeError(result.get("error"))
+    return result
+
+
+def measure(operation: Callable[[int], Any], iterations: int, rows_per_op: Optional[int] = None) -> Dict[str, Any]:
+    """Ejecuta operation(i) iterations veces de forma secuencial"""
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    return _summary(latencies, elapsed, rows_per_op * iterations if rows_per_op else None)
+
+
+def measure_concurrent(make_call: Callable[[int], Any], iterations: int, concurrency: int) -> Dict[str, Any]:
+    """Lanza iterations corutinas con como mucho concurrency en vuelo"""
+    async def run() -> List[float]:
+        gate = asyncio.Semaphore(concurrency)
+        latencies: List[float] = []
+        
+        async def one(i: int) -> None:
+            async with gate:
+                t0 = time.perf_counter()
+                _check(await make_call(i))
+                latencies.append(time.perf_counter() - t0)
+        
+        await asyncio.gather(*(one(i) for i in range(iterations)))
+        return latencies
+    
+    started = time.perf_counter()
+    latencies = asyncio.run(run())
+    return _summary(latencies, time.perf_counter() - started)
+
+
+def _use_standin(path: str, query_timeout: float) -> None:
+    """Redirige la resolución de conexiones de crud_tools al handler SQLite"""
+    def resolve(connection_name: Optional[str] = None, database: Optional[str] = None) -> tuple:
+        return "standin", SQLiteHandler, dict(
+            host="standin", port=0, user="", password="", database=path, query_timeout=query_timeout
+        )
+    crud_tools._resolve_connection = resolve
+
+
+def _server_available(connection_name: Optional[str]) -> bool:
+    """Comprueba si la conexión configurada responde"""
+    try:
+        with crud_tools.pooled_handler(connection_name) as handler:
+            return handler.test_connection().get("status") == "success"
+    except Exception as e:
+        print(f"⚠️  Servidor no disponible ({e}); usando handler SQLite en proceso")
+        return False
+
+
+def run_suite(connection_name: Optional[str], args) -> Dict[str, Any]:
+    """Ejecuta todos los escenarios y devuelve sus resultados"""
+    results: Dict[str, Any] = {}
+    
+    with crud_tools.pooled_handler(connection_name) as handler:
+        backend = handler.__class__.__name__
+        handler.execute_query(f"DROP TABLE IF EXISTS {TABLE}")
+        handler.execute_query(_DDL[backend])
+        handler.commit()
+    crud_tools.refresh_schema_cache(connection_name)
+    
+    n = args.iterations
+    next_id = 1
+    
+    # CRUD de una fila
+    results["insert_record"] = measure(
+        lambda i: _check(crud_tools.insert_record(TABLE, _record(next_id + i), connection_name)), n)
+    results["get_record_by_id"] = measure(
+        lambda i: _check(crud_tools.get_record_by_id(TABLE, next_id + i, connection_name=connection_name)), n)
+    results["update_record"] = measure(
+        lambda i: _check(crud_tools.update_record(TABLE, next_id + i, {"amount": i}, connection_name=connection_name)), n)
+    results["delete_record"] = measure(
+        lambda i: _check(crud_tools.delete_record(TABLE, next_id + i, connection_name=connection_name)), n)
+    next_id += n
+    
+    # bulk_insert con varios tamaños
+    for size in args.bulk_sizes:
+        repeats = max(1, min(n, args.bulk_rows // size))
+        
+        def insert_batch(i: int, size: int = size) -> None:
+            nonlocal next_id
+            records = [_record(next_id + k) for k in range(size)]
+            next_id += size
+            _check(crud_tools.bulk_insert(TABLE, records, connection_name))
+        
+        results[f"bulk_insert_{size}"] = measure(insert_batch, repeats, rows_per_op=size)
+    
+    # Tabla grande para las lecturas
+    while next_id <= args.table_rows:
+        chunk = min(10000, args.table_rows - next_id + 1)
+        _check(crud_tools.bulk_insert(TABLE, [_record(next_id + k) for k in range(chunk)], connection_name))
+        next_id += chunk
+    
+    reads = max(1, n // 10)
+    results["select_records_1000"] = measure(
+        lambda i: _check(crud_tools.select_records(TABLE, where={"active": i % 2}, limit=1000,
+                                                   connection_name=connection_name)), reads, rows_per_op=1000)
+    
+    def paginate(i: int) -> None:
+        token = None
+        for _ in range(10):
+            page = _check(crud_tools.paginate_records(TABLE, page_size=100, page_token=token,
+                                                      connection_name=connection_name))
+            token = page.get("next_page_token")
+            if not token:
+                break
+    results["paginate_records_10x100"] = measure(paginate, reads, rows_per_op=1000)
+    
+    # Contención: más corutinas que conexiones en el pool, a través de server.py
+    pool_size = get_config().settings.pool_size
+    for concurrency in (pool_size, pool_size * 4):
+        results[f"server_get_record_by_id_c{concurrency}"] = measure_concurrent(
+            lambda i: server.get_record_by_id(TABLE, 1 + (i % (next_id - 1)), connection_name=connection_name),
+            n, concurrency)
+    results[f"server_count_records_c{pool_size * 4}"] = measure_concurrent(
+        lambda i: server.count_records(TABLE, where={"active": i % 2}, connection_name=connection_name),
+        reads, pool_size * 4)
+    
+    with crud_tools.pooled_handler(connection_name) as handler:
+        handler.execute_query(f"DROP TABLE IF EXISTS {TABLE}")
+        handler.commit()
+    
+    return {"backend": backend, "results": results}
+
+
+def _git_commit() -> Optional[str]:
+    """Commit actual, si se ejecuta dentro de un repositorio git"""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None, threshold: float = 0.10) -> int:
+    """Imprime la tabla de resultados y, si hay baseline, las regresiones. Devuelve el número de regresiones"""
+    print("=" * 96)
+    print(f"⏱️  Benchmarks de herramientas ({report['backend']}, commit {report.get('commit') or '?'})")
+    print("=" * 96)
+    print(f"{'escenario':<36}{'ops/s':>12}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'filas/s':>15}")
+    
+    regressions = 0
+    previous = (baseline or {}).get("results", {})
+    for name, stats in report["results"].items():
+        line = (f"{name:<36}{stats['ops_per_sec'] or 0:>12,.1f}{stats['p50_ms']:>11.3f}"
+                f"{stats['p95_ms']:>11.3f}{stats['p99_ms']:>11.3f}"
+                + (f"{stats['rows_per_sec']:>15,.0f}" if stats.get('rows_per_sec') else f"{'-':>15}"))
+        old = previous.get(name)
+        if old and old.get("p95_ms") and old.get("ops_per_sec"):
+            p95_delta = stats["p95_ms"] / old["p95_ms"] - 1
+            ops_delta = (stats["ops_per_sec"] or 0) / old["ops_per_sec"] - 1
+            regressed = p95_delta > threshold or ops_delta < -threshold
+            regressions += regressed
+            line += f"   p95 {p95_delta:+.0%} ops {ops_delta:+.0%}" + ("  ❌" if regressed else "")
+        print(line)
+    
+    if baseline:
+        print(f"\n{'❌' if regressions else '✅'} {regressions} regresiones (umbral {threshold:.0%}) "
+              f"frente a la baseline del commit {baseline.get('commit') or '?'}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de latencia y rendimiento de las herramientas")
+    parser.add_argument("--connection", default=None, help="Conexión configurada (default: la de por defecto)")
+    parser.add_argument("--standin", action="store_true", help="Usar siempre el handler SQLite en proceso")
+    parser.add_argument("--iterations", type=int, default=200, help="Operaciones por escenario de una fila")
+    parser.add_argument("--bulk-sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Tamaños de bulk_insert")
+    parser.add_argument("--bulk-rows", type=int, default=50000, help="Filas totales por tamaño de bulk_insert")
+    parser.add_argument("--table-rows", type=int, default=100000, help="Filas de la tabla para las lecturas")
+    parser.add_argument("--save", metavar="NOMBRE", help="Guardar los resultados en benchmarks/baselines/NOMBRE.json")
+    parser.add_argument("--compare", metavar="NOMBRE", help="Comparar con benchmarks/baselines/NOMBRE.json")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Variación que cuenta como regresión")
+    args = parser.parse_args()
+    
+    # Los logs por operación distorsionan las latencias
+    logging.getLogger().setLevel(logging.WARNING)
+    
+    workdir = None
+    if args.standin or not _server_available(args.connection):
+        workdir = tempfile.mkdtemp(prefix="mcp_bench_")
+        _use_standin(os.path.join(workdir, "bench.sqlite3"), get_config().settings.query_timeout)
+    
+    try:
+        report = run_suite(args.connection, args)
+    finally:
+        crud_tools.get_pool().close_all()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    
+    report.update(
+        commit=_git_commit(),
+        timestamp=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        iterations=args.iterations,
+    )
+    
+    baseline = None
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json"), encoding="utf-8") as f:
+            baseline = json.load(f)
+    
+    regressions = print_report(report, baseline, args.threshold)
+    
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.save}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 Baseline guardada en {path}")
+    
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
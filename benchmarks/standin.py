@@ -0,0 +1,201 @@
+"""
+Handler de sustitución en proceso (SQLite) para ejecutar los benchmarks
+sin un servidor MySQL/PostgreSQL.
+
+Implementa la misma interfaz que MySQLHandler/PostgreSQLHandler sobre un
+fichero SQLite, de modo que crud_tools y las herramientas del servidor se
+ejercitan completas (pool, cachés, executor) salvo el driver de red.
+"""
+
+import os
+import sqlite3
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.connection import DatabaseHandler
+from src.utils.metrics import timed
+
+
+def _sql(query: str) -> str:
+    """Convierte los marcadores %s de los drivers MySQL/PostgreSQL al estilo ? de SQLite"""
+    return query.replace('%s', '?')
+
+
+class SQLiteHandler(DatabaseHandler):
+    """
+    Handler SQLite usado como sustituto de un servidor real.
+    El parámetro database es la ruta del fichero SQLite.
+    """
+    
+    def __init__(self, host: str, port: int, user: str, password: str, database: Optional[str] = None,
+                 statement_cache_size: int = 0, query_timeout: Optional[float] = None):
+        super().__init__(host, port, user, password, database, statement_cache_size, query_timeout)
+        self.cursor = None
+    
+    @timed("connect")
+    def connect(self) -> None:
+        """Abre el fichero SQLite (el pool puede usar el handler desde varios hilos)"""
+        self.connection = sqlite3.connect(self.database, timeout=30, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.cursor = self.connection.cursor()
+        self._is_connected = True
+    
+    def disconnect(self) -> None:
+        """Cierra la conexión"""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+            self.cursor = None
+        self._is_connected = False
+    
+    @timed("execute_query")
+    def execute_query(self, query: str, params: Optional[tuple] = None) -> int:
+        """Ejecuta una sentencia de escritura"""
+        self.ensure_connected()
+        self.cursor.execute(_sql(query), params or ())
+        self._track_ddl(query)
+        return self.cursor.rowcount
+    
+    @timed("fetch_one")
+    def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+        """Devuelve la primera fila como diccionario"""
+        self.ensure_connected()
+        row = self.cursor.execute(_sql(query), params or ()).fetchone()
+        return dict(row) if row else None
+    
+    @timed("fetch_all")
+    def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Devuelve todas las filas como diccionarios"""
+        self.ensure_connected()
+        return [dict(row) for row in self.cursor.execute(_sql(query), params or ()).fetchall()]
+    
+    @timed("iter_rows")
+    def iter_rows(self, query: str, params: Optional[tuple] = None,
+                  batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Lee las filas por lotes con un cursor propio (SQLite las genera bajo demanda)"""
+        self.ensure_connected()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(_sql(query), params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        finally:
+            cursor.close()
+    
+    def begin_transaction(self) -> None:
+        """SQLite abre la transacción implícitamente en la primera escritura"""
+        self.ensure_connected()
+    
+    def commit(self) -> None:
+        """Confirma la transacción actual"""
+        if self.connection:
+            self.connection.commit()
+    
+    def rollback(self) -> None:
+        """Revierte la transacción actual"""
+        if self.connection:
+            self.connection.rollback()
+    
+    def get_last_insert_id(self) -> Optional[int]:
+        """ID de la última fila insertada"""
+        return self.cursor.lastrowid if self.cursor else None
+    
+    def cancel(self) -> None:
+        """Interrumpe la sentencia en curso"""
+        if self.connection:
+            self.connection.interrupt()
+    
+    def _is_timeout_error(self, error: Exception) -> bool:
+        """sqlite3 informa de interrupt() como OperationalError('interrupted')"""
+        return isinstance(error, sqlite3.OperationalError) and 'interrupted' in str(error)
+    
+    def get_batch_limits(self) -> Dict[str, Optional[int]]:
+        """SQLite admite 32766 parámetros por sentencia desde la versión 3.32"""
+        return {"max_bytes": None, "max_params": 32766}
+    
+    def render_row(self, params: tuple) -> str:
+        """Renderiza una fila como literal SQL"""
+        values = []
+        for value in params:
+            if value is None:
+                values.append("NULL")
+            elif isinstance(value, bool):
+                values.append("1" if value else "0")
+            elif isinstance(value, (int, float)):
+                values.append(repr(value))
+            elif isinstance(value, (bytes, bytearray)):
+                values.append(f"X'{bytes(value).hex()}'")
+            else:
+                values.append("'" + str(value).replace("'", "''") + "'")
+        return f"({', '.join(values)})"
+    
+    def list_databases(self) -> List[str]:
+        """Una única base de datos: el fichero"""
+        return ["main"]
+    
+    def list_tables(self, database: Optional[str] = None) -> List[str]:
+        """Tablas de usuario del fichero"""
+        rows = self.fetch_all("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")
+        return [row['name'] for row in rows]
+    
+    def get_table_schema(self, table_name: str) -> List[Dict[str, Any]]:
+        """Columnas en el formato de DESCRIBE de MySQL"""
+        rows = self.fetch_all(f"PRAGMA table_info({table_name})")
+        return [
+            {
+                "Field": row['name'],
+                "Type": row['type'],
+                "Null": "NO" if row['notnull'] or row['pk'] else "YES",
+                "Key": "PRI" if row['pk'] else "",
+                "Default": row['dflt_value'],
+                "Extra": ""
+            }
+            for row in rows
+        ]
+    
+    def get_indexes(self, table_name: str) -> List[Dict[str, Any]]:
+        """Índices con name, columns, unique, primary y nullable"""
+        columns = self.fetch_all(f"PRAGMA table_info({table_name})")
+        nullable = {row['name']: not (row['notnull'] or row['pk']) for row in columns}
+        
+        indexes = []
+        primary = [row['name'] for row in sorted(columns, key=lambda r: r['pk']) if row['pk']]
+        if primary:
+            indexes.append({"name": "PRIMARY", "columns": primary, "unique": True,
+                            "primary": True, "nullable": False})
+        
+        for index in self.fetch_all(f"PRAGMA index_list({table_name})"):
+            if index['origin'] == 'pk':
+                continue
+            names = [row['name'] for row in self.fetch_all(f"PRAGMA index_info({index['name']})")]
+            indexes.append({
+                "name": index['name'],
+                "columns": names,
+                "unique": bool(index['unique']),
+                "primary": False,
+                "nullable": any(nullable.get(name, True) for name in names)
+            })
+        return indexes
+    
+    def estimate_row_count(self, table_name: str) -> Optional[int]:
+        """SQLite no mantiene un conteo estimado"""
+        return None
+    
+    def explain_row_estimate(self, query: str, params: Optional[tuple] = None) -> Optional[int]:
+        """SQLite no estima filas en EXPLAIN"""
+        return None
+    
+    def explain_plan(self, query: str, params: Optional[tuple] = None) -> Any:
+        """Plan de EXPLAIN QUERY PLAN como lista de pasos"""
+        return self.fetch_all(f"EXPLAIN QUERY PLAN {query}", params)
+    
+    def get_server_version(self) -> str:
+        """Versión de la librería SQLite"""
+        return f"SQLite {sqlite3.sqlite_version}"
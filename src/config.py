@@ -5,7 +5,8 @@ Lee y valida configuración de conexiones a bases de datos.
 
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import fnmatch
 import os
 import logging
 from pydantic import BaseModel, Field, field_validator
@@ -23,6 +24,7 @@ class DatabaseConnection(BaseModel):
     database: Optional[str] = Field(None, description="Nombre de la base de datos")
     active: bool = Field(default=True, description="Si la conexión está activa")
     description: Optional[str] = Field(None, description="Descripción de la conexión")
+    tags: List[str] = Field(default_factory=list, description="Etiquetas para agrupar conexiones (tenant, shard, región...)")
     
     @field_validator('type')
     @classmethod
@@ -43,7 +45,44 @@ class ServerSettings(BaseModel):
     """Configuración general del servidor"""
     pool_size: int = Field(default=5, ge=1, le=20)
     pool_timeout: int = Field(default=30, ge=5, le=300)
+    pool_min_idle: int = Field(default=0, ge=0, le=20)
+    pool_max_idle: Optional[int] = Field(default=None, ge=0, le=20)
+    pool_max_lifetime: int = Field(default=1800, ge=60)
+    pool_idle_timeout: int = Field(default=600, ge=10)
+    pool_keepalive_interval: int = Field(default=60, ge=0)  # 0 = sin hilo de mantenimiento
+    pool_validate_after: int = Field(default=30, ge=0)  # 0 = validar siempre antes de prestar
     query_timeout: int = Field(default=60, ge=5, le=600)
+    executor_max_workers: int = Field(default=16, ge=1, le=256)
+    bulk_insert_max_rows: int = Field(default=1000, ge=1, le=100000)
+    bulk_load_threshold: int = Field(default=10000, ge=0)  # 0 = bulk_insert nunca usa carga nativa
+    mysql_local_infile: bool = Field(default=True)
+    stream_batch_size: int = Field(default=1000, ge=1, le=100000)
+    parallel_scan_max_workers: int = Field(default=4, ge=1, le=20)  # lecturas simultáneas por conexión
+    max_response_bytes: int = Field(default=10 * 1024 * 1024, ge=0)  # 0 = sin límite
+    export_directory: str = Field(default="exports")
+    export_allow_absolute_paths: bool = Field(default=False)  # permitir escribir fuera de export_directory
+    export_row_group_size: int = Field(default=50000, ge=1)
+    export_timeout: int = Field(default=3600, ge=0)  # 0 = sin límite
+    fanout_max_concurrency: int = Field(default=8, ge=1, le=64)
+    fanout_timeout: int = Field(default=60, ge=1)
+    import_chunk_size: int = Field(default=10000, ge=1)
+    prepared_statement_cache_size: int = Field(default=100, ge=0, le=10000)
+    metadata_cache_ttl: int = Field(default=300, ge=0)
+    metadata_cache_max_entries: int = Field(default=1000, ge=1)
+    result_cache_enabled: bool = Field(default=False)
+    result_cache_max_bytes: int = Field(default=64 * 1024 * 1024, ge=0)
+    result_cache_ttl: int = Field(default=30, ge=0)
+    result_cache_table_ttls: Dict[str, int] = Field(default_factory=dict)
+    slow_query_threshold_ms: int = Field(default=1000, ge=0)  # 0 = desactivado
+    slow_query_log_size: int = Field(default=200, ge=1)
+    slow_query_log_file: Optional[str] = Field(default="logs/slow_queries.log")
+    slow_query_log_max_bytes: int = Field(default=10 * 1024 * 1024, ge=1024)
+    slow_query_log_backups: int = Field(default=5, ge=0)
+    metrics_prometheus_file: Optional[str] = Field(default=None)
+    metrics_prometheus_port: Optional[int] = Field(default=None, ge=1, le=65535)
+    metrics_export_interval: int = Field(default=15, ge=1)
+    warmup_on_start: bool = Field(default=False)
+    warmup_metadata_tables: int = Field(default=20, ge=0)
     enable_logging: bool = Field(default=True)
     log_queries: bool = Field(default=False)
     confirm_destructive_operations: bool = Field(default=True)
@@ -193,11 +232,50 @@ class Config:
                 "database": conn.database,
                 "active": conn.active,
                 "description": conn.description,
+                "tags": conn.tags,
                 "is_default": name == self._default_connection
             }
             for name, conn in self._connections.items()
         }
     
+    def resolve_connections(self, targets: List[str]) -> List[str]:
+        """
+        Expande una lista de destinos a nombres de conexión.
+        
+        Cada destino puede ser un nombre exacto, un patrón glob ("tenant_*")
+        o una etiqueta ("tag:eu"). Los patrones y etiquetas solo incluyen
+        conexiones activas. Se conserva el orden y se eliminan duplicados.
+        
+        Args:
+            targets: Nombres, patrones o etiquetas
+        
+        Returns:
+            Lista de nombres de conexión
+        
+        Raises:
+            ValueError: Si un nombre exacto no existe o un destino no coincide con ninguna conexión
+        
+        Example:
+            config.resolve_connections(["tenant_*", "tag:eu", "mysql_local"])
+        """
+        names: List[str] = []
+        for target in targets:
+            if target.startswith("tag:"):
+                tag = target[4:]
+                matched = [name for name, conn in self._connections.items() if conn.active and tag in conn.tags]
+            elif any(char in target for char in "*?["):
+                matched = [name for name, conn in self._connections.items()
+                           if conn.active and fnmatch.fnmatchcase(name, target)]
+            elif target in self._connections:
+                matched = [target]
+            else:
+                raise ValueError(f"Conexión '{target}' no existe")
+            
+            if not matched:
+                raise ValueError(f"Ninguna conexión activa coincide con '{target}'")
+            names.extend(name for name in matched if name not in names)
+        return names
+    
     @property
     def default_connection(self) -> Optional[str]:
         """Obtiene el nombre de la conexión por defecto"""
@@ -0,0 +1,120 @@
+"""
+Utilidades para la carga masiva nativa (LOAD DATA LOCAL INFILE / COPY FROM STDIN).
+Codifican filas en formato de texto delimitado por tabuladores sin pasar por disco.
+"""
+
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Optional
+import json
+
+NULL = b'\\N'
+
+# Secuencias de escape comunes a MySQL (ESCAPED BY '\\') y al formato texto de COPY
+_ESCAPES = [
+    (b'\\', b'\\\\'),
+    (b'\t', b'\\t'),
+    (b'\n', b'\\n'),
+    (b'\r', b'\\r'),
+]
+
+
+def _escape(raw: bytes, mysql: bool) -> bytes:
+    """Escapa los caracteres especiales del formato de texto"""
+    for char, escaped in _ESCAPES:
+        if char in raw:
+            raw = raw.replace(char, escaped)
+    if mysql and b'\x00' in raw:
+        raw = raw.replace(b'\x00', b'\\0')
+    return raw
+
+
+def encode_value(value: Any, dialect: str) -> bytes:
+    """
+    Codifica un valor para LOAD DATA (dialect="mysql") o COPY (dialect="postgres").
+    
+    Args:
+        value: Valor Python de la fila
+        dialect: "mysql" o "postgres"
+    
+    Returns:
+        Bytes del campo ya escapado
+    """
+    mysql = dialect == "mysql"
+    
+    if value is None:
+        return NULL
+    if isinstance(value, bool):
+        if mysql:
+            return b'1' if value else b'0'
+        return b't' if value else b'f'
+    if isinstance(value, (int, float, Decimal)):
+        return str(value).encode('ascii')
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ').encode('ascii')
+    if isinstance(value, (date, time)):
+        return value.isoformat().encode('ascii')
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        raw = bytes(value)
+        if mysql:
+            return _escape(raw, mysql)
+        # bytea en formato hex; la barra se escapa en el formato de texto
+        return b'\\\\x' + raw.hex().encode('ascii')
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False, default=str)
+    return _escape(str(value).encode('utf-8'), mysql)
+
+
+def encode_rows(rows: Iterable[tuple], dialect: str) -> Iterator[bytes]:
+    """
+    Codifica filas como líneas de texto delimitadas por tabuladores.
+    
+    Args:
+        rows: Filas (tuplas de valores)
+        dialect: "mysql" o "postgres"
+    
+    Yields:
+        Una línea por fila, terminada en salto de línea
+    """
+    for row in rows:
+        yield b'\t'.join(encode_value(value, dialect) for value in row) + b'\n'
+
+
+class RowStream:
+    """
+    Objeto tipo fichero de solo lectura que genera los bytes bajo demanda.
+    Permite pasar un iterador de filas a copy_expert sin materializarlo.
+    """
+    
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+        self.bytes_read = 0
+    
+    def read(self, size: Optional[int] = -1) -> bytes:
+        """Devuelve hasta size bytes (todos si size es negativo o None)"""
+        if size is None or size < 0:
+            data = self._buffer + b''.join(self._chunks)
+            self._buffer = b''
+        else:
+            while len(self._buffer) < size:
+                try:
+                    self._buffer += next(self._chunks)
+                except StopIteration:
+                    break
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        self.bytes_read += len(data)
+        return data
+    
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        """Devuelve la siguiente línea completa"""
+        while b'\n' not in self._buffer:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+        index = self._buffer.find(b'\n')
+        end = len(self._buffer) if index < 0 else index + 1
+        data, self._buffer = self._buffer[:end], self._buffer[end:]
+        self.bytes_read += len(data)
+        return data
@@ -4,12 +4,55 @@ Proporciona una interfaz unificada para MySQL y PostgreSQL.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Iterable
+import functools
 import logging
+import re
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
+from .metadata_cache import invalidate_metadata
+from .result_cache import invalidate_results
 
 logger = logging.getLogger(__name__)
 
+# Sentencias que cambian el esquema e invalidan la caché de metadatos
+_DDL_PATTERN = re.compile(r'^\s*(CREATE|ALTER|DROP|TRUNCATE|RENAME)\b', re.IGNORECASE)
+
+# Margen del plazo en cliente sobre el timeout del servidor antes de cancelar
+_CANCEL_GRACE = 1.0
+
+# Lecturas que se pueden repetir en una conexión nueva si se pierde la actual
+_READ_ONLY_PATTERN = re.compile(r'^\s*(SELECT|SHOW|DESCRIBE|DESC|EXPLAIN)\b', re.IGNORECASE)
+
+
+def retry_on_disconnect(method):
+    """
+    Reintenta una vez una lectura si la conexión resultó estar caída.
+    
+    Solo se reintenta si la sentencia es de solo lectura, la sesión no tenía
+    una transacción abierta (no se pierde nada al reconectar) y el error es de
+    conexión perdida, no un timeout ni una cancelación.
+    
+    Example:
+        @retry_on_disconnect
+        def fetch_all(self, query, params=None): ...
+    """
+    @functools.wraps(method)
+    def wrapper(self, query: str, *args, **kwargs):
+        retryable = (bool(_READ_ONLY_PATTERN.match(query))
+                     and self.is_connected and self._session_idle())
+        try:
+            return method(self, query, *args, **kwargs)
+        except Exception as e:
+            if not retryable or self._is_timeout_error(e) or not self._is_connection_error(e):
+                raise
+            logger.warning(f"🔁 Conexión perdida en {self.cache_scope} ({e}); reconectando y reintentando")
+            self.reconnect()
+            return method(self, query, *args, **kwargs)
+    return wrapper
+
 
 class DatabaseHandler(ABC):
     """
@@ -17,7 +60,8 @@ class DatabaseHandler(ABC):
     Define la interfaz común para todos los tipos de bases de datos.
     """
     
-    def __init__(self, host: str, port: int, user: str, password: str, database: Optional[str] = None):
+    def __init__(self, host: str, port: int, user: str, password: str, database: Optional[str] = None,
+                 statement_cache_size: int = 0, query_timeout: Optional[float] = None):
         """
         Inicializa el manejador de base de datos.
         
@@ -27,14 +71,27 @@ class DatabaseHandler(ABC):
             user: Usuario de la base de datos
             password: Contraseña del usuario
             database: Nombre de la base de datos (opcional)
+            statement_cache_size: Sentencias preparadas a mantener por sesión (0 = desactivado)
+            query_timeout: Tiempo máximo por sentencia en segundos (None = sin límite)
         """
         self.host = host
         self.port = port
         self.user = user
         self.password = password
         self.database = database
+        self.statement_cache_size = statement_cache_size
+        self.query_timeout = query_timeout
+        # Timeout aplicado actualmente en la sesión (puede diferir por deadline())
+        self._statement_timeout: Optional[float] = None
         self.connection = None
         self._is_connected = False
+        self._batch_limits: Optional[Dict[str, Optional[int]]] = None
+        # Nombre del pool al que pertenece (lo asigna ConnectionPool)
+        self.pool_name: Optional[str] = None
+        # Último momento (monotonic) en que un ping confirmó la conexión
+        self.last_alive = 0.0
+        # Plazo en cliente del bloque deadline() en curso (se rearma en cada sentencia)
+        self._statement_timer: Optional[_StatementTimer] = None
         
         logger.info(f"Inicializando manejador para {self.__class__.__name__}")
     
@@ -90,6 +147,54 @@ class DatabaseHandler(ABC):
         """
         pass
     
+    def iter_rows(self, query: str, params: Optional[tuple] = None,
+                  batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Ejecuta una consulta y devuelve los resultados fila a fila.
+        
+        Los handlers que lo soportan usan cursores del lado del servidor, de
+        modo que solo hay batch_size filas en memoria a la vez. La conexión
+        queda ocupada hasta agotar o cerrar el generador.
+        
+        Args:
+            query: Consulta SQL
+            params: Parámetros de la consulta (opcional)
+            batch_size: Filas a traer del servidor en cada lote
+        
+        Yields:
+            Diccionario por cada fila
+        """
+        yield from self.fetch_all(query, params)
+    
+    def execute_prepared(self, query: str, params: tuple) -> int:
+        """
+        Ejecuta una consulta de modificación como sentencia preparada.
+        
+        Pensado para formas de consulta que se repiten mucho. Los handlers sin
+        soporte de sentencias preparadas usan execute_query.
+        
+        Args:
+            query: Consulta SQL con marcadores %s
+            params: Parámetros de la consulta
+        
+        Returns:
+            Número de filas afectadas
+        """
+        return self.execute_query(query, params)
+    
+    def fetch_one_prepared(self, query: str, params: tuple) -> Optional[Dict[str, Any]]:
+        """
+        Ejecuta una consulta como sentencia preparada y devuelve un solo resultado.
+        
+        Args:
+            query: Consulta SQL con marcadores %s
+            params: Parámetros de la consulta
+        
+        Returns:
+            Diccionario con el resultado o None
+        """
+        return self.fetch_one(query, params)
+    
     @abstractmethod
     def begin_transaction(self) -> None:
         """Inicia una transacción"""
@@ -120,12 +225,64 @@ class DatabaseHandler(ABC):
         """Indica si hay una conexión activa"""
         return self._is_connected
     
+    @property
+    def cache_scope(self) -> str:
+        """Identificador de la conexión para las cachés (nombre del pool o host:puerto/bd)"""
+        return self.pool_name or f"{self.host}:{self.port}/{self.database}"
+    
+    def _track_ddl(self, query: str) -> None:
+        """Invalida las cachés de metadatos y resultados de la conexión si la sentencia es DDL"""
+        if _DDL_PATTERN.match(query):
+            connection_name = self.cache_scope.split('/')[0]
+            invalidate_metadata(connection_name)
+            invalidate_results(connection_name)
+    
     def ensure_connected(self) -> None:
         """Asegura que existe una conexión activa, reconectando si es necesario"""
         if not self.is_connected:
             logger.info("Reconectando a la base de datos...")
             self.connect()
     
+    def reconnect(self) -> None:
+        """Cierra y reabre la conexión conservando el timeout de sentencia actual"""
+        timeout = self._statement_timeout
+        self.disconnect()
+        self.connect()
+        if timeout != self._statement_timeout:
+            self.set_statement_timeout(timeout)
+    
+    def ping(self) -> bool:
+        """
+        Comprueba que el servidor sigue respondiendo en esta conexión.
+        
+        Si no responde, la marca como desconectada para que el pool la descarte.
+        
+        Returns:
+            True si la conexión está viva
+        """
+        if not self.is_connected:
+            return False
+        try:
+            self._ping()
+        except Exception as e:
+            logger.info(f"💀 Conexión caída detectada en {self.cache_scope}: {e}")
+            self._is_connected = False
+            return False
+        self.last_alive = time.monotonic()
+        return True
+    
+    def _ping(self) -> None:
+        """Ida y vuelta mínima al servidor; lanza excepción si la conexión no sirve"""
+        self.fetch_one("SELECT 1")
+    
+    def _session_idle(self) -> bool:
+        """Indica si la sesión no tiene transacción abierta (sin soporte = False)"""
+        return False
+    
+    def _is_connection_error(self, error: Exception) -> bool:
+        """Indica si una excepción del driver corresponde a una conexión perdida"""
+        return False
+    
     @contextmanager
     def transaction(self):
         """
@@ -147,13 +304,17 @@ class DatabaseHandler(ABC):
             logger.error(f"❌ Error en transacción, rollback ejecutado: {e}")
             raise
     
-    def execute_many(self, query: str, params_list: List[tuple]) -> int:
+    def execute_many(self, query: str, params_list: List[tuple], page_size: int = 1000) -> int:
         """
         Ejecuta una consulta múltiples veces con diferentes parámetros.
         
+        Implementación genérica fila a fila; los handlers la sobrescriben
+        con el envío por páginas propio de su driver.
+        
         Args:
             query: Consulta SQL
             params_list: Lista de tuplas con parámetros
+            page_size: Filas por página enviada al servidor
         
         Returns:
             Número total de filas afectadas
@@ -165,6 +326,129 @@ class DatabaseHandler(ABC):
                 total_affected += affected
         return total_affected
     
+    def get_batch_limits(self) -> Dict[str, Optional[int]]:
+        """
+        Límites del servidor para sentencias INSERT multi-fila.
+        
+        Returns:
+            Dict con max_bytes (tamaño máximo de una sentencia) y
+            max_params (parámetros máximos por sentencia). None = sin límite.
+        """
+        return {"max_bytes": None, "max_params": None}
+    
+    def render_row(self, params: tuple) -> str:
+        """
+        Renderiza una fila como literal SQL "(v1, v2, ...)" escapado por el driver.
+        
+        Args:
+            params: Valores de la fila
+        
+        Returns:
+            Literal SQL listo para una cláusula VALUES
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} no soporta INSERT multi-fila")
+    
+    def explain_plan(self, query: str, params: Optional[tuple] = None) -> Any:
+        """
+        Plan de ejecución de una consulta en formato JSON (sin ejecutarla).
+        
+        Args:
+            query: Consulta SELECT
+            params: Parámetros de la consulta (opcional)
+        
+        Returns:
+            Plan tal como lo devuelve EXPLAIN en formato JSON
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} no soporta EXPLAIN en formato JSON")
+    
+    def key_histogram(self, table_name: str, column: str) -> Optional[List[int]]:
+        """
+        Límites del histograma de igual frecuencia de una columna entera.
+        
+        Lo usan las lecturas paralelas para repartir las filas entre rangos
+        de forma equilibrada. Los handlers sin estadísticas devuelven None y
+        se reparte el intervalo MIN..MAX en partes iguales.
+        
+        Args:
+            table_name: Nombre de la tabla
+            column: Columna de la clave
+        
+        Returns:
+            Lista ordenada de límites o None si no hay histograma
+        """
+        return None
+    
+    def insert_many(self, table_name: str, columns: List[str], rows: List[tuple],
+                    max_rows: int = 1000) -> Tuple[int, int]:
+        """
+        Inserta filas agrupadas en sentencias INSERT ... VALUES (...),(...).
+        
+        Cada sentencia respeta max_rows y los límites de get_batch_limits().
+        No abre transacción propia: el llamador decide cuándo confirmar.
+        
+        Args:
+            table_name: Nombre de la tabla
+            columns: Columnas en el orden de los valores de cada fila
+            rows: Lista de tuplas con los valores
+            max_rows: Filas máximas por sentencia
+        
+        Returns:
+            Tupla (filas afectadas, sentencias ejecutadas)
+        """
+        limits = self.get_batch_limits()
+        if limits.get("max_params"):
+            max_rows = min(max_rows, max(1, limits["max_params"] // len(columns)))
+        max_bytes = limits.get("max_bytes")
+        
+        prefix = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES "
+        prefix_size = len(prefix.encode('utf-8'))
+        
+        total_affected = 0
+        statements = 0
+        chunk: List[str] = []
+        size = prefix_size
+        
+        for row in rows:
+            literal = self.render_row(row)
+            literal_size = len(literal.encode('utf-8', 'surrogateescape')) + 1
+            
+            if chunk and (len(chunk) >= max_rows or (max_bytes and size + literal_size > max_bytes)):
+                total_affected += self.execute_query(prefix + ",".join(chunk))
+                statements += 1
+                chunk = []
+                size = prefix_size
+            
+            chunk.append(literal)
+            size += literal_size
+        
+        if chunk:
+            total_affected += self.execute_query(prefix + ",".join(chunk))
+            statements += 1
+        
+        logger.debug(f"insert_many en {table_name}: {len(rows)} filas en {statements} sentencias")
+        return total_affected, statements
+    
+    def bulk_load(self, table_name: str, columns: List[str], rows: Iterable[tuple]) -> Dict[str, Any]:
+        """
+        Carga filas con el mecanismo nativo del motor (LOAD DATA / COPY).
+        
+        Los datos se transmiten en memoria, sin fichero temporal.
+        No abre transacción propia: el llamador decide cuándo confirmar.
+        
+        Args:
+            table_name: Nombre de la tabla
+            columns: Columnas en el orden de los valores de cada fila
+            rows: Iterable de tuplas con los valores
+        
+        Returns:
+            Dict con rows (filas cargadas), bytes enviados y warnings
+        
+        Raises:
+            BulkLoadUnavailable: Si el motor o la sesión no permiten la carga nativa
+            BulkLoadRejected: Si el servidor descartó o alteró alguna fila
+        """
+        raise BulkLoadUnavailable(f"{self.__class__.__name__} no soporta carga masiva nativa")
+    
     def test_connection(self) -> Dict[str, Any]:
         """
         Prueba la conexión a la base de datos.
@@ -173,7 +457,7 @@ class DatabaseHandler(ABC):
             Dict con información sobre la conexión
         """
         try:
-            self.connect()
+            self.ensure_connected()
             
             # Ejecutar query simple de prueba
             result = self.fetch_one("SELECT 1 as test")
@@ -199,6 +483,99 @@ class DatabaseHandler(ABC):
                 "port": self.port
             }
     
+    def reset_session(self) -> None:
+        """
+        Deja la sesión limpia para reutilizarla desde el pool.
+        Revierte cualquier transacción abierta por el usuario anterior
+        y restaura el timeout de sentencia por defecto.
+        """
+        if self.is_connected:
+            self.rollback()
+            if self._statement_timeout != self.query_timeout:
+                self.set_statement_timeout(self.query_timeout)
+    
+    def set_statement_timeout(self, timeout: Optional[float]) -> None:
+        """
+        Aplica un timeout de sentencia en el servidor para esta sesión.
+        
+        Args:
+            timeout: Segundos (None o 0 = sin límite)
+        """
+        self._statement_timeout = timeout
+    
+    def cancel(self) -> None:
+        """Cancela la sentencia en curso desde otro hilo (sin efecto si no hay soporte)"""
+        pass
+    
+    def _is_timeout_error(self, error: Exception) -> bool:
+        """Indica si una excepción del driver corresponde a un timeout o cancelación"""
+        return False
+    
+    def is_timeout_error(self, error: Exception) -> bool:
+        """
+        Indica si error se debe a un timeout dentro de deadline().
+        
+        Dentro del bloque los errores aún llegan como excepciones del driver
+        (la conversión a QueryTimeoutError se hace al salir); sirve para no
+        confundir una cancelación con un error de la sentencia.
+        """
+        timer = self._statement_timer
+        return (timer is not None and timer.expired.is_set()) or self._is_timeout_error(error)
+    
+    def statement_started(self) -> None:
+        """Rearma el plazo de deadline() al empezar una sentencia (lo llama @timed)"""
+        if self._statement_timer is not None:
+            self._statement_timer.start()
+    
+    def statement_finished(self) -> None:
+        """Desarma el plazo al terminar la sentencia, esperando a una cancelación en curso"""
+        if self._statement_timer is not None:
+            self._statement_timer.stop()
+    
+    @contextmanager
+    def deadline(self, timeout: Optional[float] = None):
+        """
+        Limita la duración de cada sentencia ejecutada dentro del bloque.
+        
+        Aplica el timeout en el servidor y arma un plazo en cliente que se
+        reinicia en cada sentencia: si una sentencia lo supera, se cancela
+        desde otro hilo. Al salir del bloque se espera a que termine una
+        cancelación en curso, de modo que nunca llega a la sentencia del
+        siguiente usuario del handler. Los errores de timeout del driver se
+        convierten en QueryTimeoutError. Un timeout distinto del de la
+        sesión se mantiene hasta reset_session().
+        
+        Args:
+            timeout: Segundos por sentencia (None = query_timeout del handler)
+        
+        Raises:
+            QueryTimeoutError: Si alguna sentencia supera el plazo
+        
+        Example:
+            with handler.deadline(5):
+                handler.fetch_all("SELECT ...")
+        """
+        timeout = self.query_timeout if timeout is None else timeout
+        if not timeout:
+            yield self
+            return
+        
+        self.ensure_connected()
+        if timeout != self._statement_timeout:
+            self.set_statement_timeout(timeout)
+        
+        timer = _StatementTimer(self, timeout)
+        previous, self._statement_timer = self._statement_timer, timer
+        try:
+            yield self
+        except Exception as e:
+            if self.is_timeout_error(e):
+                raise QueryTimeoutError(timeout, str(e)) from e
+            raise
+        finally:
+            timer.close()
+            self._statement_timer = previous
+    
     def __enter__(self):
         """Soporte para context manager"""
         self.connect()
@@ -213,26 +590,519 @@ class DatabaseHandler(ABC):
         return f"{self.__class__.__name__}(host={self.host}, port={self.port}, user={self.user}, database={self.database})"
 
 
+class _StatementTimer:
+    """
+    Plazo en cliente de un bloque deadline(), rearmado en cada sentencia.
+    
+    La cancelación se ejecuta con _cancel_lock tomado y comprueba que su
+    generación sigue vigente: stop() y close() toman el mismo lock, así que
+    al volver no queda ninguna cancelación pendiente ni en curso.
+    """
+    
+    def __init__(self, handler: "DatabaseHandler", timeout: float):
+        self.handler = handler
+        self.timeout = timeout
+        self.expired = threading.Event()
+        self._lock = threading.Lock()
+        self._cancel_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._generation = 0
+        self._depth = 0
+        self._closed = False
+    
+    def start(self) -> None:
+        with self._lock:
+            self._depth += 1
+            if self._depth > 1 or self._closed:
+                return
+            self._generation += 1
+            self._timer = threading.Timer(self.timeout + _CANCEL_GRACE, self._expire, (self._generation,))
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def stop(self) -> None:
+        with self._lock:
+            self._depth = max(0, self._depth - 1)
+            if self._depth:
+                return
+            self._disarm()
+        with self._cancel_lock:
+            pass
+    
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._disarm()
+        with self._cancel_lock:
+            pass
+    
+    def _disarm(self) -> None:
+        """Cancela el timer actual e invalida su generación (con _lock tomado)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._generation += 1
+    
+    def _expire(self, generation: int) -> None:
+        with self._cancel_lock:
+            with self._lock:
+                if generation != self._generation:
+                    return
+                self.expired.set()
+            logger.warning(f"⏱️ Plazo de {self.timeout}s vencido, cancelando sentencia en {self.handler.cache_scope}")
+            try:
+                self.handler.cancel()
+            except Exception as e:
+                logger.error(f"❌ No se pudo cancelar la sentencia: {e}")
+
+
+class QueryTimeoutError(TimeoutError):
+    """Una sentencia superó su timeout y fue cancelada"""
+    
+    def __init__(self, timeout: float, message: str = ""):
+        super().__init__(f"Consulta cancelada tras superar {timeout}s" + (f": {message}" if message else ""))
+        self.timeout = timeout
+
+
+class BulkLoadUnavailable(Exception):
+    """La carga masiva nativa no está disponible; usar INSERT por lotes"""
+    pass
+
+
+class BulkLoadRejected(Exception):
+    """La carga nativa descartó o alteró filas; la transacción debe revertirse"""
+    pass
+
+
+class PoolTimeoutError(TimeoutError):
+    """No se liberó ninguna conexión del pool dentro de pool_timeout"""
+    pass
+
+
+class _HandlerPool:
+    """
+    Pool acotado de handlers para una conexión con nombre.
+    
+    Los handlers libres viven en un deque: tomar y devolver uno cuando hay
+    disponibles no necesita el lock (append/pop son atómicos). El lock y la
+    condición solo se usan para crear conexiones nuevas y para las esperas
+    cuando el pool está al máximo.
+    """
+    
+    def __init__(self, name: str, handler_class, handler_kwargs: Dict[str, Any],
+                 max_size: int, timeout: float, min_idle: int, max_idle: int,
+                 max_lifetime: float, idle_timeout: float, validate_after: float):
+        self.name = name
+        self.handler_class = handler_class
+        self.handler_kwargs = handler_kwargs
+        self.max_size = max_size
+        self.timeout = timeout
+        self.min_idle = min(min_idle, max_size)
+        self.max_idle = max(max_idle, self.min_idle)
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.validate_after = validate_after
+        
+        # (handler, momento en que se devolvió)
+        self._idle: deque = deque()
+        # id(handler) -> (handler, momento de creación)
+        self._members: Dict[int, Tuple[DatabaseHandler, float]] = {}
+        self._size = 0
+        self._waiters = 0
+        # Reentrante: _pop_idle puede descartar handlers (_evict) con el lock tomado
+        self._cond = threading.Condition(threading.RLock())
+        
+        self.total_created = 0
+        self.total_evicted = 0
+        self.total_timeouts = 0
+        self.total_pings = 0
+        self.total_dead = 0
+    
+    def acquire(self, timeout: Optional[float] = None) -> DatabaseHandler:
+        """Toma un handler en exclusiva, esperando hasta timeout si el pool está lleno"""
+        # Camino rápido sin lock: reutilizar un handler libre
+        handler = self._pop_idle()
+        if handler is not None:
+            return handler
+        
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        
+        with self._cond:
+            self._waiters += 1
+            try:
+                while True:
+                    handler = self._pop_idle()
+                    if handler is not None:
+                        return handler
+                    
+                    if self._size < self.max_size:
+                        # Reservar el hueco y conectar fuera del lock
+                        self._size += 1
+                        break
+                    
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.total_timeouts += 1
+                        raise PoolTimeoutError(
+                            f"Pool '{self.name}' agotado: ninguna conexión libre "
+                            f"tras {timeout}s ({self.max_size} en uso)"
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters -= 1
+        
+        return self._create()
+    
+    def release(self, handler: DatabaseHandler) -> None:
+        """Devuelve un handler al pool tras resetear su sesión"""
+        member = self._members.get(id(handler))
+        if member is None:
+            handler.disconnect()
+            return
+        
+        try:
+            handler.reset_session()
+        except Exception as e:
+            logger.warning(f"No se pudo resetear la sesión, descartando conexión {self.name}: {e}")
+            self._evict(handler)
+            return
+        
+        now = time.monotonic()
+        if (not handler.is_connected
+                or now - member[1] > self.max_lifetime
+                or len(self._idle) >= self.max_idle):
+            self._evict(handler)
+            return
+        
+        self._idle.append((handler, now))
+        if self._waiters:
+            with self._cond:
+                self._cond.notify()
+    
+    def prefill(self, count: Optional[int] = None) -> int:
+        """
+        Abre conexiones hasta tener al menos `count` libres (min_idle por defecto).
+        
+        Returns:
+            Número de conexiones abiertas
+        """
+        target = self.min_idle if count is None else min(count, self.max_size)
+        opened = 0
+        while len(self._idle) < target:
+            with self._cond:
+                if self._size >= self.max_size:
+                    break
+                self._size += 1
+            handler = self._create()
+            self._idle.append((handler, time.monotonic()))
+            opened += 1
+        return opened
+    
+    def evict_idle(self) -> int:
+        """
+        Cierra los handlers libres que superan idle_timeout o max_lifetime,
+        respetando min_idle.
+        
+        Returns:
+            Número de conexiones cerradas
+        """
+        now = time.monotonic()
+        kept = []
+        evicted = 0
+        while True:
+            try:
+                handler, released_at = self._idle.popleft()
+            except IndexError:
+                break
+            member = self._members.get(id(handler))
+            expired = (member is None
+                       or now - member[1] > self.max_lifetime
+                       or (now - released_at > self.idle_timeout
+                           and len(kept) + len(self._idle) >= self.min_idle))
+            if expired:
+                self._evict(handler)
+                evicted += 1
+            else:
+                kept.append((handler, released_at))
+        self._idle.extend(kept)
+        if kept and self._waiters:
+            with self._cond:
+                self._cond.notify(len(kept))
+        return evicted
+    
+    def keepalive(self, interval: float) -> int:
+        """
+        Hace ping a los handlers libres que llevan más de `interval` segundos
+        sin usarse ni comprobarse, y descarta los que no responden.
+        
+        Returns:
+            Número de conexiones caídas descartadas
+        """
+        now = time.monotonic()
+        kept = []
+        dead = 0
+        for _ in range(len(self._idle)):
+            try:
+                handler, released_at = self._idle.popleft()
+            except IndexError:
+                break
+            if now - max(released_at, handler.last_alive) >= interval:
+                self.total_pings += 1
+                if not handler.ping():
+                    self.total_dead += 1
+                    self._evict(handler)
+                    dead += 1
+                    continue
+            kept.append((handler, released_at))
+        # Vuelven por la izquierda para no alterar el orden LIFO de los préstamos
+        self._idle.extendleft(reversed(kept))
+        if kept and self._waiters:
+            with self._cond:
+                self._cond.notify(len(kept))
+        return dead
+    
+    def close(self) -> None:
+        """Cierra todas las conexiones del pool (las prestadas se cierran al devolverlas)"""
+        with self._cond:
+            members = list(self._members.values())
+            self._members.clear()
+            self._idle.clear()
+            self._size = 0
+            self._cond.notify_all()
+        for handler, _ in members:
+            handler.disconnect()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Estadísticas del pool"""
+        members = list(self._members.values())
+        idle = len(self._idle)
+        return {
+            "total_connections": len(members),
+            "active_connections": sum(1 for h, _ in members if h.is_connected),
+            "idle_connections": idle,
+            "in_use_connections": max(len(members) - idle, 0),
+            "waiting": self._waiters,
+            "max_size": self.max_size,
+            "total_created": self.total_created,
+            "total_evicted": self.total_evicted,
+            "total_timeouts": self.total_timeouts,
+            "total_pings": self.total_pings,
+            "total_dead": self.total_dead
+        }
+    
+    def _pop_idle(self) -> Optional[DatabaseHandler]:
+        """Saca un handler libre válido, descartando los caducados"""
+        while True:
+            try:
+                handler, released_at = self._idle.pop()
+            except IndexError:
+                return None
+            member = self._members.get(id(handler))
+            now = time.monotonic()
+            if (member is None or not handler.is_connected
+                    or now - member[1] > self.max_lifetime
+                    or now - released_at > self.idle_timeout):
+                self._evict(handler)
+                continue
+            
+            # Validar antes de prestar si lleva tiempo sin usarse ni comprobarse
+            if now - max(released_at, handler.last_alive) > self.validate_after:
+                self.total_pings += 1
+                if not handler.ping():
+                    self.total_dead += 1
+                    self._evict(handler)
+                    continue
+            return handler
+    
+    def _create(self) -> DatabaseHandler:
+        """Crea y conecta un handler en un hueco ya reservado"""
+        try:
+            handler = self.handler_class(**self.handler_kwargs)
+            handler.pool_name = self.name
+            handler.connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        
+        with self._cond:
+            self._members[id(handler)] = (handler, time.monotonic())
+            self.total_created += 1
+        logger.info(f"Nueva conexión creada en pool: {self.name} ({self._size}/{self.max_size})")
+        return handler
+    
+    def _evict(self, handler: DatabaseHandler) -> None:
+        """Saca un handler del pool, cierra su conexión y libera el hueco"""
+        with self._cond:
+            if self._members.pop(id(handler), None) is not None:
+                self._size -= 1
+                self.total_evicted += 1
+                self._cond.notify()
+        handler.disconnect()
+
+
 class ConnectionPool:
     """
     Pool de conexiones para reutilizar conexiones a bases de datos.
+    
+    Mantiene un pool acotado por cada conexión con nombre. Cada handler se
+    entrega en exclusiva (checkout) y debe devolverse con release() o usando
+    el context manager connection(). Si no hay handlers libres y el pool está
+    al máximo, el llamador espera hasta `timeout` segundos.
     """
     
-    def __init__(self, max_connections: int = 5):
+    def __init__(self, max_connections: int = 5, timeout: float = 30,
+                 min_idle: int = 0, max_idle: Optional[int] = None,
+                 max_lifetime: float = 1800, idle_timeout: float = 600,
+                 keepalive_interval: float = 0, validate_after: float = 30):
         """
         Inicializa el pool de conexiones.
         
         Args:
             max_connections: Número máximo de conexiones en el pool
+            timeout: Segundos máximos de espera por una conexión libre
+            min_idle: Conexiones libres mínimas a mantener abiertas
+            max_idle: Conexiones libres máximas (None = max_connections)
+            max_lifetime: Segundos de vida máximos de una conexión
+            idle_timeout: Segundos que una conexión puede estar libre antes de cerrarse
+            keepalive_interval: Segundos entre pasadas del hilo de mantenimiento (0 = sin hilo)
+            validate_after: Segundos libre tras los que se hace ping antes de prestar una conexión
         """
         self.max_connections = max_connections
-        self._pools: Dict[str, List[DatabaseHandler]] = {}
-        logger.info(f"Pool de conexiones inicializado (max: {max_connections})")
+        self.timeout = timeout
+        self.min_idle = min_idle
+        self.max_idle = max_connections if max_idle is None else max_idle
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.validate_after = validate_after
+        self._pools: Dict[str, _HandlerPool] = {}
+        self._lock = threading.Lock()
+        self._maintenance: Optional[threading.Thread] = None
+        self._stop_maintenance = threading.Event()
+        self.maintenance_runs = 0
+        logger.info(f"Pool de conexiones inicializado (max: {max_connections}, timeout: {timeout}s)")
+    
+    def _get_pool(self, connection_name: str, handler_class, **kwargs) -> _HandlerPool:
+        """Obtiene (o crea) el pool de una conexión con nombre"""
+        pool = self._pools.get(connection_name)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(connection_name)
+                if pool is None:
+                    pool = _HandlerPool(
+                        connection_name, handler_class, kwargs,
+                        max_size=self.max_connections,
+                        timeout=self.timeout,
+                        min_idle=self.min_idle,
+                        max_idle=self.max_idle,
+                        max_lifetime=self.max_lifetime,
+                        idle_timeout=self.idle_timeout,
+                        validate_after=self.validate_after
+                    )
+                    self._pools[connection_name] = pool
+                    if self.keepalive_interval and self._maintenance is None:
+                        self._start_maintenance()
+        return pool
+    
+    def _start_maintenance(self) -> None:
+        """Arranca el hilo que mantiene los pools cada keepalive_interval segundos"""
+        def run() -> None:
+            while not self._stop_maintenance.wait(self.keepalive_interval):
+                try:
+                    self.maintain()
+                except Exception as e:
+                    logger.error(f"❌ Error en el mantenimiento del pool: {e}")
+        
+        self._stop_maintenance.clear()
+        self._maintenance = threading.Thread(target=run, name="pool-maintenance", daemon=True)
+        self._maintenance.start()
+        logger.info(f"🩺 Mantenimiento del pool cada {self.keepalive_interval}s")
+    
+    def stop_maintenance(self) -> None:
+        """Detiene el hilo de mantenimiento (se vuelve a arrancar al crear otro pool)"""
+        self._stop_maintenance.set()
+        self._maintenance = None
+    
+    def maintain(self) -> Dict[str, int]:
+        """
+        Una pasada de mantenimiento sobre todos los pools: cierra las conexiones
+        libres caducadas, hace ping a las que llevan keepalive_interval sin
+        usarse, descarta las caídas y repone min_idle.
+        
+        Returns:
+            Dict con conexiones caducadas, caídas y reabiertas
+        """
+        result = {"expired": 0, "dead": 0, "opened": 0}
+        for name, pool in list(self._pools.items()):
+            result["expired"] += pool.evict_idle()
+            result["dead"] += pool.keepalive(self.keepalive_interval)
+            try:
+                result["opened"] += pool.prefill()
+            except Exception as e:
+                logger.debug(f"No se pudo reponer min_idle en {name}: {e}")
+        self.maintenance_runs += 1
+        if result["expired"] or result["dead"]:
+            logger.info(f"🩺 Mantenimiento del pool: {result}")
+        return result
+    
+    def acquire(self, connection_name: str, handler_class, timeout: Optional[float] = None,
+                **kwargs) -> DatabaseHandler:
+        """
+        Toma un handler del pool en exclusiva.
+        
+        Args:
+            connection_name: Nombre de la conexión
+            handler_class: Clase del manejador (MySQLHandler o PostgreSQLHandler)
+            timeout: Segundos de espera si el pool está lleno (None = pool_timeout)
+            **kwargs: Argumentos para crear el manejador
+        
+        Returns:
+            DatabaseHandler: Instancia del manejador, conectada
+        
+        Raises:
+            PoolTimeoutError: Si no se libera ninguna conexión a tiempo
+        """
+        return self._get_pool(connection_name, handler_class, **kwargs).acquire(timeout)
+    
+    def release(self, connection_name: str, handler: DatabaseHandler) -> None:
+        """
+        Devuelve un handler al pool tras resetear su estado de sesión.
+        
+        Args:
+            connection_name: Nombre de la conexión
+            handler: Handler obtenido con acquire()
+        """
+        pool = self._pools.get(connection_name)
+        if pool is None:
+            handler.disconnect()
+            return
+        pool.release(handler)
+    
+    @contextmanager
+    def connection(self, connection_name: str, handler_class, timeout: Optional[float] = None,
+                   **kwargs):
+        """
+        Context manager que toma un handler del pool y lo devuelve al salir.
+        
+        Example:
+            with pool.connection("mysql_local", MySQLHandler, **params) as handler:
+                handler.fetch_all("SELECT ...")
+        """
+        handler = self.acquire(connection_name, handler_class, timeout, **kwargs)
+        try:
+            yield handler
+        finally:
+            self.release(connection_name, handler)
     
     def get_connection(self, connection_name: str, handler_class, **kwargs) -> DatabaseHandler:
         """
         Obtiene una conexión del pool o crea una nueva.
         
+        Equivalente a acquire(); el llamador debe devolverla con release().
+        
         Args:
             connection_name: Nombre de la conexión
             handler_class: Clase del manejador (MySQLHandler o PostgreSQLHandler)
@@ -241,29 +1111,26 @@ class ConnectionPool:
         Returns:
             DatabaseHandler: Instancia del manejador
         """
-        # Crear pool para esta conexión si no existe
-        if connection_name not in self._pools:
-            self._pools[connection_name] = []
-        
-        pool = self._pools[connection_name]
-        
-        # Buscar conexión disponible
-        for handler in pool:
-            if handler.is_connected:
-                logger.debug(f"Reutilizando conexión existente: {connection_name}")
-                return handler
+        return self.acquire(connection_name, handler_class, **kwargs)
+    
+    def prefill(self, connection_name: str, handler_class, count: Optional[int] = None,
+                **kwargs) -> int:
+        """
+        Abre conexiones libres por adelantado (min_idle por defecto).
         
-        # Crear nueva conexión si hay espacio
-        if len(pool) < self.max_connections:
-            handler = handler_class(**kwargs)
-            handler.connect()
-            pool.append(handler)
-            logger.info(f"Nueva conexión creada en pool: {connection_name} ({len(pool)}/{self.max_connections})")
-            return handler
+        Returns:
+            Número de conexiones abiertas
+        """
+        return self._get_pool(connection_name, handler_class, **kwargs).prefill(count)
+    
+    def evict_idle(self) -> int:
+        """
+        Cierra las conexiones libres caducadas de todos los pools.
         
-        # Si el pool está lleno, usar la primera disponible
-        logger.warning(f"Pool lleno para {connection_name}, reutilizando conexión")
-        return pool[0]
+        Returns:
+            Número de conexiones cerradas
+        """
+        return sum(pool.evict_idle() for pool in list(self._pools.values()))
     
     def close_all(self, connection_name: Optional[str] = None) -> None:
         """
@@ -272,18 +1139,19 @@ class ConnectionPool:
         Args:
             connection_name: Nombre de la conexión (None para cerrar todas)
         """
+        with self._lock:
+            if connection_name:
+                pools = [self._pools.pop(connection_name)] if connection_name in self._pools else []
+            else:
+                pools = list(self._pools.values())
+                self._pools.clear()
+        
+        for pool in pools:
+            pool.close()
+        
         if connection_name:
-            if connection_name in self._pools:
-                for handler in self._pools[connection_name]:
-                    handler.disconnect()
-                self._pools[connection_name].clear()
-                logger.info(f"Pool cerrado: {connection_name}")
+            logger.info(f"Pool cerrado: {connection_name}")
         else:
-            for name, pool in self._pools.items():
-                for handler in pool:
-                    handler.disconnect()
-                pool.clear()
-            self._pools.clear()
             logger.info("Todos los pools cerrados")
     
     def get_stats(self) -> Dict[str, Any]:
@@ -293,36 +1161,40 @@ class ConnectionPool:
         Returns:
             Dict con estadísticas
         """
-        stats = {
-            "total_pools": len(self._pools),
+        pools = dict(self._pools)
+        return {
+            "total_pools": len(pools),
             "max_connections": self.max_connections,
-            "pools": {}
+            "timeout": self.timeout,
+            "min_idle": self.min_idle,
+            "max_idle": self.max_idle,
+            "keepalive_interval": self.keepalive_interval,
+            "validate_after": self.validate_after,
+            "maintenance_runs": self.maintenance_runs,
+            "pools": {name: pool.stats() for name, pool in pools.items()}
         }
-        
-        for name, pool in self._pools.items():
-            stats["pools"][name] = {
-                "total_connections": len(pool),
-                "active_connections": sum(1 for h in pool if h.is_connected)
-            }
-        
-        return stats
 
 
 # Instancia global del pool de conexiones
 _connection_pool: Optional[ConnectionPool] = None
+_connection_pool_lock = threading.Lock()
 
 
-def get_connection_pool(max_connections: int = 5) -> ConnectionPool:
+def get_connection_pool(max_connections: int = 5, **options) -> ConnectionPool:
     """
     Obtiene la instancia global del pool de conexiones (singleton).
     
     Args:
         max_connections: Número máximo de conexiones por pool
+        **options: Resto de opciones de ConnectionPool (timeout, min_idle, ...)
+            Solo se aplican al crear la instancia.
     
     Returns:
         ConnectionPool: Instancia del pool
     """
     global _connection_pool
     if _connection_pool is None:
-        _connection_pool = ConnectionPool(max_connections)
+        with _connection_pool_lock:
+            if _connection_pool is None:
+                _connection_pool = ConnectionPool(max_connections, **options)
     return _connection_pool
@@ -0,0 +1,151 @@
+"""
+Caché de metadatos de esquema (tablas, columnas, índices).
+Evita consultar al servidor en cada list_tables / get_table_schema.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataCache:
+    """
+    Caché LRU con TTL de metadatos, por conexión y base de datos.
+    
+    Las entradas se indexan por (scope, kind, name), donde scope identifica
+    la conexión del pool ("mysql_local" o "mysql_local/otra_bd"), kind el tipo
+    de metadato ("tables", "columns", "indexes") y name la tabla (o None).
+    """
+    
+    def __init__(self, ttl: float = 300, max_entries: int = 1000):
+        """
+        Inicializa la caché.
+        
+        Args:
+            ttl: Segundos de validez de cada entrada (0 = caché desactivada)
+            max_entries: Número máximo de entradas antes de expulsar las menos usadas
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, Optional[str]], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, scope: str, kind: str, name: Optional[str], loader: Callable[[], Any]) -> Any:
+        """
+        Devuelve un metadato de la caché o lo carga con loader().
+        
+        Args:
+            scope: Conexión del pool
+            kind: Tipo de metadato
+            name: Nombre de la tabla (None para metadatos de la base de datos)
+            loader: Función que consulta el servidor si no hay entrada válida
+        
+        Returns:
+            Valor cacheado o recién cargado
+        """
+        if self.ttl <= 0:
+            return loader()
+        
+        key = (scope, kind, name)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        value = loader()
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+    
+    def invalidate(self, connection_name: Optional[str] = None, table_name: Optional[str] = None) -> int:
+        """
+        Elimina entradas de la caché.
+        
+        Args:
+            connection_name: Conexión a invalidar, incluidas sus otras bases de datos
+                (None = todas)
+            table_name: Tabla concreta (None = todas las de la conexión). La lista
+                de tablas se invalida siempre.
+        
+        Returns:
+            Número de entradas eliminadas
+        """
+        with self._lock:
+            removed = 0
+            for key in list(self._entries.keys()):
+                scope, kind, name = key
+                if connection_name and scope != connection_name and not scope.startswith(connection_name + "/"):
+                    continue
+                if table_name and name not in (table_name, None):
+                    continue
+                del self._entries[key]
+                removed += 1
+        
+        if removed:
+            logger.debug(f"Caché de metadatos invalidada: {connection_name or 'todas'} / {table_name or '*'} ({removed})")
+        return removed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas de la caché.
+        
+        Returns:
+            Dict con entradas, aciertos y fallos
+        """
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# Instancia global de la caché de metadatos
+_metadata_cache: Optional[MetadataCache] = None
+_metadata_cache_lock = threading.Lock()
+
+
+def get_metadata_cache(ttl: float = 300, max_entries: int = 1000) -> MetadataCache:
+    """
+    Obtiene la instancia global de la caché de metadatos (singleton).
+    
+    Args:
+        ttl: Segundos de validez de cada entrada (solo al crear la instancia)
+        max_entries: Entradas máximas (solo al crear la instancia)
+    
+    Returns:
+        MetadataCache: Instancia de la caché
+    """
+    global _metadata_cache
+    if _metadata_cache is None:
+        with _metadata_cache_lock:
+            if _metadata_cache is None:
+                _metadata_cache = MetadataCache(ttl, max_entries)
+    return _metadata_cache
+
+
+def invalidate_metadata(connection_name: Optional[str] = None, table_name: Optional[str] = None) -> int:
+    """
+    Invalida la caché global si ya existe (no la crea).
+    
+    Returns:
+        Número de entradas eliminadas
+    """
+    if _metadata_cache is None:
+        return 0
+    return _metadata_cache.invalidate(connection_name, table_name)
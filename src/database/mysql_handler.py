@@ -3,13 +3,35 @@ Manejador de conexiones MySQL.
 """
 
 import pymysql
-from pymysql.cursors import DictCursor
-from typing import List, Dict, Any, Optional
+from pymysql.constants import SERVER_STATUS
+from pymysql.cursors import DictCursor, SSDictCursor
+from typing import List, Dict, Any, Optional, Iterator, Iterable
+import json
 import logging
-from .connection import DatabaseHandler
+import os
+import threading
+from .bulk_load import encode_rows
+from .connection import DatabaseHandler, BulkLoadRejected, BulkLoadUnavailable, retry_on_disconnect
+
+try:
+    from ..utils.metrics import timed
+except ImportError:
+    from utils.metrics import timed
 
 logger = logging.getLogger(__name__)
 
+# Errores del servidor/cliente cuando LOAD DATA LOCAL está deshabilitado
+_LOCAL_INFILE_DISABLED = {1148, 2068, 3948}
+
+# Sentencia interrumpida (KILL QUERY), max_statement_time (MariaDB), MAX_EXECUTION_TIME (MySQL)
+_TIMEOUT_ERRORS = {1317, 1969, 3024}
+
+# Margen del timeout de socket sobre el de sentencia (respaldo si el servidor no corta)
+_SOCKET_GRACE = 10
+
+# Servidor desaparecido, conexión perdida durante la consulta, conexión cerrada
+_CONNECTION_ERRORS = {2006, 2013, 2055}
+
 
 class MySQLHandler(DatabaseHandler):
     """
@@ -17,7 +39,9 @@ class MySQLHandler(DatabaseHandler):
     Utiliza PyMySQL para la conexión.
     """
     
-    def __init__(self, host: str, port: int, user: str, password: str, database: Optional[str] = None):
+    def __init__(self, host: str, port: int, user: str, password: str, database: Optional[str] = None,
+                 statement_cache_size: int = 0, query_timeout: Optional[float] = None,
+                 local_infile: bool = False):
         """
         Inicializa el manejador MySQL.
         
@@ -27,10 +51,18 @@ class MySQLHandler(DatabaseHandler):
             user: Usuario de MySQL
             password: Contraseña del usuario
             database: Nombre de la base de datos (opcional)
+            statement_cache_size: Sentencias preparadas a mantener por sesión (0 = desactivado)
+            query_timeout: Tiempo máximo por sentencia en segundos (None = sin límite)
+            local_infile: Habilita LOAD DATA LOCAL INFILE para bulk_load
         """
-        super().__init__(host, port, user, password, database)
+        super().__init__(host, port, user, password, database, statement_cache_size, query_timeout)
+        self.local_infile = local_infile
         self.cursor = None
+        self._thread_id: Optional[int] = None
+        # MAX_EXECUTION_TIME (MySQL) o max_statement_time (MariaDB), detectado al aplicarlo
+        self._timeout_variable: Optional[str] = None
     
+    @timed("connect")
     def connect(self) -> None:
         """Establece conexión con MySQL"""
         try:
@@ -42,10 +74,17 @@ class MySQLHandler(DatabaseHandler):
                 database=self.database,
                 cursorclass=DictCursor,
                 charset='utf8mb4',
-                autocommit=False
+                autocommit=False,
+                local_infile=self.local_infile,
+                read_timeout=self._socket_timeout(self.query_timeout),
+                write_timeout=self._socket_timeout(self.query_timeout)
             )
             self.cursor = self.connection.cursor()
+            self._thread_id = self.connection.thread_id()
             self._is_connected = True
+            self._statement_timeout = None
+            if self.query_timeout:
+                self.set_statement_timeout(self.query_timeout)
             logger.info(f"✅ Conexión MySQL establecida: {self.host}:{self.port}/{self.database or 'sin BD'}")
             
         except pymysql.Error as e:
@@ -70,6 +109,7 @@ class MySQLHandler(DatabaseHandler):
         except Exception as e:
             logger.error(f"❌ Error cerrando conexión MySQL: {e}")
     
+    @timed("execute_query")
     def execute_query(self, query: str, params: Optional[tuple] = None) -> int:
         """
         Ejecuta una consulta que modifica datos.
@@ -90,12 +130,15 @@ class MySQLHandler(DatabaseHandler):
                 affected = self.cursor.execute(query)
             
             logger.debug(f"Query ejecutado: {query[:100]}... | Filas afectadas: {affected}")
+            self._track_ddl(query)
             return affected
             
         except pymysql.Error as e:
             logger.error(f"❌ Error ejecutando query: {e}")
             raise
     
+    @timed("fetch_one")
+    @retry_on_disconnect
     def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
         """
         Ejecuta una consulta y devuelve un solo resultado.
@@ -123,6 +166,8 @@ class MySQLHandler(DatabaseHandler):
             logger.error(f"❌ Error en fetch_one: {e}")
             raise
     
+    @timed("fetch_all")
+    @retry_on_disconnect
     def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
         """
         Ejecuta una consulta y devuelve todos los resultados.
@@ -150,6 +195,106 @@ class MySQLHandler(DatabaseHandler):
             logger.error(f"❌ Error en fetch_all: {e}")
             raise
     
+    @timed("iter_rows")
+    def iter_rows(self, query: str, params: Optional[tuple] = None,
+                  batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Ejecuta una consulta y devuelve los resultados fila a fila
+        usando un cursor sin buffer (SSDictCursor).
+        
+        Args:
+            query: Consulta SQL
+            params: Parámetros de la consulta (opcional)
+            batch_size: Filas a leer en cada fetchmany
+        
+        Yields:
+            Diccionario por cada fila
+        """
+        self.ensure_connected()
+        
+        cursor = self.connection.cursor(SSDictCursor)
+        finished = False
+        try:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            
+            total = 0
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                total += len(rows)
+                yield from rows
+            finished = True
+            
+            logger.debug(f"Iter rows: {query[:100]}... | Resultados: {total} filas")
+            
+        except pymysql.Error as e:
+            finished = True
+            logger.error(f"❌ Error en iter_rows: {e}")
+            raise
+        finally:
+            if finished:
+                cursor.close()
+            else:
+                self._close_stream_early(cursor)
+    
+    def _close_stream_early(self, cursor) -> None:
+        """
+        Cierra un SSDictCursor que el consumidor dejó a medias.
+        
+        Cerrarlo sin más obliga a leer del socket todas las filas pendientes;
+        KILL QUERY hace que el servidor deje de enviarlas y el resultado
+        termine con el error 1317, que aquí se descarta.
+        """
+        result = cursor._result
+        if result is not None and result.unbuffered_active:
+            try:
+                self.cancel()
+            except pymysql.Error as e:
+                logger.warning(f"⚠️ No se pudo cancelar el resto del resultado: {e}")
+        try:
+            cursor.close()
+        except pymysql.err.OperationalError as e:
+            if not e.args or e.args[0] not in _TIMEOUT_ERRORS:
+                raise
+            result.unbuffered_active = False
+            cursor.connection = None
+        logger.debug("🛑 Resultado sin buffer cancelado antes de agotarse")
+    
+    @timed("execute_many")
+    def execute_many(self, query: str, params_list: List[tuple], page_size: int = 1000) -> int:
+        """
+        Ejecuta una consulta por páginas con cursor.executemany.
+        
+        PyMySQL reescribe los INSERT ... VALUES en un único INSERT multi-fila
+        por página; el resto de sentencias se ejecutan una a una en el cliente.
+        
+        Args:
+            query: Consulta SQL
+            params_list: Lista de tuplas con parámetros
+            page_size: Filas por página
+        
+        Returns:
+            Número total de filas afectadas
+        """
+        self.ensure_connected()
+        
+        total_affected = 0
+        with self.transaction():
+            try:
+                for start in range(0, len(params_list), page_size):
+                    page = params_list[start:start + page_size]
+                    total_affected += self.cursor.executemany(query, page) or 0
+            except pymysql.Error as e:
+                logger.error(f"❌ Error en executemany: {e}")
+                raise
+        
+        logger.debug(f"executemany: {len(params_list)} filas | Filas afectadas: {total_affected}")
+        return total_affected
+    
     def begin_transaction(self) -> None:
         """Inicia una transacción"""
         self.ensure_connected()
@@ -191,6 +336,207 @@ class MySQLHandler(DatabaseHandler):
             return self.cursor.lastrowid
         return None
     
+    @staticmethod
+    def _socket_timeout(timeout: Optional[float]) -> Optional[float]:
+        """Timeout de lectura/escritura del socket para un timeout de sentencia"""
+        return timeout + _SOCKET_GRACE if timeout else None
+    
+    def set_statement_timeout(self, timeout: Optional[float]) -> None:
+        """
+        Aplica MAX_EXECUTION_TIME (solo afecta a SELECT) o max_statement_time en MariaDB,
+        y ajusta el timeout del socket como respaldo.
+        
+        Args:
+            timeout: Segundos (None o 0 = sin límite)
+        """
+        self.ensure_connected()
+        
+        try:
+            if self._timeout_variable != 'max_statement_time':
+                try:
+                    self.cursor.execute("SET SESSION MAX_EXECUTION_TIME = %s", (int((timeout or 0) * 1000),))
+                    self._timeout_variable = 'max_execution_time'
+                except pymysql.Error as e:
+                    # 1193: variable desconocida, el servidor es MariaDB
+                    if not e.args or e.args[0] != 1193:
+                        raise
+                    self._timeout_variable = 'max_statement_time'
+            if self._timeout_variable == 'max_statement_time':
+                self.cursor.execute("SET SESSION max_statement_time = %s", (timeout or 0,))
+        except pymysql.Error as e:
+            logger.error(f"❌ Error aplicando timeout de sentencia: {e}")
+            raise
+        
+        # PyMySQL relee estos atributos en cada operación de socket
+        self.connection._read_timeout = self._socket_timeout(timeout)
+        self.connection._write_timeout = self._socket_timeout(timeout)
+        self._statement_timeout = timeout
+    
+    def cancel(self) -> None:
+        """Ejecuta KILL QUERY sobre esta sesión desde una conexión auxiliar"""
+        if not self._thread_id:
+            return
+        
+        side = pymysql.connect(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            password=self.password,
+            connect_timeout=5
+        )
+        try:
+            with side.cursor() as cursor:
+                cursor.execute("KILL QUERY %s", (self._thread_id,))
+            logger.info(f"🛑 KILL QUERY enviado al hilo {self._thread_id} de {self.host}:{self.port}")
+        finally:
+            side.close()
+    
+    def _is_timeout_error(self, error: Exception) -> bool:
+        """Timeout del servidor, KILL QUERY o timeout de socket"""
+        if not isinstance(error, pymysql.Error) or not error.args:
+            return False
+        code = error.args[0]
+        return code in _TIMEOUT_ERRORS or (code == 2013 and 'timed out' in str(error))
+    
+    def _ping(self) -> None:
+        """COM_PING sin reconexión automática"""
+        self.connection.ping(reconnect=False)
+    
+    def _session_idle(self) -> bool:
+        """Sin transacción abierta según el último estado enviado por el servidor"""
+        return not (self.connection.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS)
+    
+    def _is_connection_error(self, error: Exception) -> bool:
+        """Servidor caído, conexión cortada (wait_timeout, failover) o socket ya cerrado"""
+        if isinstance(error, pymysql.err.InterfaceError):
+            return True
+        return (isinstance(error, pymysql.err.OperationalError) and bool(error.args)
+                and error.args[0] in _CONNECTION_ERRORS)
+    
+    def get_batch_limits(self) -> Dict[str, Optional[int]]:
+        """
+        Límites para INSERT multi-fila según max_allowed_packet del servidor.
+        
+        Returns:
+            Dict con max_bytes y max_params
+        """
+        if self._batch_limits is None:
+            result = self.fetch_one("SELECT @@max_allowed_packet AS max_allowed_packet")
+            max_packet = int(result['max_allowed_packet']) if result else 4 * 1024 * 1024
+            # Margen para la cabecera del paquete
+            self._batch_limits = {"max_bytes": max_packet - 1024, "max_params": None}
+        return self._batch_limits
+    
+    def render_row(self, params: tuple) -> str:
+        """
+        Renderiza una fila como literal SQL escapado por PyMySQL.
+        
+        Args:
+            params: Valores de la fila
+        
+        Returns:
+            Literal "(v1, v2, ...)"
+        """
+        self.ensure_connected()
+        placeholders = ", ".join(["%s"] * len(params))
+        return self.cursor.mogrify(f"({placeholders})", params)
+    
+    @timed("bulk_load")
+    def bulk_load(self, table_name: str, columns: List[str], rows: Iterable[tuple]) -> Dict[str, Any]:
+        """
+        Carga filas con LOAD DATA LOCAL INFILE leyendo de un pipe en memoria.
+        
+        Un hilo escribe las filas codificadas en el extremo de escritura de un
+        os.pipe() y PyMySQL lee el otro extremo como /dev/fd/N, por lo que los
+        datos nunca se escriben a disco ni se materializan completos en memoria.
+        
+        Args:
+            table_name: Nombre de la tabla
+            columns: Columnas en el orden de los valores de cada fila
+            rows: Iterable de tuplas con los valores
+        
+        Con LOCAL el servidor convierte los errores de clave duplicada y de
+        conversión en advertencias aunque el modo sea estricto: las filas se
+        descartan o truncan sin error. Por eso cualquier advertencia, o un
+        número de filas afectadas distinto del enviado, se trata como fallo.
+        
+        Returns:
+            Dict con rows, bytes y warnings
+        
+        Raises:
+            BulkLoadUnavailable: Si local_infile está deshabilitado o no existe /dev/fd
+            BulkLoadRejected: Si alguna fila se descartó o se alteró
+        """
+        if not self.local_infile:
+            raise BulkLoadUnavailable("local_infile deshabilitado para esta conexión")
+        if not os.path.isdir('/dev/fd'):
+            raise BulkLoadUnavailable("/dev/fd no disponible en este sistema")
+        
+        self.ensure_connected()
+        
+        read_fd, write_fd = os.pipe()
+        sent = {"rows": 0, "bytes": 0}
+        errors: List[BaseException] = []
+        
+        def feed() -> None:
+            try:
+                with os.fdopen(write_fd, 'wb', buffering=1 << 16) as pipe:
+                    for line in encode_rows(rows, "mysql"):
+                        pipe.write(line)
+                        sent["rows"] += 1
+                        sent["bytes"] += len(line)
+            except BrokenPipeError:
+                # El servidor rechazó la carga antes de leer el pipe
+                pass
+            except BaseException as e:
+                errors.append(e)
+        
+        writer = threading.Thread(target=feed, name=f"mysql-bulk-load-{table_name}", daemon=True)
+        writer.start()
+        
+        # CHARACTER SET binary: los textos ya van en UTF-8 y los bytes se cargan sin conversión
+        query = (
+            f"LOAD DATA LOCAL INFILE '/dev/fd/{read_fd}' INTO TABLE {table_name} "
+            "CHARACTER SET binary "
+            "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+            "LINES TERMINATED BY '\\n' "
+            f"({', '.join(columns)})"
+        )
+        
+        try:
+            affected = self.cursor.execute(query)
+        except pymysql.Error as e:
+            if e.args and e.args[0] in _LOCAL_INFILE_DISABLED:
+                raise BulkLoadUnavailable(str(e)) from e
+            logger.error(f"❌ Error en LOAD DATA: {e}")
+            raise
+        finally:
+            os.close(read_fd)
+            writer.join()
+        
+        if errors:
+            # El pipe se cerró antes de tiempo: la carga es parcial y debe revertirse
+            raise errors[0]
+        
+        warnings = self.cursor.warning_count
+        if warnings or affected != sent["rows"]:
+            details = self._warning_messages() if warnings else []
+            raise BulkLoadRejected(
+                f"LOAD DATA en {table_name}: {affected} de {sent['rows']} filas cargadas, "
+                f"{warnings} advertencias" + (f" ({'; '.join(details)})" if details else "")
+            )
+        logger.debug(f"LOAD DATA en {table_name}: {sent['rows']} filas, {sent['bytes']} bytes")
+        return {"rows": affected, "bytes": sent["bytes"], "warnings": warnings}
+    
+    def _warning_messages(self, limit: int = 5) -> List[str]:
+        """Primeras advertencias de la última sentencia (SHOW WARNINGS)"""
+        try:
+            self.cursor.execute(f"SHOW WARNINGS LIMIT {int(limit)}")
+            return [f"{row['Code']}: {row['Message']}" for row in self.cursor.fetchall()]
+        except pymysql.Error as e:
+            logger.debug(f"No se pudieron leer las advertencias: {e}")
+            return []
+    
     def list_databases(self) -> List[str]:
         """
         Lista todas las bases de datos disponibles.
@@ -237,6 +583,87 @@ class MySQLHandler(DatabaseHandler):
         query = f"DESCRIBE `{table_name}`"
         return self.fetch_all(query)
     
+    def get_indexes(self, table_name: str) -> List[Dict[str, Any]]:
+        """
+        Obtiene los índices de una tabla.
+        
+        Args:
+            table_name: Nombre de la tabla
+        
+        Returns:
+            Lista de índices con name, columns, unique, primary y nullable
+        """
+        rows = self.fetch_all(f"SHOW KEYS FROM `{table_name}`")
+        
+        indexes: Dict[str, Dict[str, Any]] = {}
+        for row in sorted(rows, key=lambda r: (r['Key_name'], r['Seq_in_index'])):
+            index = indexes.setdefault(row['Key_name'], {
+                "name": row['Key_name'],
+                "columns": [],
+                "unique": not row['Non_unique'],
+                "primary": row['Key_name'] == 'PRIMARY',
+                "nullable": False
+            })
+            index["columns"].append(row['Column_name'])
+            index["nullable"] = index["nullable"] or row['Null'] == 'YES'
+        
+        return list(indexes.values())
+    
+    def estimate_row_count(self, table_name: str) -> Optional[int]:
+        """
+        Estima el número de filas de una tabla según information_schema.
+        Para InnoDB es una estimación que puede desviarse un 40-50%.
+        
+        Args:
+            table_name: Nombre de la tabla
+        
+        Returns:
+            Filas estimadas o None si la tabla no tiene estadísticas
+        """
+        query = """
+            SELECT TABLE_ROWS AS estimate
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = %s
+        """
+        result = self.fetch_one(query, (table_name,))
+        if not result or result['estimate'] is None:
+            return None
+        return int(result['estimate'])
+    
+    def explain_row_estimate(self, query: str, params: Optional[tuple] = None) -> Optional[int]:
+        """
+        Estima las filas que devolvería una consulta usando EXPLAIN.
+        
+        Args:
+            query: Consulta SELECT
+            params: Parámetros de la consulta (opcional)
+        
+        Returns:
+            Filas estimadas por el optimizador o None
+        """
+        plan = self.fetch_all(f"EXPLAIN {query}", params)
+        if not plan or plan[0].get('rows') is None:
+            return None
+        filtered = float(plan[0].get('filtered') or 100.0)
+        return int(round(int(plan[0]['rows']) * filtered / 100.0))
+    
+    def explain_plan(self, query: str, params: Optional[tuple] = None) -> Any:
+        """
+        Plan de ejecución con EXPLAIN FORMAT=JSON.
+        
+        Args:
+            query: Consulta SELECT
+            params: Parámetros de la consulta (opcional)
+        
+        Returns:
+            Plan como diccionario
+        """
+        result = self.fetch_one(f"EXPLAIN FORMAT=JSON {query}", params)
+        if not result:
+            return None
+        return json.loads(result['EXPLAIN'])
+    
     def get_server_version(self) -> str:
         """
         Obtiene la versión del servidor MySQL.
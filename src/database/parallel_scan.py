@@ -0,0 +1,265 @@
+"""
+Lecturas paralelas por rangos de clave primaria.
+
+Una lectura grande se divide en rangos contiguos de una clave entera y cada
+rango se lee con iter_rows en una conexión distinta del pool, desde un hilo
+propio. Las filas llegan al consumidor por colas acotadas (la memoria no
+depende del tamaño de la tabla) y se entregan en orden de clave, rango a
+rango, o en el orden en que llegan.
+
+El número de lecturas simultáneas contra una misma conexión está limitado
+por ScanSlots, compartido por todas las lecturas paralelas del proceso.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Sequence, Tuple
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Lotes en cola por rango antes de que el hilo lector espere al consumidor
+_QUEUE_BATCHES = 4
+
+# Segundos entre comprobaciones de cancelación mientras una cola está llena
+_POLL_SECONDS = 0.1
+
+_DONE = object()
+
+
+class ScanSlots:
+    """
+    Cupo de lecturas simultáneas contra una conexión.
+    
+    Cada lectura paralela reserva de golpe los hilos que va a usar, así dos
+    lecturas concurrentes nunca se quedan esperando la una a la otra.
+    
+    Example:
+        slots = get_scan_slots("mysql_local", 4)
+        granted = slots.reserve(8)   # 4 si no hay otra lectura en curso
+        ...
+        slots.release(granted)
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_use = 0
+        self.total_scans = 0
+        self._cond = threading.Condition()
+    
+    def reserve(self, wanted: int, timeout: Optional[float] = None) -> int:
+        """
+        Reserva hasta wanted hilos, esperando si el cupo está agotado.
+        
+        Returns:
+            Hilos concedidos (al menos 1)
+        
+        Raises:
+            TimeoutError: Si no se libera ningún hueco en timeout segundos
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.in_use < self.capacity, timeout):
+                raise TimeoutError(f"No hay hueco para lecturas paralelas tras {timeout}s "
+                                   f"({self.in_use}/{self.capacity} en uso)")
+            granted = max(1, min(wanted, self.capacity - self.in_use))
+            self.in_use += granted
+            self.total_scans += 1
+            return granted
+    
+    def release(self, granted: int) -> None:
+        """Devuelve los hilos reservados"""
+        with self._cond:
+            self.in_use -= granted
+            self._cond.notify_all()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {"capacity": self.capacity, "in_use": self.in_use, "total_scans": self.total_scans}
+
+
+_slots: Dict[str, ScanSlots] = {}
+_slots_lock = threading.Lock()
+
+
+def get_scan_slots(connection_name: str, capacity: int) -> ScanSlots:
+    """
+    Cupo de lecturas paralelas de una conexión (uno por nombre de conexión).
+    
+    Args:
+        connection_name: Nombre de la conexión
+        capacity: Hilos simultáneos permitidos (se aplica al crear el cupo)
+    
+    Returns:
+        ScanSlots de la conexión
+    """
+    with _slots_lock:
+        if connection_name not in _slots:
+            _slots[connection_name] = ScanSlots(capacity)
+        return _slots[connection_name]
+
+
+def get_scan_stats() -> Dict[str, Dict[str, Any]]:
+    """Uso del cupo de lecturas paralelas por conexión"""
+    with _slots_lock:
+        return {name: slots.get_stats() for name, slots in _slots.items()}
+
+
+def split_key_range(low: int, high: int, partitions: int,
+                    histogram: Optional[Sequence[int]] = None) -> List[int]:
+    """
+    Calcula los límites interiores que dividen [low, high] en rangos.
+    
+    Con un histograma de igual frecuencia (p. ej. pg_stats.histogram_bounds)
+    los límites se toman de sus cuantiles, de modo que cada rango tiene
+    aproximadamente las mismas filas aunque la clave tenga huecos. Sin él,
+    el intervalo se divide en partes iguales.
+    
+    Args:
+        low: Valor mínimo de la clave
+        high: Valor máximo de la clave
+        partitions: Número de rangos deseado
+        histogram: Límites del histograma ordenados (opcional)
+    
+    Returns:
+        Lista ordenada de límites (vacía si no se puede dividir)
+    
+    Example:
+        split_key_range(1, 1000, 4)
+        # [251, 501, 751]
+    """
+    if partitions <= 1 or high <= low:
+        return []
+    
+    if histogram and len(histogram) > partitions:
+        step = (len(histogram) - 1) / partitions
+        candidates = [histogram[round(i * step)] for i in range(1, partitions)]
+    else:
+        width = (high - low + 1) / partitions
+        candidates = [low + int(i * width) for i in range(1, partitions)]
+    
+    return sorted({value for value in candidates if low < value <= high})
+
+
+def key_ranges(boundaries: List[int]) -> List[Tuple[Optional[int], Optional[int]]]:
+    """
+    Rangos [desde, hasta) a partir de los límites.
+    
+    El primero no tiene límite inferior y el último no tiene superior, así
+    los rangos cubren toda la tabla aunque las estadísticas estén desfasadas.
+    """
+    edges: List[Optional[int]] = [None, *boundaries, None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _put(out: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Encola item salvo que se haya cancelado la lectura"""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _drain(source: queue.Queue, producers: int) -> Iterator[Dict[str, Any]]:
+    """Entrega las filas de una cola hasta que terminan sus productores"""
+    finished = 0
+    while finished < producers:
+        item = source.get()
+        if item is _DONE:
+            finished += 1
+        elif isinstance(item, BaseException):
+            raise item
+        else:
+            yield from item
+
+
+def scan_partitions(
+    lease: Callable[[], ContextManager[Any]],
+    queries: List[Tuple[str, Optional[tuple]]],
+    workers: int,
+    ordered: bool = True,
+    batch_size: int = 1000,
+    limit: Optional[int] = None,
+    slots: Optional[ScanSlots] = None,
+    slot_timeout: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lee varias consultas en paralelo, cada una en su propia conexión.
+    
+    Con ordered=True las filas se entregan consulta a consulta en el orden
+    de la lista (las siguientes se van leyendo mientras tanto); si cada
+    consulta va ordenada por la clave, el resultado completo queda ordenado.
+    Con ordered=False se entregan según llegan.
+    
+    Cerrar el generador cancela las lecturas pendientes y libera las conexiones.
+    
+    Args:
+        lease: Función que devuelve un context manager con un handler del pool
+        queries: Lista de (query, params), una por rango
+        workers: Hilos (y conexiones) simultáneos deseados
+        ordered: Entregar las filas en el orden de las consultas
+        batch_size: Filas por lote entre hilo lector y consumidor
+        limit: Filas máximas a entregar en total (None = todas)
+        slots: Cupo de la conexión (None = sin límite adicional)
+        slot_timeout: Segundos máximos esperando hueco en el cupo
+    
+    Yields:
+        Diccionario por cada fila
+    """
+    granted = slots.reserve(workers, slot_timeout) if slots else workers
+    workers = max(1, min(granted, len(queries)))
+    stop = threading.Event()
+    if ordered:
+        queues = [queue.Queue(maxsize=_QUEUE_BATCHES) for _ in queries]
+    else:
+        shared: queue.Queue = queue.Queue(maxsize=_QUEUE_BATCHES * workers)
+        queues = [shared] * len(queries)
+    
+    def read(index: int) -> None:
+        out = queues[index]
+        if stop.is_set():
+            return
+        try:
+            query, params = queries[index]
+            with lease() as handler:
+                rows = handler.iter_rows(query, params, batch_size)
+                try:
+                    batch = []
+                    for row in rows:
+                        batch.append(row)
+                        if len(batch) >= batch_size:
+                            if not _put(out, batch, stop):
+                                return
+                            batch = []
+                    if batch and not _put(out, batch, stop):
+                        return
+                finally:
+                    rows.close()
+            _put(out, _DONE, stop)
+        except BaseException as e:
+            _put(out, e, stop)
+    
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parallel-scan")
+    delivered = 0
+    try:
+        for index in range(len(queries)):
+            executor.submit(read, index)
+        
+        if ordered:
+            rows = (row for source in queues for row in _drain(source, 1))
+        else:
+            rows = _drain(shared, len(queries))
+        
+        logger.debug(f"Lectura paralela: {len(queries)} rangos con {workers} hilos")
+        for row in rows:
+            yield row
+            delivered += 1
+            if limit and delivered >= limit:
+                break
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+        if slots:
+            slots.release(granted)
@@ -3,13 +3,64 @@ Manejador de conexiones PostgreSQL.
 """
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from typing import List, Dict, Any, Optional
+import psycopg2.errors
+import psycopg2.extensions
+from psycopg2.extras import RealDictCursor, execute_values
+from typing import List, Dict, Any, Optional, Iterator, Iterable
+import itertools
+import json
 import logging
-from .connection import DatabaseHandler
+import re
+from .bulk_load import encode_rows, RowStream
+from .connection import DatabaseHandler, retry_on_disconnect, _DDL_PATTERN
+from .statement_cache import StatementCache
+
+try:
+    from ..utils.metrics import timed
+except ImportError:
+    from utils.metrics import timed
 
 logger = logging.getLogger(__name__)
 
+# Contadores para nombrar cursores del lado del servidor y sentencias preparadas
+_cursor_ids = itertools.count(1)
+_statement_ids = itertools.count(1)
+
+
+# INSERT ... VALUES (...) reescribible con execute_values
+_INSERT_VALUES = re.compile(r'^\s*INSERT\s+INTO\s+.+?\s+VALUES\s*(?=\()', re.IGNORECASE | re.DOTALL)
+
+
+def _split_values_template(query: str) -> Optional[tuple]:
+    """
+    Separa un INSERT ... VALUES (%s, ...) en (sql con un único %s, plantilla de fila).
+    
+    Returns:
+        Tupla (sql, template) o None si la consulta no tiene esa forma
+    """
+    match = _INSERT_VALUES.match(query)
+    if not match:
+        return None
+    
+    start = match.end()
+    depth = 0
+    for index in range(start, len(query)):
+        if query[index] == '(':
+            depth += 1
+        elif query[index] == ')':
+            depth -= 1
+            if depth == 0:
+                template = query[start:index + 1]
+                return query[:start] + '%s' + query[index + 1:], template
+    return None
+
+
+def _to_numbered_params(query: str) -> str:
+    """Convierte los marcadores %s de psycopg2 en $1, $2, ... para PREPARE"""
+    counter = itertools.count(1)
+    parts = query.split('%s')
+    return parts[0] + ''.join(f"${next(counter)}{part}" for part in parts[1:])
+
 
 class PostgreSQLHandler(DatabaseHandler):
     """
@@ -17,7 +68,8 @@ class PostgreSQLHandler(DatabaseHandler):
     Utiliza psycopg2 para la conexión.
     """
     
-    def __init__(self, host: str, port: int, user: str, password: str, database: Optional[str] = None):
+    def __init__(self, host: str, port: int, user: str, password: str, database: Optional[str] = None,
+                 statement_cache_size: int = 0, query_timeout: Optional[float] = None):
         """
         Inicializa el manejador PostgreSQL.
         
@@ -27,10 +79,14 @@ class PostgreSQLHandler(DatabaseHandler):
             user: Usuario de PostgreSQL
             password: Contraseña del usuario
             database: Nombre de la base de datos (opcional)
+            statement_cache_size: Sentencias preparadas a mantener por sesión (0 = desactivado)
+            query_timeout: Tiempo máximo por sentencia en segundos (None = sin límite)
         """
-        super().__init__(host, port, user, password, database)
+        super().__init__(host, port, user, password, database, statement_cache_size, query_timeout)
         self.cursor = None
+        self.statements = StatementCache(statement_cache_size, self._deallocate)
     
+    @timed("connect")
     def connect(self) -> None:
         """Establece conexión con PostgreSQL"""
         try:
@@ -40,16 +96,23 @@ class PostgreSQLHandler(DatabaseHandler):
                 'port': self.port,
                 'user': self.user,
                 'password': self.password,
+                'connect_timeout': 5
             }
             
             if self.database:
                 conn_params['database'] = self.database
             
+            # statement_timeout por defecto de la sesión; deadline() puede cambiarlo por llamada
+            if self.query_timeout:
+                conn_params['options'] = f"-c statement_timeout={int(self.query_timeout * 1000)}"
+            
             self.connection = psycopg2.connect(
                 **conn_params,
                 cursor_factory=RealDictCursor
             )
             self.cursor = self.connection.cursor()
+            self.statements.clear()
+            self._statement_timeout = self.query_timeout
             self._is_connected = True
             logger.info(f"✅ Conexión PostgreSQL establecida: {self.host}:{self.port}/{self.database or 'sin BD'}")
             
@@ -75,6 +138,7 @@ class PostgreSQLHandler(DatabaseHandler):
         except Exception as e:
             logger.error(f"❌ Error cerrando conexión PostgreSQL: {e}")
     
+    @timed("execute_query")
     def execute_query(self, query: str, params: Optional[tuple] = None) -> int:
         """
         Ejecuta una consulta que modifica datos.
@@ -96,12 +160,15 @@ class PostgreSQLHandler(DatabaseHandler):
             
             affected = self.cursor.rowcount
             logger.debug(f"Query ejecutado: {query[:100]}... | Filas afectadas: {affected}")
+            self._track_ddl(query)
             return affected
             
         except psycopg2.Error as e:
             logger.error(f"❌ Error ejecutando query: {e}")
             raise
     
+    @timed("fetch_one")
+    @retry_on_disconnect
     def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
         """
         Ejecuta una consulta y devuelve un solo resultado.
@@ -133,6 +200,8 @@ class PostgreSQLHandler(DatabaseHandler):
             logger.error(f"❌ Error en fetch_one: {e}")
             raise
     
+    @timed("fetch_all")
+    @retry_on_disconnect
     def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
         """
         Ejecuta una consulta y devuelve todos los resultados.
@@ -163,6 +232,212 @@ class PostgreSQLHandler(DatabaseHandler):
             logger.error(f"❌ Error en fetch_all: {e}")
             raise
     
+    @timed("iter_rows")
+    def iter_rows(self, query: str, params: Optional[tuple] = None,
+                  batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Ejecuta una consulta y devuelve los resultados fila a fila
+        usando un cursor con nombre (del lado del servidor).
+        
+        Args:
+            query: Consulta SQL
+            params: Parámetros de la consulta (opcional)
+            batch_size: Filas a leer en cada fetchmany
+        
+        Yields:
+            Diccionario por cada fila
+        """
+        self.ensure_connected()
+        
+        cursor = self.connection.cursor(
+            name=f"mcp_stream_{next(_cursor_ids)}",
+            cursor_factory=RealDictCursor
+        )
+        cursor.itersize = batch_size
+        try:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            
+            total = 0
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                total += len(rows)
+                for row in rows:
+                    yield dict(row)
+            
+            logger.debug(f"Iter rows: {query[:100]}... | Resultados: {total} filas")
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error en iter_rows: {e}")
+            raise
+        finally:
+            cursor.close()
+    
+    @timed("execute_many")
+    def execute_many(self, query: str, params_list: List[tuple], page_size: int = 1000) -> int:
+        """
+        Ejecuta una consulta por páginas.
+        
+        Los INSERT ... VALUES (%s, ...) se envían con execute_values, un INSERT
+        multi-fila por página. El resto usa cursor.executemany, cuyo rowcount
+        sí acumula todas las filas (execute_batch solo informa de la última
+        sentencia de cada página).
+        
+        Args:
+            query: Consulta SQL
+            params_list: Lista de tuplas con parámetros
+            page_size: Filas por página
+        
+        Returns:
+            Número total de filas afectadas
+        """
+        self.ensure_connected()
+        
+        split = _split_values_template(query)
+        total_affected = 0
+        with self.transaction():
+            try:
+                for start in range(0, len(params_list), page_size):
+                    page = params_list[start:start + page_size]
+                    if split:
+                        sql, template = split
+                        execute_values(self.cursor, sql, page, template=template, page_size=len(page))
+                    else:
+                        self.cursor.executemany(query, page)
+                    total_affected += max(self.cursor.rowcount, 0)
+            except psycopg2.Error as e:
+                logger.error(f"❌ Error en executemany: {e}")
+                raise
+        
+        logger.debug(f"executemany: {len(params_list)} filas | Filas afectadas: {total_affected}")
+        return total_affected
+    
+    def _deallocate(self, name: str) -> None:
+        """Libera una sentencia preparada expulsada de la caché"""
+        if self.cursor:
+            self.cursor.execute(f"DEALLOCATE {name}")
+    
+    def _prepare(self, query: str) -> str:
+        """
+        Devuelve el nombre de la sentencia preparada para query, preparándola si hace falta.
+        
+        Args:
+            query: Consulta SQL con marcadores %s
+        
+        Returns:
+            Nombre de la sentencia en la sesión
+        """
+        name = self.statements.get(query)
+        if name is None:
+            name = f"mcp_ps_{next(_statement_ids)}"
+            self.cursor.execute(f"PREPARE {name} AS {_to_numbered_params(query)}")
+            self.statements.put(query, name)
+            logger.debug(f"Sentencia preparada {name}: {query[:100]}")
+        return name
+    
+    def _execute_named(self, name: str, params: tuple) -> None:
+        """EXECUTE de una sentencia preparada"""
+        if params:
+            placeholders = ", ".join(["%s"] * len(params))
+            self.cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+        else:
+            self.cursor.execute(f"EXECUTE {name}")
+    
+    def _execute_prepared_statement(self, query: str, params: tuple) -> None:
+        """
+        Ejecuta query con EXECUTE sobre su sentencia preparada.
+        
+        Si la tabla cambió desde el PREPARE (ALTER TABLE en cualquier sesión),
+        PostgreSQL responde "cached plan must not change result type" (0A000).
+        La sentencia se olvida y, si la sesión no tenía transacción abierta,
+        se revierte el error, se prepara de nuevo y se reintenta una vez.
+        """
+        idle = self._session_idle()
+        name = self._prepare(query)
+        try:
+            self._execute_named(name, params)
+        except psycopg2.errors.FeatureNotSupported:
+            self.statements.discard(query)
+            self.statements.invalidations += 1
+            if not idle:
+                # Transacción abortada: no se puede reintentar ni liberar aquí
+                raise
+            self.connection.rollback()
+            self._deallocate(name)
+            logger.info(f"🔁 Plan de {name} invalidado por un cambio de esquema; preparando de nuevo")
+            self._execute_named(self._prepare(query), params)
+    
+    def _track_ddl(self, query: str) -> None:
+        """Además de invalidar las cachés, libera las sentencias preparadas de la sesión tras un DDL"""
+        super()._track_ddl(query)
+        if len(self.statements) and _DDL_PATTERN.match(query):
+            self.cursor.execute("DEALLOCATE ALL")
+            self.statements.clear()
+            self.statements.invalidations += 1
+            logger.debug("Sentencias preparadas liberadas tras DDL")
+    
+    @timed("execute_prepared")
+    def execute_prepared(self, query: str, params: tuple) -> int:
+        """
+        Ejecuta una consulta de modificación con PREPARE / EXECUTE.
+        
+        Args:
+            query: Consulta SQL con marcadores %s
+            params: Parámetros de la consulta
+        
+        Returns:
+            Número de filas afectadas
+        """
+        if self.statement_cache_size <= 0:
+            return self.execute_query(query, params)
+        
+        self.ensure_connected()
+        
+        try:
+            self._execute_prepared_statement(query, params)
+            affected = self.cursor.rowcount
+            logger.debug(f"Query preparado ejecutado: {query[:100]}... | Filas afectadas: {affected}")
+            return affected
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error ejecutando query preparado: {e}")
+            raise
+    
+    @timed("fetch_one_prepared")
+    @retry_on_disconnect
+    def fetch_one_prepared(self, query: str, params: tuple) -> Optional[Dict[str, Any]]:
+        """
+        Ejecuta una consulta con PREPARE / EXECUTE y devuelve un solo resultado.
+        
+        Args:
+            query: Consulta SQL con marcadores %s
+            params: Parámetros de la consulta
+        
+        Returns:
+            Diccionario con el resultado o None
+        """
+        if self.statement_cache_size <= 0:
+            return self.fetch_one(query, params)
+        
+        self.ensure_connected()
+        
+        try:
+            self._execute_prepared_statement(query, params)
+            result = self.cursor.fetchone()
+            if result:
+                result = dict(result)
+            
+            logger.debug(f"Fetch one preparado: {query[:100]}... | Resultado: {'Encontrado' if result else 'None'}")
+            return result
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error en fetch_one preparado: {e}")
+            raise
+    
     def begin_transaction(self) -> None:
         """Inicia una transacción"""
         self.ensure_connected()
@@ -207,6 +482,110 @@ class PostgreSQLHandler(DatabaseHandler):
         # Esta función es más un placeholder
         return None
     
+    def set_statement_timeout(self, timeout: Optional[float]) -> None:
+        """
+        Aplica statement_timeout a la sesión.
+        
+        Si no hay transacción abierta se confirma para que el valor sobreviva
+        a un rollback posterior.
+        
+        Args:
+            timeout: Segundos (None o 0 = sin límite)
+        """
+        self.ensure_connected()
+        
+        idle = self.connection.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        try:
+            self.cursor.execute("SET statement_timeout = %s", (int((timeout or 0) * 1000),))
+            if idle:
+                self.connection.commit()
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error aplicando timeout de sentencia: {e}")
+            raise
+        self._statement_timeout = timeout
+    
+    def cancel(self) -> None:
+        """Envía una petición de cancelación al backend (equivalente a pg_cancel_backend)"""
+        if self.connection:
+            self.connection.cancel()
+            logger.info(f"🛑 Cancelación enviada a {self.host}:{self.port}")
+    
+    def _is_timeout_error(self, error: Exception) -> bool:
+        """statement_timeout o cancelación (SQLSTATE 57014)"""
+        return isinstance(error, psycopg2.extensions.QueryCanceledError)
+    
+    def _ping(self) -> None:
+        """SELECT 1 sin dejar una transacción abierta si la sesión estaba libre"""
+        idle = self._session_idle()
+        self.cursor.execute("SELECT 1")
+        if idle:
+            self.connection.rollback()
+    
+    def _session_idle(self) -> bool:
+        """Sin transacción abierta (TRANSACTION_STATUS_IDLE)"""
+        return self.connection.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    
+    def _is_connection_error(self, error: Exception) -> bool:
+        """Error de conexión tras el que psycopg2 ha dado la conexión por cerrada"""
+        return (isinstance(error, (psycopg2.OperationalError, psycopg2.InterfaceError))
+                and (self.connection is None or self.connection.closed != 0))
+    
+    def get_batch_limits(self) -> Dict[str, Optional[int]]:
+        """
+        Límites para INSERT multi-fila.
+        PostgreSQL admite como máximo 65535 parámetros por sentencia.
+        
+        Returns:
+            Dict con max_bytes y max_params
+        """
+        return {"max_bytes": None, "max_params": 65535}
+    
+    def render_row(self, params: tuple) -> str:
+        """
+        Renderiza una fila como literal SQL escapado por psycopg2.
+        
+        Args:
+            params: Valores de la fila
+        
+        Returns:
+            Literal "(v1, v2, ...)"
+        """
+        self.ensure_connected()
+        placeholders = ", ".join(["%s"] * len(params))
+        encoding = psycopg2.extensions.encodings[self.connection.encoding]
+        return self.cursor.mogrify(f"({placeholders})", params).decode(encoding)
+    
+    @timed("bulk_load")
+    def bulk_load(self, table_name: str, columns: List[str], rows: Iterable[tuple]) -> Dict[str, Any]:
+        """
+        Carga filas con COPY ... FROM STDIN (formato texto).
+        
+        copy_expert lee de un RowStream que codifica las filas bajo demanda,
+        sin fichero temporal ni buffer completo en memoria.
+        
+        Args:
+            table_name: Nombre de la tabla
+            columns: Columnas en el orden de los valores de cada fila
+            rows: Iterable de tuplas con los valores
+        
+        Returns:
+            Dict con rows, bytes y warnings
+        """
+        self.ensure_connected()
+        
+        stream = RowStream(encode_rows(rows, "postgres"))
+        query = f"COPY {table_name} ({', '.join(columns)}) FROM STDIN"
+        
+        try:
+            self.cursor.copy_expert(query, stream, size=1 << 16)
+            affected = self.cursor.rowcount
+            logger.debug(f"COPY en {table_name}: {affected} filas, {stream.bytes_read} bytes")
+            return {"rows": affected, "bytes": stream.bytes_read, "warnings": 0}
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Error en COPY: {e}")
+            raise
+    
     def list_databases(self) -> List[str]:
         """
         Lista todas las bases de datos disponibles.
@@ -269,6 +648,133 @@ class PostgreSQLHandler(DatabaseHandler):
         """
         return self.fetch_all(query, (schema, table_name))
     
+    def get_indexes(self, table_name: str, schema: str = 'public') -> List[Dict[str, Any]]:
+        """
+        Obtiene los índices de una tabla.
+        
+        Args:
+            table_name: Nombre de la tabla
+            schema: Nombre del esquema (por defecto 'public')
+        
+        Returns:
+            Lista de índices con name, columns, unique, primary y nullable
+        """
+        query = """
+            SELECT 
+                ic.relname AS index_name,
+                i.indisunique AS is_unique,
+                i.indisprimary AS is_primary,
+                a.attname AS column_name,
+                NOT a.attnotnull AS is_nullable
+            FROM pg_index i
+            JOIN pg_class t ON t.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            JOIN pg_class ic ON ic.oid = i.indexrelid
+            JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord) ON true
+            JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+            WHERE n.nspname = %s
+            AND t.relname = %s
+            AND i.indpred IS NULL
+            ORDER BY ic.relname, k.ord
+        """
+        rows = self.fetch_all(query, (schema, table_name))
+        
+        indexes: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            index = indexes.setdefault(row['index_name'], {
+                "name": row['index_name'],
+                "columns": [],
+                "unique": row['is_unique'],
+                "primary": row['is_primary'],
+                "nullable": False
+            })
+            index["columns"].append(row['column_name'])
+            index["nullable"] = index["nullable"] or row['is_nullable']
+        
+        return list(indexes.values())
+    
+    def estimate_row_count(self, table_name: str, schema: str = 'public') -> Optional[int]:
+        """
+        Estima el número de filas de una tabla según pg_class.reltuples.
+        
+        Args:
+            table_name: Nombre de la tabla
+            schema: Nombre del esquema (por defecto 'public')
+        
+        Returns:
+            Filas estimadas o None si la tabla nunca se analizó
+        """
+        query = """
+            SELECT c.reltuples::bigint AS estimate
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s
+            AND c.relname = %s
+        """
+        result = self.fetch_one(query, (schema, table_name))
+        if not result or result['estimate'] is None or result['estimate'] < 0:
+            return None
+        return int(result['estimate'])
+    
+    def explain_row_estimate(self, query: str, params: Optional[tuple] = None) -> Optional[int]:
+        """
+        Estima las filas que devolvería una consulta usando EXPLAIN.
+        
+        Args:
+            query: Consulta SELECT
+            params: Parámetros de la consulta (opcional)
+        
+        Returns:
+            Filas estimadas por el planificador o None
+        """
+        plan = self.explain_plan(query, params)
+        if not plan:
+            return None
+        return int(plan[0]['Plan']['Plan Rows'])
+    
+    def key_histogram(self, table_name: str, column: str, schema: str = 'public') -> Optional[List[int]]:
+        """
+        Límites de pg_stats.histogram_bounds de una columna entera.
+        
+        Args:
+            table_name: Nombre de la tabla
+            column: Columna de la clave
+            schema: Nombre del esquema (por defecto 'public')
+        
+        Returns:
+            Lista ordenada de límites o None si la tabla no se ha analizado
+        """
+        query = """
+            SELECT histogram_bounds::text::bigint[] AS bounds
+            FROM pg_stats
+            WHERE schemaname = %s
+            AND tablename = %s
+            AND attname = %s
+        """
+        result = self.fetch_one(query, (schema, table_name, column))
+        if not result or not result['bounds']:
+            return None
+        return list(result['bounds'])
+    
+    def explain_plan(self, query: str, params: Optional[tuple] = None) -> Any:
+        """
+        Plan de ejecución con EXPLAIN (FORMAT JSON).
+        
+        Args:
+            query: Consulta SELECT
+            params: Parámetros de la consulta (opcional)
+        
+        Returns:
+            Plan como lista JSON
+        """
+        result = self.fetch_one(f"EXPLAIN (FORMAT JSON) {query}", params)
+        if not result:
+            return None
+        plan = result['QUERY PLAN']
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan
+    
     def get_server_version(self) -> str:
         """
         Obtiene la versión del servidor PostgreSQL.
@@ -0,0 +1,83 @@
+"""
+Registro de manejadores por tipo de base de datos.
+
+Los módulos de cada handler (y con ellos pymysql / psycopg2) solo se
+importan la primera vez que se usa una conexión de ese tipo, de modo que
+arrancar el servidor no carga drivers que la configuración no utiliza.
+"""
+
+from typing import Dict, List, Tuple, Type
+import importlib
+import logging
+import threading
+
+from .connection import DatabaseHandler
+
+logger = logging.getLogger(__name__)
+
+# Tipo de DatabaseConnection -> (módulo dentro de src.database, clase)
+_HANDLERS: Dict[str, Tuple[str, str]] = {
+    "mysql": ("mysql_handler", "MySQLHandler"),
+    "postgres": ("postgres_handler", "PostgreSQLHandler"),
+    "postgresql": ("postgres_handler", "PostgreSQLHandler"),
+}
+
+_loaded: Dict[str, Type[DatabaseHandler]] = {}
+_lock = threading.Lock()
+
+
+def register_handler(db_type: str, module: str, class_name: str) -> None:
+    """
+    Registra un handler para un tipo de conexión.
+    
+    Args:
+        db_type: Valor de DatabaseConnection.type
+        module: Módulo del handler (relativo a src.database o absoluto)
+        class_name: Nombre de la clase del handler
+    
+    Example:
+        register_handler("mariadb", "mysql_handler", "MySQLHandler")
+    """
+    with _lock:
+        _HANDLERS[db_type.lower()] = (module, class_name)
+        _loaded.pop(db_type.lower(), None)
+
+
+def get_handler_class(db_type: str) -> Type[DatabaseHandler]:
+    """
+    Obtiene la clase de handler de un tipo, importando su módulo la primera vez.
+    
+    Args:
+        db_type: Valor de DatabaseConnection.type
+    
+    Returns:
+        Clase del handler
+    
+    Raises:
+        ValueError: Si el tipo no está registrado
+    """
+    key = db_type.lower()
+    handler_class = _loaded.get(key)
+    if handler_class is not None:
+        return handler_class
+    
+    if key not in _HANDLERS:
+        raise ValueError(f"Tipo de base de datos '{db_type}' no soportado")
+    
+    with _lock:
+        handler_class = _loaded.get(key)
+        if handler_class is None:
+            module_name, class_name = _HANDLERS[key]
+            if "." in module_name:
+                module = importlib.import_module(module_name)
+            else:
+                module = importlib.import_module(f".{module_name}", __package__)
+            handler_class = getattr(module, class_name)
+            _loaded[key] = handler_class
+            logger.debug(f"Handler {class_name} cargado para el tipo '{db_type}'")
+    return handler_class
+
+
+def supported_types() -> List[str]:
+    """Tipos de conexión registrados"""
+    return sorted(_HANDLERS)
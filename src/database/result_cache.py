@@ -0,0 +1,235 @@
+"""
+Caché de resultados de lectura (select_records, count_records, get_record_by_id).
+Se invalida por tabla cuando las herramientas de escritura la modifican.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+import json
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _table_key(table_name: str) -> str:
+    """Normaliza un nombre de tabla para indexar la caché"""
+    return table_name.strip().strip('`"').lower()
+
+
+class ResultCache:
+    """
+    Caché LRU de resultados acotada por bytes.
+    
+    Las entradas se indexan por (scope, SQL normalizado, parámetros) y se
+    asocian a la tabla consultada para poder invalidarlas cuando se escribe
+    en ella. Cada tabla puede tener su propio TTL.
+    """
+    
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 30,
+                 table_ttls: Optional[Dict[str, float]] = None):
+        """
+        Inicializa la caché.
+        
+        Args:
+            max_bytes: Tamaño máximo estimado de los resultados guardados
+            ttl: Segundos de validez por defecto
+            table_ttls: TTL por tabla {tabla: segundos}; 0 desactiva la caché para esa tabla
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.table_ttls = {_table_key(t): v for t, v in (table_ttls or {}).items()}
+        # key -> (expira, bytes, tabla, valor)
+        self._entries: "OrderedDict[Tuple, Tuple[float, int, Tuple[str, str], Any]]" = OrderedDict()
+        self._by_table: Dict[Tuple[str, str], Set[Tuple]] = {}
+        self._generations: Dict[Tuple[str, str], int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    @staticmethod
+    def _key(scope: str, query: str, params: Optional[tuple]) -> Tuple:
+        return (scope, _WHITESPACE.sub(' ', query.strip()), repr(params))
+    
+    @staticmethod
+    def _root(scope: str) -> str:
+        return scope.split('/')[0]
+    
+    def get(self, scope: str, query: str, params: Optional[tuple]) -> Tuple[bool, Any]:
+        """
+        Busca un resultado en la caché.
+        
+        Returns:
+            Tupla (encontrado, valor)
+        """
+        key = self._key(scope, query, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[3]
+                self._remove(key)
+            self.misses += 1
+            return False, None
+    
+    def generation(self, scope: str, table_name: str) -> int:
+        """Versión actual de una tabla; cambia con cada invalidación"""
+        return self._generations.get((self._root(scope), _table_key(table_name)), 0)
+    
+    def put(self, scope: str, table_name: str, query: str, params: Optional[tuple],
+            value: Any, generation: Optional[int] = None) -> bool:
+        """
+        Guarda un resultado.
+        
+        Args:
+            scope: Conexión del pool
+            table_name: Tabla consultada
+            query: SQL ejecutado
+            params: Parámetros de la consulta
+            value: Resultado a guardar
+            generation: Versión de la tabla leída antes de consultar; si la tabla
+                se invalidó mientras tanto, el resultado no se guarda
+        
+        Returns:
+            True si se guardó
+        """
+        table = (self._root(scope), _table_key(table_name))
+        ttl = self.table_ttls.get(table[1], self.ttl)
+        if ttl <= 0:
+            return False
+        
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return False
+        
+        key = self._key(scope, query, params)
+        with self._lock:
+            if generation is not None and self._generations.get(table, 0) != generation:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, size, table, value)
+            self._by_table.setdefault(table, set()).add(key)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+    
+    def invalidate_table(self, connection_name: str, table_name: str) -> int:
+        """
+        Elimina todos los resultados de una tabla.
+        
+        Args:
+            connection_name: Conexión (se ignora la parte /base_de_datos)
+            table_name: Tabla modificada
+        
+        Returns:
+            Número de entradas eliminadas
+        """
+        table = (self._root(connection_name), _table_key(table_name))
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            keys = self._by_table.pop(table, set())
+            for key in keys:
+                self._remove(key)
+            self.invalidations += 1
+        if keys:
+            logger.debug(f"Caché de resultados invalidada: {table[0]}.{table[1]} ({len(keys)})")
+        return len(keys)
+    
+    def invalidate_connection(self, connection_name: str) -> int:
+        """
+        Elimina todos los resultados de una conexión (p. ej. tras un DDL).
+        
+        Returns:
+            Número de entradas eliminadas
+        """
+        root = self._root(connection_name)
+        with self._lock:
+            tables = [table for table in self._by_table if table[0] == root]
+        return sum(self.invalidate_table(root, table[1]) for table in tables)
+    
+    def clear(self) -> None:
+        """Vacía la caché"""
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+    
+    def _remove(self, key: Tuple) -> None:
+        """Elimina una entrada (llamar con el lock tomado)"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry[1]
+        keys = self._by_table.get(entry[2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_table[entry[2]]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas de la caché.
+        
+        Returns:
+            Dict con entradas, bytes, aciertos y fallos
+        """
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+
+# Instancia global de la caché de resultados
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache(max_bytes: int = 64 * 1024 * 1024, ttl: float = 30,
+                     table_ttls: Optional[Dict[str, float]] = None) -> ResultCache:
+    """
+    Obtiene la instancia global de la caché de resultados (singleton).
+    
+    Los argumentos solo se aplican al crear la instancia.
+    
+    Returns:
+        ResultCache: Instancia de la caché
+    """
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache(max_bytes, ttl, table_ttls)
+    return _result_cache
+
+
+def invalidate_results(connection_name: str, table_name: Optional[str] = None) -> int:
+    """
+    Invalida una tabla (o toda la conexión) en la caché global si ya existe (no la crea).
+    
+    Returns:
+        Número de entradas eliminadas
+    """
+    if _result_cache is None:
+        return 0
+    if table_name is None:
+        return _result_cache.invalidate_connection(connection_name)
+    return _result_cache.invalidate_table(connection_name, table_name)
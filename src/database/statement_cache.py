@@ -0,0 +1,78 @@
+"""
+Caché LRU de sentencias preparadas del lado del servidor.
+Cada handler del pool tiene la suya, porque las sentencias preparadas
+pertenecen a la sesión.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StatementCache:
+    """
+    Asocia plantillas SQL con el nombre de su sentencia preparada.
+    
+    Al superar la capacidad se expulsa la menos usada y se llama a on_evict
+    con su nombre para liberarla en el servidor (DEALLOCATE).
+    """
+    
+    def __init__(self, capacity: int, on_evict: Optional[Callable[[str], None]] = None):
+        """
+        Inicializa la caché.
+        
+        Args:
+            capacity: Número máximo de sentencias preparadas
+            on_evict: Función que libera una sentencia en el servidor
+        """
+        self.capacity = capacity
+        self.on_evict = on_evict
+        self._statements: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    def get(self, query: str) -> Optional[str]:
+        """Devuelve el nombre de la sentencia preparada para query, o None"""
+        name = self._statements.get(query)
+        if name is None:
+            self.misses += 1
+            return None
+        self._statements.move_to_end(query)
+        self.hits += 1
+        return name
+    
+    def put(self, query: str, name: str) -> None:
+        """Registra una sentencia recién preparada, expulsando las menos usadas"""
+        self._statements[query] = name
+        self._statements.move_to_end(query)
+        while len(self._statements) > self.capacity:
+            _, evicted = self._statements.popitem(last=False)
+            if self.on_evict:
+                try:
+                    self.on_evict(evicted)
+                except Exception as e:
+                    logger.warning(f"No se pudo liberar la sentencia preparada {evicted}: {e}")
+    
+    def discard(self, query: str) -> Optional[str]:
+        """Olvida la sentencia de query (p. ej. si su plan quedó invalidado). Devuelve su nombre"""
+        return self._statements.pop(query, None)
+    
+    def clear(self) -> None:
+        """Olvida todas las sentencias (la sesión del servidor ya no existe)"""
+        self._statements.clear()
+    
+    def __len__(self) -> int:
+        return len(self._statements)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Estadísticas de la caché"""
+        return {
+            "statements": len(self._statements),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations
+        }
@@ -12,10 +12,12 @@ from typing import Optional, Dict, Any
 
 # Importar módulos propios
 from .config import get_config
-from .database.mysql_handler import MySQLHandler
-from .database.postgres_handler import PostgreSQLHandler
-from .database.connection import get_connection_pool
-from .tools import crud_tools
+from .database.parallel_scan import get_scan_stats
+from .tools import crud_tools, export_tools, fanout_tools, import_tools
+from .tools.warmup import start_warmup, get_warmup_status
+from .utils.executor import offload
+from .utils.metrics import timed_tool, get_metrics_registry, start_prometheus_exporter
+from .utils.slow_query_log import get_slow_query_log
 
 # Configurar logging
 logging.basicConfig(
@@ -32,6 +34,7 @@ mcp = FastMCP("database-connect")
 # ============================================================================
 
 @mcp.tool()
+@timed_tool
 def test_server() -> dict:
     """
     Prueba básica del servidor MCP.
@@ -62,6 +65,7 @@ def test_server() -> dict:
 
 
 @mcp.tool()
+@timed_tool
 def get_server_info() -> dict:
     """
     Obtiene información detallada del servidor MCP.
@@ -83,7 +87,7 @@ def get_server_info() -> dict:
     connections = config.list_connections()
     
     # Obtener estadísticas del pool
-    pool = get_connection_pool()
+    pool = crud_tools.get_pool()
     pool_stats = pool.get_stats()
     
     return {
@@ -96,15 +100,149 @@ def get_server_info() -> dict:
         "total_connections": len(connections),
         "default_connection": config.default_connection,
         "pool_stats": pool_stats,
+        "metadata_cache": crud_tools.get_schema_cache().get_stats(),
+        "result_cache": {
+            "enabled": config.settings.result_cache_enabled,
+            **crud_tools.get_results_cache().get_stats()
+        },
+        "slow_queries": {
+            "threshold_ms": config.settings.slow_query_threshold_ms,
+            **get_slow_query_log().get_stats()
+        },
+        "tool_latency": {
+            name: {
+                "count": sum(stats["count"] for stats in by_connection.values()),
+                "errors": sum(stats["errors"] for stats in by_connection.values()),
+                "p99_ms": max(stats["p99_ms"] or 0 for stats in by_connection.values())
+            }
+            for name, by_connection in get_metrics_registry().snapshot("tool")["tool"].items()
+        },
+        "warmup": {
+            "enabled": config.settings.warmup_on_start,
+            **get_warmup_status()
+        },
+        "parallel_scans": get_scan_stats(),
         "status": "ready"
     }
 
 
+@mcp.tool()
+@timed_tool
+def get_metrics(kind: Optional[str] = None, format: str = "json", reset: bool = False) -> dict:
+    """
+    Obtiene las métricas de latencia de herramientas y consultas.
+    
+    Cada serie incluye número de llamadas, percentiles de latencia (p50/p90/p99),
+    errores y filas/bytes devueltos, desglosados por herramienta u operación
+    del handler (execute_query, fetch_all, connect...) y por conexión.
+    
+    Args:
+        kind: "tool" o "query" para filtrar (opcional, por defecto ambos)
+        format: "json" o "prometheus" (texto de exposición de Prometheus)
+        reset: Vaciar las métricas después de leerlas
+    
+    Returns:
+        dict: Métricas agrupadas por tipo, operación y conexión
+        
+    Example:
+        >>> get_metrics(kind="tool")
+        {
+            "status": "success",
+            "since": 1760000000.0,
+            "metrics": {
+                "tool": {
+                    "select_records": {
+                        "mysql_local": {"count": 120, "p50_ms": 3.1, "p99_ms": 18.4, "errors": 0, ...}
+                    }
+                }
+            }
+        }
+    """
+    if kind not in (None, "tool", "query"):
+        return {"status": "error", "error": f"Tipo de métrica no soportado: {kind}. Usa tool o query"}
+    if format not in ("json", "prometheus"):
+        return {"status": "error", "error": f"Formato no soportado: {format}. Usa json o prometheus"}
+    
+    registry = get_metrics_registry()
+    result: Dict[str, Any] = {"status": "success", "since": registry.started_at}
+    if format == "prometheus":
+        result["prometheus"] = registry.to_prometheus()
+    else:
+        result["metrics"] = registry.snapshot(kind)
+    
+    if reset:
+        registry.reset()
+    return result
+
+
+@mcp.tool()
+@timed_tool
+def get_slow_queries(
+    limit: int = 50,
+    connection_name: Optional[str] = None,
+    min_duration_ms: float = 0,
+    include_plans: bool = True,
+    clear: bool = False
+) -> dict:
+    """
+    Obtiene las consultas que superaron slow_query_threshold_ms.
+    
+    Cada entrada incluye el SQL normalizado (literales como ?), su huella,
+    la forma de los parámetros, la duración, las filas, la conexión y, para
+    los SELECT, el plan de EXPLAIN en formato JSON capturado en segundo plano.
+    
+    Args:
+        limit: Máximo de consultas a devolver (las más recientes primero)
+        connection_name: Filtrar por conexión (opcional)
+        min_duration_ms: Duración mínima en milisegundos
+        include_plans: Incluir los planes de ejecución
+        clear: Vaciar el registro en memoria después de leerlo
+    
+    Returns:
+        dict: Consultas lentas y estadísticas del registro
+        
+    Example:
+        >>> get_slow_queries(limit=1)
+        {
+            "status": "success",
+            "threshold_ms": 1000,
+            "count": 1,
+            "queries": [{
+                "connection": "mysql_local",
+                "operation": "fetch_all",
+                "fingerprint": "3f1c0a9e5b7d2c41",
+                "sql": "SELECT * FROM orders WHERE status = ? ORDER BY created_at",
+                "params_shape": "(str)",
+                "duration_ms": 2350.4,
+                "rows": 18000,
+                "plan_status": "captured",
+                "plan": {...}
+            }],
+            "stats": {"buffered": 1, "total_recorded": 1, ...}
+        }
+    """
+    slow_log = get_slow_query_log()
+    queries = slow_log.entries(limit, connection_name, min_duration_ms, include_plans)
+    stats = slow_log.get_stats()
+    
+    if clear:
+        slow_log.clear()
+    
+    return {
+        "status": "success",
+        "threshold_ms": get_config().settings.slow_query_threshold_ms,
+        "count": len(queries),
+        "queries": queries,
+        "stats": stats
+    }
+
+
 # ============================================================================
 # HERRAMIENTAS DE GESTIÓN DE CONEXIONES
 # ============================================================================
 
 @mcp.tool()
+@timed_tool
 def list_connections() -> dict:
     """
     Lista todas las conexiones de base de datos configuradas.
@@ -138,6 +276,8 @@ def list_connections() -> dict:
 
 
 @mcp.tool()
+@timed_tool
+@offload
 def test_connection(connection_name: Optional[str] = None) -> dict:
     """
     Prueba una conexión a base de datos.
@@ -168,32 +308,9 @@ def test_connection(connection_name: Optional[str] = None) -> dict:
                 "available_connections": list(config.list_connections().keys())
             }
         
-        # Crear handler según el tipo
-        if conn_config.type == 'mysql':
-            handler = MySQLHandler(
-                host=conn_config.host,
-                port=conn_config.port,
-                user=conn_config.user,
-                password=conn_config.password,
-                database=conn_config.database
-            )
-        elif conn_config.type in ('postgres', 'postgresql'):
-            handler = PostgreSQLHandler(
-                host=conn_config.host,
-                port=conn_config.port,
-                user=conn_config.user,
-                password=conn_config.password,
-                database=conn_config.database
-            )
-        else:
-            return {
-                "status": "error",
-                "error": f"Tipo de base de datos '{conn_config.type}' no soportado"
-            }
-        
-        # Probar conexión
-        result = handler.test_connection()
-        handler.disconnect()
+        # Probar conexión con un handler del pool
+        with crud_tools.pooled_handler(connection_name) as handler:
+            result = handler.test_connection()
         
         return result
         
@@ -206,6 +323,8 @@ def test_connection(connection_name: Optional[str] = None) -> dict:
 
 
 @mcp.tool()
+@timed_tool
+@offload
 def list_databases(connection_name: Optional[str] = None) -> dict:
     """
     Lista todas las bases de datos disponibles en el servidor.
@@ -239,31 +358,8 @@ def list_databases(connection_name: Optional[str] = None) -> dict:
                 "error": f"Conexión '{connection_name}' no encontrada"
             }
         
-        # Crear handler
-        if conn_config.type == 'mysql':
-            handler = MySQLHandler(
-                host=conn_config.host,
-                port=conn_config.port,
-                user=conn_config.user,
-                password=conn_config.password,
-                database=conn_config.database
-            )
-        elif conn_config.type in ('postgres', 'postgresql'):
-            handler = PostgreSQLHandler(
-                host=conn_config.host,
-                port=conn_config.port,
-                user=conn_config.user,
-                password=conn_config.password,
-                database=conn_config.database
-            )
-        else:
-            return {
-                "status": "error",
-                "error": f"Tipo de base de datos '{conn_config.type}' no soportado"
-            }
-        
         # Listar bases de datos
-        with handler:
+        with crud_tools.pooled_handler(connection_name) as handler:
             databases = handler.list_databases()
         
         return {
@@ -281,6 +377,8 @@ def list_databases(connection_name: Optional[str] = None) -> dict:
 
 
 @mcp.tool()
+@timed_tool
+@offload
 def list_tables(connection_name: Optional[str] = None, database: Optional[str] = None) -> dict:
     """
     Lista todas las tablas de una base de datos.
@@ -308,40 +406,17 @@ def list_tables(connection_name: Optional[str] = None, database: Optional[str] =
     
     try:
         config = get_config()
-        # Crear handler
-        if conn_config.type == 'mysql':
-            handler = MySQLHandler(
-                host=conn_config.host,
-                port=conn_config.port,
-                user=conn_config.user,
-                password=conn_config.password,
-                database=database or conn_config.database
-            )
-        elif conn_config.type in ('postgres', 'postgresql'):
-            handler = PostgreSQLHandler(
-                host=conn_config.host,
-                port=conn_config.port,
-                user=conn_config.user,
-                password=conn_config.password,
-                database=database or conn_config.database
-            )
-        else:
-            return {
-                "status": "error",
-                "error": f"Tipo de base de datos '{conn_config.type}' no soportado"
-            }
+        conn_config = config.get_connection(connection_name)
         
-        # Listar tablas
-        with handler:
-            tables = handler.list_tables()
+        if not conn_config:
             return {
                 "status": "error",
-                "error": f"Tipo de base de datos '{conn_config.type}' no soportado aún"
+                "error": f"Conexión '{connection_name}' no encontrada"
             }
         
         # Listar tablas
-        with handler:
-            tables = handler.list_tables()
+        with crud_tools.pooled_handler(connection_name, database) as handler:
+            tables = crud_tools.get_metadata(handler, "tables")
         
         return {
             "connection": connection_name or config.default_connection,
@@ -358,11 +433,74 @@ def list_tables(connection_name: Optional[str] = None, database: Optional[str] =
         }
 
 
+@mcp.tool()
+@timed_tool
+@offload
+def get_table_schema(
+    table_name: str,
+    connection_name: Optional[str] = None,
+    database: Optional[str] = None
+) -> dict:
+    """
+    Obtiene la estructura de una tabla: columnas, clave primaria e índices.
+    
+    Los metadatos se guardan en caché por conexión, así que consultar el
+    esquema antes de cada operación no genera tráfico con el servidor.
+    Usar refresh_schema_cache si el esquema cambió fuera de este servidor.
+    
+    Args:
+        table_name: Nombre de la tabla
+        connection_name: Nombre de la conexión (opcional)
+        database: Nombre de la base de datos. Si es None, usa la de la conexión.
+    
+    Returns:
+        dict: Columnas, clave primaria e índices de la tabla
+        
+    Example:
+        >>> get_table_schema("users")
+        {
+            'status': 'success',
+            'table': 'users',
+            'columns': [...],
+            'primary_key': ['id'],
+            'indexes': [{'name': 'PRIMARY', 'columns': ['id'], 'unique': True, ...}]
+        }
+    """
+    logger.info(f"📐 Obteniendo esquema de {table_name}")
+    return crud_tools.get_table_schema(table_name, connection_name, database)
+
+
+@mcp.tool()
+@timed_tool
+def refresh_schema_cache(
+    connection_name: Optional[str] = None,
+    table_name: Optional[str] = None
+) -> dict:
+    """
+    Vacía la caché de metadatos de esquema de una conexión o tabla.
+    
+    Args:
+        connection_name: Nombre de la conexión (opcional)
+        table_name: Tabla concreta. Si es None, se invalida toda la conexión.
+    
+    Returns:
+        dict: Número de entradas invalidadas
+        
+    Example:
+        >>> refresh_schema_cache(table_name="users")
+        {'status': 'success', 'connection': 'mysql_local', 'table': 'users', 'entries_removed': 3}
+    """
+    logger.info(f"🔄 Refrescando caché de metadatos: {connection_name or 'default'}")
+    return crud_tools.refresh_schema_cache(connection_name, table_name)
+
+
 # ============================================================================
 # HERRAMIENTAS CRUD - CREATE (INSERT)
 # ============================================================================
 
 @mcp.tool()
+@timed_tool
+@offload
 def insert_record(
     table_name: str,
     data: dict,
@@ -397,21 +535,30 @@ def insert_record(
 
 
 @mcp.tool()
+@timed_tool
+@offload
 def bulk_insert(
     table_name: str,
     records: list,
-    connection_name: Optional[str] = None
+    connection_name: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    timeout: Optional[float] = None
 ) -> dict:
     """
     Inserta múltiples registros en una tabla de forma eficiente.
     
     Usa una transacción para insertar todos los registros. Si uno falla,
-    se revierten todos los cambios (atomicidad).
+    se revierten todos los cambios (atomicidad). Los registros se envían en
+    sentencias INSERT multi-fila ajustadas al tamaño máximo de paquete del
+    servidor. Los registros pueden tener columnas distintas. Con muchos
+    registros (bulk_load_threshold) se usa automáticamente la carga nativa.
     
     Args:
         table_name: Nombre de la tabla donde insertar
         records: Lista de diccionarios con los datos a insertar
         connection_name: Nombre de la conexión (opcional)
+        batch_size: Filas máximas por sentencia INSERT (opcional)
+        timeout: Segundos máximos por sentencia (opcional, por defecto query_timeout)
     
     Returns:
         dict: Resultado con cantidad de registros insertados
@@ -426,11 +573,58 @@ def bulk_insert(
             "status": "success",
             "message": "3 registros insertados en products",
             "rows_affected": 3,
-            "records_count": 3
+            "records_count": 3,
+            "statements": 1,
+            "column_groups": 1,
+            "method": "insert",
+            "methods": {"bulk_load": 0, "insert": 1}
         }
     """
     logger.info(f"📝 Inserción masiva en {table_name}: {len(records)} registros")
-    return crud_tools.bulk_insert(table_name, records, connection_name)
+    return crud_tools.bulk_insert(table_name, records, connection_name, batch_size, timeout=timeout)
+
+
+@mcp.tool()
+@timed_tool
+@offload
+def bulk_load(
+    table_name: str,
+    records: list,
+    connection_name: Optional[str] = None,
+    timeout: Optional[float] = None
+) -> dict:
+    """
+    Carga grandes volúmenes de registros con el mecanismo nativo del motor.
+    
+    MySQL usa LOAD DATA LOCAL INFILE (requiere local_infile en el servidor) y
+    PostgreSQL usa COPY ... FROM STDIN. Los datos se transmiten en memoria,
+    sin ficheros temporales, dentro de una única transacción.
+    
+    Args:
+        table_name: Nombre de la tabla donde cargar
+        records: Lista de diccionarios con los datos a cargar
+        connection_name: Nombre de la conexión (opcional)
+        timeout: Segundos máximos por sentencia (opcional, por defecto query_timeout)
+    
+    Returns:
+        dict: Resultado con filas cargadas y filas por segundo
+        
+    Example:
+        >>> bulk_load("events", [{"id": 1, "type": "click"}, {"id": 2, "type": "view"}])
+        {
+            "status": "success",
+            "message": "2 registros cargados en events",
+            "rows_affected": 2,
+            "records_count": 2,
+            "bytes_sent": 18,
+            "warnings": 0,
+            "column_groups": 1,
+            "elapsed_seconds": 0.004,
+            "rows_per_second": 500
+        }
+    """
+    logger.info(f"📦 Carga nativa en {table_name}: {len(records)} registros")
+    return crud_tools.bulk_load(table_name, records, connection_name, timeout=timeout)
 
 
 # ============================================================================
@@ -438,18 +632,27 @@ def bulk_insert(
 # ============================================================================
 
 @mcp.tool()
+@timed_tool
+@offload
 def select_records(
     table_name: str,
     columns: Optional[list] = None,
     where: Optional[dict] = None,
     limit: Optional[int] = None,
     order_by: Optional[str] = None,
-    connection_name: Optional[str] = None
+    connection_name: Optional[str] = None,
+    timeout: Optional[float] = None,
+    format: str = "rows",
+    max_response_bytes: Optional[int] = None,
+    parallel: int = 0
 ) -> dict:
     """
     Consulta registros de una tabla con filtros, ordenamiento y límites opcionales.
     
     Herramienta flexible para realizar consultas SELECT con múltiples opciones.
+    Si el resultado supera max_response_bytes se deja de leer: la respuesta trae
+    truncated=True, las filas leídas, el total estimado y un resumen por columna
+    (min/max/nulos/distintos) para decidir cómo acotar la consulta.
     
     Args:
         table_name: Nombre de la tabla a consultar
@@ -458,6 +661,14 @@ def select_records(
         limit: Número máximo de registros a devolver
         order_by: Ordenamiento (ej: "name ASC", "created_at DESC")
         connection_name: Nombre de la conexión (opcional)
+        timeout: Segundos máximos por sentencia (opcional, por defecto query_timeout)
+        format: "rows" (lista de diccionarios) o "columnar": nombres de columna una
+            sola vez y filas como arrays, con diccionario para textos repetidos y
+            deltas para claves crecientes (ver "encodings"); informa de los bytes ahorrados
+        max_response_bytes: Tamaño máximo de la respuesta (opcional, por defecto el global; 0 = sin límite)
+        parallel: Para tablas grandes, número de rangos de la clave primaria (entera)
+            que se leen a la vez en conexiones distintas. Sin order_by las filas llegan
+            sin orden; con order_by por la clave salen ordenadas (0 o 1 = desactivado)
     
     Returns:
         dict: Lista de registros encontrados
@@ -474,17 +685,79 @@ def select_records(
         
         >>> # Órdenes de un cliente específico
         >>> select_records("orders", where={"customer_id": 42, "status": "completed"})
+        
+        >>> # Resultado grande en formato compacto
+        >>> select_records("events", limit=5000, format="columnar")
+        
+        >>> # Lectura de una tabla grande con 4 conexiones
+        >>> select_records("events", order_by="id", parallel=4, max_response_bytes=0)
     """
     logger.info(f"🔍 Consultando {table_name}")
-    return crud_tools.select_records(table_name, columns, where, limit, order_by, connection_name)
+    return crud_tools.select_records(table_name, columns, where, limit, order_by, connection_name,
+                                     timeout=timeout, format=format, max_response_bytes=max_response_bytes,
+                                     parallel=parallel)
 
 
 @mcp.tool()
+@timed_tool
+@offload
+def paginate_records(
+    table_name: str,
+    columns: Optional[list] = None,
+    where: Optional[dict] = None,
+    order_by: Optional[str] = None,
+    page_size: int = 100,
+    page_token: Optional[str] = None,
+    connection_name: Optional[str] = None,
+    timeout: Optional[float] = None
+) -> dict:
+    """
+    Recorre una tabla grande página a página.
+    
+    Usa paginación por clave (keyset): cada página continúa desde la última
+    fila vista usando la clave primaria o un índice único, así que pedir la
+    página 1000 cuesta lo mismo que la primera. Para seguir, pasar el
+    next_page_token devuelto con los mismos filtros y ordenamiento.
+    
+    Args:
+        table_name: Nombre de la tabla a consultar
+        columns: Lista de columnas a seleccionar (None = todas las columnas)
+        where: Filtros como diccionario {columna: valor} (se unen con AND)
+        order_by: Ordenamiento (ej: "created_at DESC"); columnas NOT NULL y todas
+            en la misma dirección
+        page_size: Registros por página (default: 100)
+        page_token: Token de la página anterior (None = primera página)
+        connection_name: Nombre de la conexión (opcional)
+        timeout: Segundos máximos por sentencia (opcional, por defecto query_timeout)
+    
+    Returns:
+        dict: Registros de la página, has_more y next_page_token
+        
+    Examples:
+        >>> # Primera página
+        >>> paginate_records("orders", where={"status": "pending"}, page_size=500)
+        {"status": "success", "count": 500, "has_more": True, "next_page_token": "eyJxIjog...", ...}
+        
+        >>> # Página siguiente
+        >>> paginate_records("orders", where={"status": "pending"}, page_size=500,
+        ...                  page_token="eyJxIjog...")
+    """
+    logger.info(f"📄 Paginando {table_name}")
+    return crud_tools.paginate_records(
+        table_name, columns, where, order_by, page_size, page_token, connection_name,
+        timeout=timeout
+    )
+
+
+@mcp.tool()
+@timed_tool
+@offload
 def get_record_by_id(
     table_name: str,
     id_value: Any,
     id_column: str = "id",
-    connection_name: Optional[str] = None
+    connection_name: Optional[str] = None,
+    format: str = "rows"
 ) -> dict:
     """
     Obtiene un registro específico por su ID.
@@ -496,6 +769,7 @@ def get_record_by_id(
         id_value: Valor del ID a buscar
         id_column: Nombre de la columna que contiene el ID (default: "id")
         connection_name: Nombre de la conexión (opcional)
+        format: "rows" (record como diccionario) o "columnar" (columns + row como array)
     
     Returns:
         dict: Registro encontrado o mensaje si no existe
@@ -508,42 +782,63 @@ def get_record_by_id(
         >>> get_record_by_id("products", "PROD-123", id_column="product_code")
     """
     logger.info(f"🔍 Buscando en {table_name} donde {id_column}={id_value}")
-    return crud_tools.get_record_by_id(table_name, id_value, id_column, connection_name)
+    return crud_tools.get_record_by_id(table_name, id_value, id_column, connection_name, format=format)
 
 
 @mcp.tool()
+@timed_tool
+@offload
 def count_records(
     table_name: str,
     where: Optional[dict] = None,
-    connection_name: Optional[str] = None
+    connection_name: Optional[str] = None,
+    mode: str = "exact",
+    limit: int = 1000,
+    timeout: Optional[float] = None
 ) -> dict:
     """
     Cuenta el número de registros en una tabla con filtros opcionales.
     
-    Útil para obtener estadísticas sin cargar todos los datos.
+    Útil para obtener estadísticas sin cargar todos los datos. En tablas
+    grandes un conteo exacto recorre toda la tabla; los otros modos son
+    mucho más baratos:
+    
+    - exact: SELECT COUNT(*) exacto (por defecto)
+    - estimated: estadísticas del servidor o estimación de EXPLAIN con filtros
+    - bounded: cuenta como máximo `limit` filas ("al menos N")
+    - exists: solo indica si existe al menos una fila
     
     Args:
         table_name: Nombre de la tabla
         where: Filtros opcionales {columna: valor}
         connection_name: Nombre de la conexión (opcional)
+        mode: Modo de conteo: exact, estimated, bounded o exists
+        limit: Máximo de filas a contar en modo bounded (default: 1000)
+        timeout: Segundos máximos por sentencia (opcional, por defecto query_timeout)
     
     Returns:
-        dict: Cantidad de registros
+        dict: Cantidad de registros, modo usado y cota de error
+        (error_bound: none, lower_bound o estimate)
         
     Examples:
         >>> # Total de usuarios
         >>> count_records("users")
-        {"status": "success", "table": "users", "count": 1523}
+        {"status": "success", "table": "users", "count": 1523, "mode": "exact", "exact": True, ...}
         
         >>> # Usuarios activos
         >>> count_records("users", where={"active": 1})
-        {"status": "success", "table": "users", "count": 1204, "filters": {"active": 1}}
+        {"status": "success", "table": "users", "count": 1204, "filters": {"active": 1}, ...}
         
-        >>> # Órdenes pendientes
-        >>> count_records("orders", where={"status": "pending"})
+        >>> # Tamaño aproximado de una tabla enorme
+        >>> count_records("events", mode="estimated")
+        {"status": "success", "count": 48210000, "mode": "estimated", "exact": False,
+         "error_bound": "estimate", "estimate_source": "table_statistics", ...}
+        
+        >>> # ¿Hay más de 10000 órdenes pendientes?
+        >>> count_records("orders", where={"status": "pending"}, mode="bounded", limit=10000)
     """
-    logger.info(f"🔢 Contando registros en {table_name}")
-    return crud_tools.count_records(table_name, where, connection_name)
+    logger.info(f"🔢 Contando registros en {table_name} ({mode})")
+    return crud_tools.count_records(table_name, where, connection_name, mode, limit, timeout=timeout)
 
 
 # ============================================================================
@@ -551,6 +846,8 @@ def count_records(
 # ============================================================================
 
 @mcp.tool()
+@timed_tool
+@offload
 def update_record(
     table_name: str,
     id_value: Any,
@@ -592,11 +889,14 @@ def update_record(
 
 
 @mcp.tool()
+@timed_tool
+@offload
 def update_records(
     table_name: str,
     data: dict,
     where: dict,
-    connection_name: Optional[str] = None
+    connection_name: Optional[str] = None,
+    timeout: Optional[float] = None
 ) -> dict:
     """
     Actualiza múltiples registros que cumplan con los filtros especificados.
@@ -609,6 +909,7 @@ def update_records(
         data: Diccionario con los campos a actualizar {columna: nuevo_valor}
         where: Filtros REQUERIDOS {columna: valor}
         connection_name: Nombre de la conexión (opcional)
+        timeout: Segundos máximos por sentencia (opcional, por defecto query_timeout)
     
     Returns:
         dict: Cantidad de registros actualizados
@@ -624,7 +925,7 @@ def update_records(
         >>> update_records("orders", {"status": "archived"}, {"year": 2020})
     """
     logger.info(f"✏️  Actualización masiva en {table_name}")
-    return crud_tools.update_records(table_name, data, where, connection_name)
+    return crud_tools.update_records(table_name, data, where, connection_name, timeout=timeout)
 
 
 # ============================================================================
@@ -632,6 +933,8 @@ def update_records(
 # ============================================================================
 
 @mcp.tool()
+@timed_tool
+@offload
 def delete_record(
     table_name: str,
     id_value: Any,
@@ -665,11 +968,14 @@ def delete_record(
 
 
 @mcp.tool()
+@timed_tool
+@offload
 def delete_records(
     table_name: str,
     where: dict,
     connection_name: Optional[str] = None,
-    confirm: bool = False
+    confirm: bool = False,
+    timeout: Optional[float] = None
 ) -> dict:
     """
     Elimina múltiples registros que cumplan con los filtros especificados.
@@ -682,6 +988,7 @@ def delete_records(
         where: Filtros REQUERIDOS {columna: valor}
         connection_name: Nombre de la conexión (opcional)
         confirm: DEBE ser True para ejecutar la eliminación
+        timeout: Segundos máximos por sentencia (opcional, por defecto query_timeout)
     
     Returns:
         dict: Confirmación o solicitud de confirmación
@@ -701,7 +1008,245 @@ def delete_records(
         {"status": "success", "message": "145 registros eliminados de logs", "rows_affected": 145}
     """
     logger.info(f"🗑️  Eliminación masiva en {table_name} (confirm={confirm})")
-    return crud_tools.delete_records(table_name, where, connection_name, confirm)
+    return crud_tools.delete_records(table_name, where, connection_name, confirm, timeout=timeout)
+
+
+# ============================================================================
+# HERRAMIENTAS DE EXPORTACIÓN E IMPORTACIÓN
+# ============================================================================
+
+@mcp.tool()
+@timed_tool
+@offload
+def export_query(
+    table_name: str,
+    path: str,
+    format: str = "csv",
+    columns: Optional[list] = None,
+    where: Optional[dict] = None,
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None,
+    connection_name: Optional[str] = None,
+    compression: Optional[str] = None,
+    row_group_size: Optional[int] = None,
+    overwrite: bool = False,
+    timeout: Optional[float] = None,
+    parallel: int = 0
+) -> dict:
+    """
+    Exporta el resultado de una consulta a un fichero local sin pasar las filas por la respuesta.
+    
+    Acepta los mismos filtros que select_records. Las filas se leen con un cursor
+    del lado del servidor y se escriben por grupos, así que la memoria usada no
+    depende del tamaño de la tabla. Úsala para volcar tablas grandes o datasets
+    filtrados que se van a analizar fuera del chat.
+    
+    Args:
+        table_name: Nombre de la tabla
+        path: Fichero de destino relativo a export_directory (se añade la extensión
+            si no la trae); fuera de ese directorio solo con export_allow_absolute_paths
+        format: "csv", "ndjson" o "parquet" (parquet requiere pyarrow)
+        columns: Columnas a exportar (opcional, por defecto todas)
+        where: Filtros como diccionario {columna: valor}
+        limit: Número máximo de filas
+        order_by: Ordenamiento (ej: "id ASC")
+        connection_name: Nombre de la conexión (opcional)
+        compression: "gzip" o "zstd" (opcional; zstd requiere zstandard)
+        row_group_size: Filas por grupo de escritura (opcional)
+        overwrite: Sobrescribir el fichero si existe
+        timeout: Segundos máximos de la consulta (opcional, por defecto export_timeout)
+        parallel: Rangos de la clave primaria (entera) leídos a la vez en conexiones
+            distintas (opcional; 0 o 1 = una sola lectura)
+    
+    Returns:
+        dict: Ruta, filas, bytes escritos y rendimiento
+        
+    Example:
+        >>> export_query("orders", "orders_2024", format="csv", compression="gzip", where={"year": 2024})
+        {
+            "status": "success",
+            "path": "/home/user/project/exports/orders_2024.csv.gz",
+            "rows": 125000,
+            "bytes": 3120455,
+            "uncompressed_bytes": 15022310,
+            "elapsed_seconds": 1.92,
+            "rows_per_second": 65104.2,
+            ...
+        }
+    """
+    logger.info(f"📤 Exportando {table_name} a {path} ({format})")
+    return export_tools.export_query(
+        table_name, path, format, columns, where, limit, order_by, connection_name,
+        compression=compression, row_group_size=row_group_size, overwrite=overwrite, timeout=timeout,
+        parallel=parallel
+    )
+
+
+@mcp.tool()
+@timed_tool
+@offload
+def import_file(
+    table_name: str,
+    path: str,
+    format: Optional[str] = None,
+    connection_name: Optional[str] = None,
+    column_map: Optional[dict] = None,
+    chunk_size: Optional[int] = None,
+    null_value: Optional[str] = "",
+    resume: bool = True,
+    reject_path: Optional[str] = None,
+    max_rejects: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> dict:
+    """
+    Importa un fichero CSV, TSV o NDJSON local a una tabla existente.
+    
+    El fichero se lee en streaming (admite .gz y .zst) y se carga por trozos de
+    chunk_size filas con la carga nativa del motor o INSERT multi-fila, confirmando
+    cada trozo. Los valores se convierten a los tipos de la tabla; las filas que
+    no encajan se guardan en un fichero de rechazos en lugar de abortar la carga.
+    Si la importación se interrumpe, al repetir la llamada continúa desde el
+    último trozo confirmado.
+    
+    Args:
+        table_name: Tabla destino
+        path: Fichero de origen
+        format: "csv", "tsv" o "ndjson" (opcional, se deduce de la extensión)
+        connection_name: Nombre de la conexión (opcional)
+        column_map: Renombrado {campo_del_fichero: columna_de_la_tabla} (opcional)
+        chunk_size: Filas por trozo confirmado (opcional, por defecto import_chunk_size)
+        null_value: Celda CSV que se interpreta como NULL (por defecto vacía)
+        resume: Continuar desde el checkpoint si existe
+        reject_path: Fichero NDJSON de rechazos (opcional, por defecto <path>.rejects.ndjson)
+        max_rejects: Abortar si se superan tantos rechazos (opcional)
+        timeout: Segundos máximos por trozo (opcional)
+    
+    Returns:
+        dict: Filas leídas, cargadas y rechazadas, método usado y rendimiento
+        
+    Example:
+        >>> import_file("orders", "exports/orders_2024.csv.gz")
+        {
+            "status": "success",
+            "rows_read": 125000,
+            "rows_loaded": 124998,
+            "rows_rejected": 2,
+            "reject_file": "/home/user/project/exports/orders_2024.csv.gz.rejects.ndjson",
+            "method": "bulk_load",
+            "rows_per_second": 48210.5,
+            ...
+        }
+    """
+    logger.info(f"📥 Importando {path} en {table_name}")
+    return import_tools.import_file(
+        table_name, path, format, connection_name, column_map, chunk_size,
+        null_value=null_value, resume=resume, reject_path=reject_path,
+        max_rejects=max_rejects, timeout=timeout
+    )
+
+
+# ============================================================================
+# HERRAMIENTAS MULTI-CONEXIÓN
+# ============================================================================
+
+@mcp.tool()
+@timed_tool
+@offload(concurrency_key=fanout_tools.CONCURRENCY_KEY)
+def fanout_select_records(
+    table_name: str,
+    targets: list,
+    columns: Optional[list] = None,
+    where: Optional[dict] = None,
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    max_response_bytes: Optional[int] = None
+) -> dict:
+    """
+    Ejecuta la misma consulta en varias conexiones (shards o tenants) y combina las filas.
+    
+    Todas las conexiones se consultan a la vez. Con order_by y limit el resultado
+    es el top global (k-way merge de las filas ordenadas de cada conexión). Cada
+    fila incluye "_connection" con su origen. Si alguna conexión falla o no
+    responde a tiempo se devuelven las demás con status "partial".
+    
+    Args:
+        table_name: Nombre de la tabla (con el mismo esquema en todas las conexiones)
+        targets: Lista de nombres de conexión, patrones glob ("tenant_*") o
+            etiquetas ("tag:eu"); patrones y etiquetas solo incluyen conexiones activas
+        columns: Lista de columnas a seleccionar (None = todas las columnas)
+        where: Filtros como diccionario {columna: valor} (se unen con AND)
+        limit: Número máximo de registros del resultado combinado
+        order_by: Ordenamiento (ej: "created_at DESC")
+        max_concurrency: Conexiones consultadas a la vez (opcional)
+        timeout: Plazo total en segundos (opcional, por defecto fanout_timeout)
+        max_response_bytes: Tamaño máximo de la respuesta (opcional; 0 = sin límite)
+    
+    Returns:
+        dict: Registros combinados, conexiones fallidas y estado y latencia de cada una
+        
+    Example:
+        >>> fanout_select_records("orders", ["tenant_*"], order_by="created_at DESC", limit=20)
+        {
+            "status": "partial",
+            "count": 20,
+            "records": [{"id": 981, "created_at": "...", "_connection": "tenant_eu"}, ...],
+            "connections": 12,
+            "failed": ["tenant_us2"],
+            "shards": {"tenant_eu": {"status": "success", "elapsed_ms": 14.2, "count": 20}, ...}
+        }
+    """
+    logger.info(f"🌐 Consultando {table_name} en {targets}")
+    return fanout_tools.fanout_select(table_name, targets, columns, where, limit, order_by,
+                                      max_concurrency=max_concurrency, timeout=timeout,
+                                      max_response_bytes=max_response_bytes)
+
+
+@mcp.tool()
+@timed_tool
+@offload(concurrency_key=fanout_tools.CONCURRENCY_KEY)
+def fanout_count_records(
+    table_name: str,
+    targets: list,
+    where: Optional[dict] = None,
+    mode: str = "exact",
+    limit: int = 1000,
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> dict:
+    """
+    Cuenta registros en varias conexiones (shards o tenants) y suma los resultados.
+    
+    Acepta los mismos modos que count_records. El total es exacto solo si todas
+    las conexiones responden con un conteo exacto; si alguna falla el total es
+    una cota inferior y la respuesta lleva status "partial".
+    
+    Args:
+        table_name: Nombre de la tabla (con el mismo esquema en todas las conexiones)
+        targets: Lista de nombres de conexión, patrones glob ("tenant_*") o etiquetas ("tag:eu")
+        where: Filtros como diccionario {columna: valor}
+        mode: "exact", "estimated", "bounded" o "exists"
+        limit: Máximo a contar por conexión en modo bounded
+        max_concurrency: Conexiones consultadas a la vez (opcional)
+        timeout: Plazo total en segundos (opcional, por defecto fanout_timeout)
+    
+    Returns:
+        dict: Total, cota de error y conteo y latencia de cada conexión
+        
+    Example:
+        >>> fanout_count_records("users", ["tag:tenant"], where={"active": 1})
+        {
+            "status": "success",
+            "count": 48211,
+            "exact": True,
+            "error_bound": "none",
+            "shards": {"tenant_eu": {"status": "success", "elapsed_ms": 8.1, "count": 10422}, ...}
+        }
+    """
+    logger.info(f"🌐 Contando registros de {table_name} en {targets}")
+    return fanout_tools.fanout_count(table_name, targets, where, mode, limit,
+                                     max_concurrency=max_concurrency, timeout=timeout)
 
 
 # ============================================================================
@@ -731,6 +1276,19 @@ def main():
         else:
             logger.info("✅ Archivo de configuración encontrado")
         
+        # Exportación opcional de métricas en formato Prometheus
+        settings = get_config().settings
+        if settings.metrics_prometheus_file or settings.metrics_prometheus_port:
+            start_prometheus_exporter(
+                settings.metrics_prometheus_file,
+                settings.metrics_prometheus_port,
+                settings.metrics_export_interval
+            )
+        
+        # Calentamiento de conexiones en segundo plano (no retrasa el handshake MCP)
+        if settings.warmup_on_start:
+            start_warmup()
+        
         # Iniciar servidor
         logger.info("🚀 Servidor MCP listo y esperando conexiones...")
         logger.info("=" * 70)
@@ -3,33 +3,51 @@ Herramientas CRUD (Create, Read, Update, Delete) para operaciones básicas en ba
 """
 
 from typing import Dict, Any, List, Optional
+from contextlib import contextmanager
+from decimal import Decimal
+import base64
+import datetime
+import hashlib
+import json
 import logging
+import time
 
 # Imports flexibles para soportar ejecución directa y como módulo
 try:
     from ..config import get_config
-    from ..database.mysql_handler import MySQLHandler
-    from ..database.postgres_handler import PostgreSQLHandler
+    from ..database.connection import get_connection_pool, BulkLoadUnavailable, QueryTimeoutError
+    from ..database.metadata_cache import get_metadata_cache
+    from ..database.parallel_scan import get_scan_slots, key_ranges, scan_partitions, split_key_range
+    from ..database.result_cache import get_result_cache, invalidate_results
+    from ..database.registry import get_handler_class
+    from ..utils.response_budget import collect_rows, summarize_columns
+    from ..utils.result_format import check_format, format_record, format_records
 except ImportError:
     import sys
     import os
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
     from config import get_config
-    from database.mysql_handler import MySQLHandler
-    from database.postgres_handler import PostgreSQLHandler
+    from database.connection import get_connection_pool, BulkLoadUnavailable, QueryTimeoutError
+    from database.metadata_cache import get_metadata_cache
+    from database.parallel_scan import get_scan_slots, key_ranges, scan_partitions, split_key_range
+    from database.result_cache import get_result_cache, invalidate_results
+    from database.registry import get_handler_class
+    from utils.response_budget import collect_rows, summarize_columns
+    from utils.result_format import check_format, format_record, format_records
 
 logger = logging.getLogger(__name__)
 
 
-def _get_handler(connection_name: Optional[str] = None):
+def _resolve_connection(connection_name: Optional[str] = None, database: Optional[str] = None) -> tuple:
     """
-    Función auxiliar para obtener el handler de base de datos apropiado.
+    Resuelve la configuración de una conexión a la clase de handler y sus argumentos.
     
     Args:
         connection_name: Nombre de la conexión (None = usar default)
+        database: Base de datos a usar en lugar de la configurada (opcional)
     
     Returns:
-        DatabaseHandler instance
+        Tupla (pool_key, handler_class, handler_kwargs)
     
     Raises:
         ValueError: Si la conexión no existe o el tipo no es soportado
@@ -44,25 +62,170 @@ def _get_handler(connection_name: Optional[str] = None):
             f"Conexiones disponibles: {', '.join(available)}"
         )
     
-    # Crear handler según el tipo
+    # Elegir handler según el tipo (el módulo del driver se importa aquí la primera vez)
+    handler_class = get_handler_class(conn_config.type)
+    
+    name = connection_name or config.default_connection
+    pool_key = f"{name}/{database}" if database else name
+    
+    handler_kwargs = dict(
+        host=conn_config.host,
+        port=conn_config.port,
+        user=conn_config.user,
+        password=conn_config.password,
+        database=database or conn_config.database,
+        statement_cache_size=config.settings.prepared_statement_cache_size,
+        query_timeout=config.settings.query_timeout
+    )
     if conn_config.type == 'mysql':
-        return MySQLHandler(
-            host=conn_config.host,
-            port=conn_config.port,
-            user=conn_config.user,
-            password=conn_config.password,
-            database=conn_config.database
-        )
-    elif conn_config.type in ('postgres', 'postgresql'):
-        return PostgreSQLHandler(
-            host=conn_config.host,
-            port=conn_config.port,
-            user=conn_config.user,
-            password=conn_config.password,
-            database=conn_config.database
-        )
-    else:
-        raise ValueError(f"Tipo de base de datos '{conn_config.type}' no soportado")
+        handler_kwargs['local_infile'] = config.settings.mysql_local_infile
+    return pool_key, handler_class, handler_kwargs
+
+
+def get_pool():
+    """Obtiene el pool global configurado según ServerSettings"""
+    settings = get_config().settings
+    return get_connection_pool(
+        settings.pool_size,
+        timeout=settings.pool_timeout,
+        min_idle=settings.pool_min_idle,
+        max_idle=settings.pool_max_idle,
+        max_lifetime=settings.pool_max_lifetime,
+        idle_timeout=settings.pool_idle_timeout,
+        keepalive_interval=settings.pool_keepalive_interval,
+        validate_after=settings.pool_validate_after
+    )
+
+
+@contextmanager
+def pooled_handler(connection_name: Optional[str] = None, database: Optional[str] = None,
+                   timeout: Optional[float] = None):
+    """
+    Toma un handler conectado del pool global y lo devuelve al terminar.
+    
+    Las sentencias del bloque quedan limitadas por timeout (o query_timeout);
+    al vencer se cancelan y se lanza QueryTimeoutError.
+    
+    Args:
+        connection_name: Nombre de la conexión (None = usar default)
+        database: Base de datos a usar en lugar de la configurada (opcional)
+        timeout: Segundos máximos por sentencia (None = query_timeout)
+    
+    Yields:
+        DatabaseHandler conectado y de uso exclusivo durante el bloque
+    
+    Example:
+        with pooled_handler("mysql_local") as handler:
+            handler.fetch_all("SELECT 1")
+    """
+    pool_key, handler_class, handler_kwargs = _resolve_connection(connection_name, database)
+    pool = get_pool()
+    
+    with pool.connection(pool_key, handler_class, **handler_kwargs) as handler:
+        with handler.deadline(timeout):
+            yield handler
+
+
+def get_schema_cache():
+    """Obtiene la caché de metadatos global configurada según ServerSettings"""
+    settings = get_config().settings
+    return get_metadata_cache(settings.metadata_cache_ttl, settings.metadata_cache_max_entries)
+
+
+def get_metadata(handler, kind: str, table_name: Optional[str] = None) -> Any:
+    """
+    Obtiene metadatos de esquema pasando por la caché.
+    
+    Args:
+        handler: Handler del pool (solo se usa si la caché no tiene la entrada)
+        kind: "tables", "columns" o "indexes"
+        table_name: Tabla (requerida para columns e indexes)
+    
+    Returns:
+        Lista de tablas, columnas o índices
+    """
+    loaders = {
+        "tables": lambda: handler.list_tables(),
+        "columns": lambda: handler.get_table_schema(table_name),
+        "indexes": lambda: handler.get_indexes(table_name)
+    }
+    if kind not in loaders:
+        raise ValueError(f"Tipo de metadato no soportado: {kind}")
+    return get_schema_cache().get(handler.cache_scope, kind, table_name, loaders[kind])
+
+
+def get_results_cache():
+    """Obtiene la caché de resultados global configurada según ServerSettings"""
+    settings = get_config().settings
+    return get_result_cache(
+        settings.result_cache_max_bytes,
+        settings.result_cache_ttl,
+        settings.result_cache_table_ttls
+    )
+
+
+def _cached_read(connection_name: Optional[str], table_name: str, query: str,
+                 params: Optional[tuple], loader, cacheable=None) -> tuple:
+    """
+    Ejecuta una lectura pasando por la caché de resultados si está activada.
+    
+    Args:
+        connection_name: Nombre de la conexión (None = usar default)
+        table_name: Tabla consultada (para invalidar al escribir en ella)
+        query: SQL de la lectura
+        params: Parámetros de la consulta
+        loader: Función que ejecuta la lectura contra el servidor
+        cacheable: Función que decide si el resultado se guarda (None = siempre)
+    
+    Returns:
+        Tupla (resultado, si vino de la caché)
+    """
+    if not get_config().settings.result_cache_enabled:
+        return loader(), False
+    
+    scope = _resolve_connection(connection_name)[0]
+    cache = get_results_cache()
+    hit, value = cache.get(scope, query, params)
+    if hit:
+        return value, True
+    
+    generation = cache.generation(scope, table_name)
+    value = loader()
+    if cacheable is None or cacheable(value):
+        cache.put(scope, table_name, query, params, value, generation)
+    return value, False
+
+
+def _estimate_total_rows(handler, query: str, params: Optional[tuple], limit: Optional[int]) -> Optional[int]:
+    """Filas que devolvería la consulta completa según el optimizador (None si no hay estimación)"""
+    estimator = getattr(handler, "explain_row_estimate", None)
+    if estimator is None:
+        return None
+    try:
+        estimate = estimator(query, params if params else None)
+    except Exception as e:
+        logger.debug(f"No se pudo estimar el total de filas: {e}")
+        return None
+    if estimate is not None and limit:
+        estimate = min(estimate, limit)
+    return estimate
+
+
+def _invalidate_table(connection_name: Optional[str], table_name: str) -> None:
+    """Invalida los resultados cacheados de una tabla tras escribir en ella"""
+    invalidate_results(connection_name or get_config().default_connection or "", table_name)
+
+
+def _timeout_error(error: QueryTimeoutError, table_name: Optional[str]) -> Dict[str, Any]:
+    """Respuesta de error estructurada para una consulta cancelada por timeout"""
+    logger.warning(f"⏱️ Timeout en {table_name}: {error}")
+    return {
+        "status": "error",
+        "error_type": "timeout",
+        "error": str(error),
+        "timeout": error.timeout,
+        "table": table_name
+    }
 
 
 def _build_where_clause(where_dict: Optional[Dict[str, Any]] = None) -> tuple:
@@ -89,6 +252,134 @@ def _build_where_clause(where_dict: Optional[Dict[str, Any]] = None) -> tuple:
     return where_clause, tuple(params)
 
 
+def _build_select(table_name: str, columns: Optional[List[str]] = None,
+                  where: Optional[Dict[str, Any]] = None, order_by: Optional[str] = None,
+                  limit: Optional[int] = None) -> tuple:
+    """
+    Construye un SELECT con los parámetros de select_records.
+    
+    Returns:
+        Tupla (query, params)
+    """
+    cols = ', '.join(columns) if columns else '*'
+    query = f"SELECT {cols} FROM {table_name}"
+    
+    # Agregar WHERE
+    where_clause, params = _build_where_clause(where)
+    query += where_clause
+    
+    # Agregar ORDER BY
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    
+    # Agregar LIMIT
+    if limit:
+        query += f" LIMIT {limit}"
+    
+    return query, params
+
+
+def _plan_parallel_scan(handler, table_name: str, columns: Optional[List[str]],
+                        where: Optional[Dict[str, Any]], order_by: Optional[str],
+                        limit: Optional[int], partitions: int) -> tuple:
+    """
+    Divide un SELECT en rangos contiguos de la clave primaria.
+    
+    Los límites salen del histograma de la clave si el motor lo tiene
+    (key_histogram) y si no de dividir MIN..MAX en partes iguales.
+    
+    Args:
+        handler: Handler del pool para leer índices y límites
+        table_name: Nombre de la tabla
+        columns: Columnas a seleccionar (None = todas)
+        where: Filtros {columna: valor}
+        order_by: Solo se admite la clave primaria (ASC o DESC)
+        limit: Filas máximas (se aplica también a cada rango)
+        partitions: Rangos deseados
+    
+    Returns:
+        Tupla (lista de (query, params), si el resultado va ordenado)
+    
+    Raises:
+        ValueError: Si la tabla no tiene clave primaria entera de una columna
+            o el ordenamiento no es por esa clave
+    """
+    key = _pick_seek_key(get_metadata(handler, "indexes", table_name))
+    if len(key) != 1:
+        raise ValueError("El modo paralelo requiere una clave primaria o única de una sola columna")
+    key = key[0]
+    
+    sort = _parse_order_by(order_by)
+    if sort and (len(sort) != 1 or sort[0][0].lower() != key.lower()):
+        raise ValueError(f"En modo paralelo solo se puede ordenar por la clave {key}")
+    direction = sort[0][1] if sort else None
+    
+    where_clause, params = _build_where_clause(where)
+    bounds = handler.fetch_one(f"SELECT MIN({key}) AS low, MAX({key}) AS high FROM {table_name}{where_clause}",
+                               params if params else None)
+    low, high = (bounds["low"], bounds["high"]) if bounds else (None, None)
+    if low is None:
+        return [_build_select(table_name, columns, where, order_by, limit)], bool(direction)
+    if isinstance(low, bool) or not isinstance(low, int) or not isinstance(high, int):
+        raise ValueError(f"El modo paralelo requiere una clave entera ({key} es {type(low).__name__})")
+    
+    histogram = None
+    if partitions > 1:
+        try:
+            histogram = handler.key_histogram(table_name, key)
+        except Exception as e:
+            logger.debug(f"Sin histograma para {table_name}.{key}: {e}")
+    boundaries = split_key_range(low, high, partitions, histogram)
+    
+    cols = ', '.join(columns) if columns else '*'
+    queries = []
+    for start, end in key_ranges(boundaries):
+        conditions = [clause for clause, value in ((f"{key} >= %s", start), (f"{key} < %s", end)) if value is not None]
+        range_params = params + tuple(value for value in (start, end) if value is not None)
+        clause = where_clause + (" AND " if where_clause else " WHERE ") + " AND ".join(conditions) if conditions else where_clause
+        query = f"SELECT {cols} FROM {table_name}{clause}"
+        if direction:
+            query += f" ORDER BY {key} {direction}"
+        if limit:
+            query += f" LIMIT {limit}"
+        queries.append((query, range_params if range_params else None))
+    
+    if direction == "DESC":
+        queries.reverse()
+    return queries, bool(direction)
+
+
+def _parallel_rows(table_name: str, columns: Optional[List[str]], where: Optional[Dict[str, Any]],
+                   order_by: Optional[str], limit: Optional[int], connection_name: Optional[str],
+                   partitions: int, timeout: Optional[float] = None, lease=None):
+    """
+    Filas de un SELECT leído por rangos de clave en varias conexiones a la vez.
+    
+    Los hilos simultáneos se limitan por parallel_scan_max_workers (por
+    conexión, compartido entre lecturas) y por el tamaño del pool. Cada
+    rango es una sentencia distinta: no hay una única instantánea.
+    
+    Args:
+        partitions: Rangos en los que se divide la tabla
+        lease: Context manager que presta un handler (None = pooled_handler con timeout)
+    
+    Returns:
+        Generador de filas (cerrarlo cancela las lecturas pendientes)
+    """
+    settings = get_config().settings
+    lease = lease or (lambda: pooled_handler(connection_name, timeout=timeout))
+    
+    with lease() as handler:
+        queries, ordered = _plan_parallel_scan(handler, table_name, columns, where, order_by, limit, partitions)
+    
+    scope = _resolve_connection(connection_name)[0]
+    slots = get_scan_slots(scope, settings.parallel_scan_max_workers)
+    workers = min(partitions, settings.pool_size)
+    logger.info(f"🔀 Lectura paralela de {table_name}: {len(queries)} rangos, hasta {workers} conexiones")
+    return scan_partitions(lease, queries, workers, ordered, settings.stream_batch_size,
+                           limit, slots, settings.pool_timeout)
+
+
 # ============================================================================
 # CREATE - Operaciones de INSERT
 # ============================================================================
@@ -113,18 +404,17 @@ def insert_record(
         insert_record("users", {"name": "John", "email": "john@example.com"})
     """
     try:
-        handler = _get_handler(connection_name)
-        
         # Construir query
         columns = ', '.join(data.keys())
         placeholders = ', '.join(['%s'] * len(data))
         query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
         params = tuple(data.values())
         
-        with handler:
-            affected = handler.execute_query(query, params)
+        with pooled_handler(connection_name) as handler:
+            affected = handler.execute_prepared(query, params)
             handler.commit()
             last_id = handler.get_last_insert_id()
+        _invalidate_table(connection_name, table_name)
         
         logger.info(f"✅ Registro insertado en {table_name}")
         
@@ -136,6 +426,8 @@ def insert_record(
             "data": data
         }
         
+    except QueryTimeoutError as e:
+        return _timeout_error(e, table_name)
     except Exception as e:
         logger.error(f"❌ Error insertando en {table_name}: {e}")
         return {
@@ -145,18 +437,51 @@ def insert_record(
         }
 
 
+def _group_by_columns(records: List[Dict[str, Any]]) -> List[tuple]:
+    """
+    Agrupa registros por su conjunto de columnas.
+    
+    Args:
+        records: Lista de diccionarios con los datos
+    
+    Returns:
+        Lista de tuplas (columnas, filas) en orden de primera aparición
+    """
+    groups: Dict[frozenset, tuple] = {}
+    for record in records:
+        signature = frozenset(record.keys())
+        if signature not in groups:
+            groups[signature] = (list(record.keys()), [])
+        columns, rows = groups[signature]
+        rows.append(tuple(record[column] for column in columns))
+    return list(groups.values())
+
+
 def bulk_insert(
     table_name: str,
     records: List[Dict[str, Any]],
-    connection_name: Optional[str] = None
+    connection_name: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    timeout: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Inserta múltiples registros en una tabla.
     
+    Los registros se agrupan por conjunto de columnas y cada grupo se envía
+    en sentencias INSERT multi-fila, limitadas por batch_size y por el
+    tamaño máximo de sentencia del servidor. Todo en una única transacción.
+    A partir de bulk_load_threshold registros se usa la carga nativa
+    (ver bulk_load) y, si no está disponible, se vuelve a INSERT por lotes.
+    Si la carga nativa descarta o altera filas (clave duplicada, conversión)
+    se revierte la transacción completa y se devuelve el error. method indica
+    bulk_load, insert o mixed y methods las sentencias de cada uno.
+    
     Args:
         table_name: Nombre de la tabla
         records: Lista de diccionarios con los datos
         connection_name: Nombre de la conexión (None = usar default)
+        batch_size: Filas máximas por sentencia (None = bulk_insert_max_rows)
+        timeout: Segundos máximos por sentencia (None = query_timeout)
     
     Returns:
         Dict con el resultado de la inserción
@@ -174,28 +499,49 @@ def bulk_insert(
                 "error": "No hay registros para insertar"
             }
         
-        handler = _get_handler(connection_name)
-        
-        # Usar las columnas del primer registro
-        columns = ', '.join(records[0].keys())
-        placeholders = ', '.join(['%s'] * len(records[0]))
-        query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
-        
-        # Preparar lista de parámetros
-        params_list = [tuple(record.values()) for record in records]
+        settings = get_config().settings
+        max_rows = batch_size or settings.bulk_insert_max_rows
+        groups = _group_by_columns(records)
+        native = bool(settings.bulk_load_threshold) and len(records) >= settings.bulk_load_threshold
         
-        with handler:
-            total_affected = handler.execute_many(query, params_list)
+        total_affected = 0
+        # Sentencias por método: un grupo puede ir por carga nativa y el resto por INSERT
+        methods = {"bulk_load": 0, "insert": 0}
+        with pooled_handler(connection_name, timeout=timeout) as handler:
+            with handler.transaction():
+                for columns, rows in groups:
+                    if native:
+                        try:
+                            result = handler.bulk_load(table_name, columns, rows)
+                            total_affected += result["rows"]
+                            methods["bulk_load"] += 1
+                            continue
+                        except BulkLoadUnavailable as e:
+                            logger.info(f"ℹ️ Carga nativa no disponible, usando INSERT por lotes: {e}")
+                            native = False
+                    affected, executed = handler.insert_many(table_name, columns, rows, max_rows)
+                    total_affected += affected
+                    methods["insert"] += executed
+        _invalidate_table(connection_name, table_name)
         
-        logger.info(f"✅ {len(records)} registros insertados en {table_name}")
+        statements = sum(methods.values())
+        used = [name for name, count in methods.items() if count]
+        method = used[0] if len(used) == 1 else "mixed"
+        logger.info(f"✅ {len(records)} registros insertados en {table_name} ({statements} sentencias, {method})")
         
         return {
             "status": "success",
             "message": f"{len(records)} registros insertados en {table_name}",
             "rows_affected": total_affected,
-            "records_count": len(records)
+            "records_count": len(records),
+            "statements": statements,
+            "column_groups": len(groups),
+            "method": method,
+            "methods": methods
         }
         
+    except QueryTimeoutError as e:
+        return _timeout_error(e, table_name)
     except Exception as e:
         logger.error(f"❌ Error en inserción masiva en {table_name}: {e}")
         return {
@@ -205,6 +551,87 @@ def bulk_insert(
         }
 
 
+def bulk_load(
+    table_name: str,
+    records: List[Dict[str, Any]],
+    connection_name: Optional[str] = None,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Carga registros con el mecanismo nativo del motor.
+    
+    MySQL usa LOAD DATA LOCAL INFILE y PostgreSQL COPY ... FROM STDIN;
+    los datos se transmiten en memoria sin fichero temporal. Todo en una
+    única transacción.
+    
+    Args:
+        table_name: Nombre de la tabla
+        records: Lista de diccionarios con los datos
+        connection_name: Nombre de la conexión (None = usar default)
+        timeout: Segundos máximos por sentencia (None = query_timeout)
+    
+    Returns:
+        Dict con filas cargadas y rendimiento (filas/segundo)
+        
+    Example:
+        bulk_load("events", [{"id": 1, "type": "click"}, {"id": 2, "type": "view"}])
+    """
+    try:
+        if not records:
+            return {
+                "status": "error",
+                "error": "No hay registros para cargar"
+            }
+        
+        groups = _group_by_columns(records)
+        started = time.perf_counter()
+        
+        total_rows = 0
+        total_bytes = 0
+        warnings = 0
+        with pooled_handler(connection_name, timeout=timeout) as handler:
+            with handler.transaction():
+                for columns, rows in groups:
+                    result = handler.bulk_load(table_name, columns, rows)
+                    total_rows += result["rows"]
+                    total_bytes += result["bytes"]
+                    warnings += result["warnings"]
+        _invalidate_table(connection_name, table_name)
+        
+        elapsed = time.perf_counter() - started
+        rows_per_second = round(len(records) / elapsed) if elapsed > 0 else None
+        logger.info(f"✅ {len(records)} registros cargados en {table_name} ({rows_per_second} filas/s)")
+        
+        return {
+            "status": "success",
+            "message": f"{len(records)} registros cargados en {table_name}",
+            "rows_affected": total_rows,
+            "records_count": len(records),
+            "bytes_sent": total_bytes,
+            "warnings": warnings,
+            "column_groups": len(groups),
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": rows_per_second
+        }
+        
+    except BulkLoadUnavailable as e:
+        logger.warning(f"⚠️ Carga nativa no disponible en {table_name}: {e}")
+        return {
+            "status": "error",
+            "error": f"Carga nativa no disponible: {e}. Usa bulk_insert",
+            "table": table_name
+        }
+    except QueryTimeoutError as e:
+        return _timeout_error(e, table_name)
+    except Exception as e:
+        logger.error(f"❌ Error en carga nativa en {table_name}: {e}")
+        return {
+            "status": "error",
+            "error": str(e),
+            "table": table_name
+        }
+
+
 # ============================================================================
 # READ - Operaciones de SELECT
 # ============================================================================
@@ -215,11 +642,20 @@ def select_records(
     where: Optional[Dict[str, Any]] = None,
     limit: Optional[int] = None,
     order_by: Optional[str] = None,
-    connection_name: Optional[str] = None
+    connection_name: Optional[str] = None,
+    timeout: Optional[float] = None,
+    format: str = "rows",
+    max_response_bytes: Optional[int] = None,
+    parallel: int = 0
 ) -> Dict[str, Any]:
     """
     Selecciona registros de una tabla con filtros opcionales.
     
+    Las filas se leen con un cursor del lado del servidor hasta agotar el
+    resultado o el presupuesto de bytes. Si se agota el presupuesto se deja
+    de leer, se cancela el cursor y la respuesta incluye truncated=True, las
+    filas leídas, una estimación del total y un resumen por columna.
+    
     Args:
         table_name: Nombre de la tabla
         columns: Lista de columnas a seleccionar (None = todas)
@@ -227,44 +663,91 @@ def select_records(
         limit: Número máximo de registros
         order_by: Columna para ordenar (ej: "name ASC", "id DESC")
         connection_name: Nombre de la conexión (None = usar default)
+        timeout: Segundos máximos por sentencia (None = query_timeout)
+        format: "rows" (lista de diccionarios) o "columnar" (columns + rows como arrays)
+        max_response_bytes: Presupuesto de la respuesta (None = max_response_bytes global, 0 = sin límite)
+        parallel: Rangos de la clave primaria leídos a la vez en conexiones distintas (0 o 1 = una sola lectura)
     
     Returns:
         Dict con los registros encontrados
         
     Example:
         select_records("users", columns=["name", "email"], where={"active": 1}, limit=10)
+        select_records("events", limit=5000, format="columnar")
+        select_records("logs", max_response_bytes=1_000_000)
+        select_records("events", order_by="id", parallel=4, max_response_bytes=0)
     """
     try:
-        handler = _get_handler(connection_name)
-        
-        # Construir query
-        cols = ', '.join(columns) if columns else '*'
-        query = f"SELECT {cols} FROM {table_name}"
-        
-        # Agregar WHERE
-        where_clause, params = _build_where_clause(where)
-        query += where_clause
+        check_format(format)
         
-        # Agregar ORDER BY
-        if order_by:
-            query += f" ORDER BY {order_by}"
+        query, params = _build_select(table_name, columns, where, order_by, limit)
         
-        # Agregar LIMIT
-        if limit:
-            query += f" LIMIT {limit}"
+        settings = get_config().settings
+        batch_size = settings.stream_batch_size
+        budget = settings.max_response_bytes if max_response_bytes is None else max_response_bytes
         
-        with handler:
-            records = handler.fetch_all(query, params if params else None)
+        def load():
+            if parallel > 1:
+                rows = _parallel_rows(table_name, columns, where, order_by, limit, connection_name,
+                                      parallel, timeout)
+                try:
+                    records, truncated, size = collect_rows(rows, budget)
+                finally:
+                    rows.close()
+                estimated = None
+                if truncated:
+                    with pooled_handler(connection_name, timeout=timeout) as handler:
+                        estimated = _estimate_total_rows(handler, query, params, limit)
+                return {"records": records, "truncated": truncated, "bytes": size, "estimated_total_rows": estimated}
+            
+            with pooled_handler(connection_name, timeout=timeout) as handler:
+                rows = handler.iter_rows(query, params if params else None, batch_size)
+                try:
+                    records, truncated, size = collect_rows(rows, budget)
+                finally:
+                    rows.close()
+                estimated = _estimate_total_rows(handler, query, params, limit) if truncated else None
+            return {"records": records, "truncated": truncated, "bytes": size, "estimated_total_rows": estimated}
         
-        logger.info(f"✅ {len(records)} registros obtenidos de {table_name}")
+        loaded, cached = _cached_read(connection_name, table_name, query, params, load,
+                                      cacheable=lambda value: not value["truncated"])
+        records, truncated, size = loaded["records"], loaded["truncated"], loaded["bytes"]
+        estimated = loaded["estimated_total_rows"]
+        if cached and budget:
+            # La caché guarda resultados completos; aplicar el presupuesto de esta llamada
+            total = len(records)
+            records, truncated, size = collect_rows(records, budget)
+            estimated = total if truncated else None
         
-        return {
+        response = {
             "status": "success",
             "table": table_name,
             "count": len(records),
-            "records": records
+            **format_records(records, format),
+            "cached": cached
         }
         
+        if truncated:
+            # El optimizador puede quedarse corto: al menos hay una fila más de las leídas
+            if estimated is not None:
+                estimated = max(estimated, len(records) + 1)
+            response.update(
+                truncated=True,
+                max_response_bytes=budget,
+                returned_bytes=size,
+                estimated_total_rows=estimated,
+                estimated_total_bytes=size * estimated // len(records) if records and estimated else None,
+                summary=summarize_columns(records)
+            )
+            logger.warning(f"✂️ Respuesta de {table_name} truncada en {len(records)} filas "
+                           f"(presupuesto {budget} bytes, ~{estimated} filas en total)")
+        else:
+            logger.info(f"✅ {len(records)} registros obtenidos de {table_name}")
+        
+        return response
+        
+    except QueryTimeoutError as e:
+        return _timeout_error(e, table_name)
     except Exception as e:
         logger.error(f"❌ Error consultando {table_name}: {e}")
         return {
@@ -278,7 +761,8 @@ def get_record_by_id(
     table_name: str,
     id_value: Any,
     id_column: str = "id",
-    connection_name: Optional[str] = None
+    connection_name: Optional[str] = None,
+    format: str = "rows"
 ) -> Dict[str, Any]:
     """
     Obtiene un registro por su ID.
@@ -288,6 +772,7 @@ def get_record_by_id(
         id_value: Valor del ID a buscar
         id_column: Nombre de la columna ID (default: "id")
         connection_name: Nombre de la conexión (None = usar default)
+        format: "rows" (record como diccionario) o "columnar" (columns + row)
     
     Returns:
         Dict con el registro encontrado
@@ -296,12 +781,15 @@ def get_record_by_id(
         get_record_by_id("users", 42)
     """
     try:
-        handler = _get_handler(connection_name)
+        check_format(format)
         
         query = f"SELECT * FROM {table_name} WHERE {id_column} = %s"
         
-        with handler:
-            record = handler.fetch_one(query, (id_value,))
+        def load():
+            with pooled_handler(connection_name) as handler:
+                return handler.fetch_one_prepared(query, (id_value,))
+        
+        record, cached = _cached_read(connection_name, table_name, query, (id_value,), load)
         
         if record:
             logger.info(f"✅ Registro encontrado en {table_name} con {id_column}={id_value}")
@@ -309,7 +797,8 @@ def get_record_by_id(
                 "status": "success",
                 "table": table_name,
                 "found": True,
-                "record": record
+                **format_record(record, format),
+                "cached": cached
             }
         else:
             logger.info(f"ℹ️  No se encontró registro en {table_name} con {id_column}={id_value}")
@@ -320,6 +809,8 @@ def get_record_by_id(
                 "message": f"No se encontró registro con {id_column}={id_value}"
             }
         
+    except QueryTimeoutError as e:
+        return _timeout_error(e, table_name)
     except Exception as e:
         logger.error(f"❌ Error buscando en {table_name}: {e}")
         return {
@@ -329,45 +820,101 @@ def get_record_by_id(
         }
 
 
+COUNT_MODES = ("exact", "estimated", "bounded", "exists")
+
+
 def count_records(
     table_name: str,
     where: Optional[Dict[str, Any]] = None,
-    connection_name: Optional[str] = None
+    connection_name: Optional[str] = None,
+    mode: str = "exact",
+    limit: int = 1000,
+    timeout: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Cuenta registros en una tabla con filtros opcionales.
     
+    Modos:
+        exact: SELECT COUNT(*) (recorre la tabla o el índice completo)
+        estimated: estadísticas de la tabla sin filtros, EXPLAIN con filtros
+        bounded: cuenta como máximo `limit` filas
+        exists: solo comprueba si hay al menos una fila
+    
     Args:
         table_name: Nombre de la tabla
         where: Diccionario con filtros {columna: valor}
         connection_name: Nombre de la conexión (None = usar default)
+        mode: Modo de conteo (exact, estimated, bounded, exists)
+        limit: Máximo a contar en modo bounded
+        timeout: Segundos máximos por sentencia (None = query_timeout)
     
     Returns:
-        Dict con el conteo
+        Dict con el conteo, el modo usado y su cota de error
         
     Example:
         count_records("users", where={"active": 1})
+        count_records("events", mode="bounded", limit=10000)
     """
     try:
-        handler = _get_handler(connection_name)
+        if mode not in COUNT_MODES:
+            raise ValueError(f"Modo de conteo no soportado: {mode}. Modos: {', '.join(COUNT_MODES)}")
+        if mode == "bounded" and limit < 1:
+            raise ValueError("limit debe ser mayor que 0 en modo bounded")
         
-        query = f"SELECT COUNT(*) as total FROM {table_name}"
         where_clause, params = _build_where_clause(where)
-        query += where_clause
+        response = {"mode": mode}
+        
+        if mode == "exact":
+            query = f"SELECT COUNT(*) as total FROM {table_name}{where_clause}"
+        elif mode == "bounded":
+            query = (f"SELECT COUNT(*) as total FROM "
+                     f"(SELECT 1 FROM {table_name}{where_clause} LIMIT {int(limit)}) AS bounded")
+        elif mode == "exists":
+            query = f"SELECT 1 as total FROM {table_name}{where_clause} LIMIT 1"
+        else:
+            query = f"SELECT * FROM {table_name}{where_clause}"
         
-        with handler:
-            result = handler.fetch_one(query, params if params else None)
+        def load():
+            with pooled_handler(connection_name, timeout=timeout) as handler:
+                if mode != "estimated":
+                    return handler.fetch_one(query, params if params else None)
+                
+                estimate = None
+                source = "explain"
+                if not where:
+                    estimate = handler.estimate_row_count(table_name)
+                    source = "table_statistics"
+                if estimate is None:
+                    estimate = handler.explain_row_estimate(query, params if params else None)
+                    source = "explain"
+                return {"total": estimate or 0, "source": source}
         
+        result, cached = _cached_read(connection_name, table_name, f"/* {mode} */ {query}", params, load)
         total = result['total'] if result else 0
-        logger.info(f"✅ Conteo en {table_name}: {total} registros")
+        
+        if mode == "exact":
+            response.update(exact=True, error_bound="none")
+        elif mode == "bounded":
+            reached = total >= limit
+            response.update(exact=not reached, error_bound="lower_bound" if reached else "none", limit=limit)
+        elif mode == "exists":
+            response.update(exact=total == 0, error_bound="lower_bound" if total else "none", exists=bool(total))
+        else:
+            response.update(exact=False, error_bound="estimate", estimate_source=result['source'])
+        
+        logger.info(f"✅ Conteo en {table_name} ({mode}): {total} registros")
         
         return {
             "status": "success",
             "table": table_name,
             "count": total,
-            "filters": where
+            "filters": where,
+            "cached": cached,
+            **response
         }
         
+    except QueryTimeoutError as e:
+        return _timeout_error(e, table_name)
     except Exception as e:
         logger.error(f"❌ Error contando en {table_name}: {e}")
         return {
@@ -377,6 +924,318 @@ def count_records(
         }
 
 
+def _parse_order_by(order_by: Optional[str]) -> List[tuple]:
+    """
+    Convierte "col1 DESC, col2" en [("col1", "DESC"), ("col2", "ASC")].
+    
+    Args:
+        order_by: Cláusula de ordenamiento
+    
+    Returns:
+        Lista de tuplas (columna, dirección)
+    """
+    if not order_by:
+        return []
+    
+    parsed = []
+    for part in order_by.split(','):
+        tokens = part.split()
+        if not tokens:
+            continue
+        if len(tokens) > 2 or (len(tokens) == 2 and tokens[1].upper() not in ('ASC', 'DESC')):
+            raise ValueError(f"Ordenamiento no soportado para paginación: '{part.strip()}'")
+        direction = tokens[1].upper() if len(tokens) == 2 else 'ASC'
+        parsed.append((tokens[0], direction))
+    return parsed
+
+
+def _pick_seek_key(indexes: List[Dict[str, Any]]) -> List[str]:
+    """
+    Elige la clave primaria o, si no hay, el primer índice único sin nulos.
+    
+    Args:
+        indexes: Índices devueltos por handler.get_indexes()
+    
+    Returns:
+        Lista de columnas de la clave
+    
+    Raises:
+        ValueError: Si la tabla no tiene clave primaria ni índice único
+    """
+    for index in indexes:
+        if index["primary"]:
+            return index["columns"]
+    for index in indexes:
+        if index["unique"] and not index["nullable"]:
+            return index["columns"]
+    raise ValueError("La tabla no tiene clave primaria ni índice único no nulo para paginar")
+
+
+def _query_signature(table_name: str, where: Optional[Dict[str, Any]], key: List[tuple]) -> str:
+    """Huella de la consulta para validar que un token corresponde a ella"""
+    raw = json.dumps([table_name, where or {}, key], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+
+# Tipos de la clave que JSON no conserva: nombre -> (clase, codificar, decodificar).
+# datetime va antes que date porque es una subclase.
+_TOKEN_TYPES = {
+    "datetime": (datetime.datetime, datetime.datetime.isoformat, datetime.datetime.fromisoformat),
+    "date": (datetime.date, datetime.date.isoformat, datetime.date.fromisoformat),
+    "time": (datetime.time, datetime.time.isoformat, datetime.time.fromisoformat),
+    "timedelta": (datetime.timedelta, lambda v: [v.days, v.seconds, v.microseconds],
+                  lambda v: datetime.timedelta(*v)),
+    "decimal": (Decimal, str, Decimal),
+    "bytes": ((bytes, bytearray, memoryview), lambda v: base64.b64encode(bytes(v)).decode('ascii'),
+              base64.b64decode)
+}
+
+
+def _encode_key_value(value: Any) -> Any:
+    """Valor de la clave serializable en JSON sin perder su tipo"""
+    for name, (cls, encode, _) in _TOKEN_TYPES.items():
+        if isinstance(value, cls):
+            return {"$": name, "v": encode(value)}
+    return value
+
+
+def _decode_key_value(value: Any) -> Any:
+    """Inverso de _encode_key_value"""
+    if isinstance(value, dict) and value.get("$") in _TOKEN_TYPES:
+        return _TOKEN_TYPES[value["$"]][2](value["v"])
+    return value
+
+
+def _encode_page_token(signature: str, values: List[Any]) -> str:
+    """Codifica los valores de la última fila vista en un token opaco"""
+    raw = json.dumps({"q": signature, "v": [_encode_key_value(value) for value in values]}, default=str)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def _decode_page_token(token: str, signature: str) -> List[Any]:
+    """
+    Decodifica un token de paginación.
+    
+    Raises:
+        ValueError: Si el token es inválido o pertenece a otra consulta
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+    except Exception:
+        raise ValueError("Token de paginación inválido")
+    if data.get("q") != signature:
+        raise ValueError("El token de paginación no corresponde a esta consulta")
+    return [_decode_key_value(value) for value in data["v"]]
+
+
+def _nullable_columns(schema: List[Dict[str, Any]]) -> set:
+    """Columnas que admiten NULL (en minúsculas) según get_table_schema"""
+    if schema and "Field" in schema[0]:
+        return {row["Field"].lower() for row in schema if row.get("Null") == "YES"}
+    return {row["column_name"].lower() for row in schema if row.get("is_nullable") == "YES"}
+
+
+def paginate_records(
+    table_name: str,
+    columns: Optional[List[str]] = None,
+    where: Optional[Dict[str, Any]] = None,
+    order_by: Optional[str] = None,
+    page_size: int = 100,
+    page_token: Optional[str] = None,
+    connection_name: Optional[str] = None,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Pagina registros de una tabla por clave (keyset / seek).
+    
+    Cada página continúa desde los valores de la última fila vista usando
+    la clave primaria (o un índice único) como desempate, por lo que el
+    coste de una página no depende de su profundidad.
+    
+    Args:
+        table_name: Nombre de la tabla
+        columns: Lista de columnas a seleccionar (None = todas)
+        where: Diccionario con filtros {columna: valor}
+        order_by: Ordenamiento (ej: "created_at DESC"); todas las columnas
+            deben ir en la misma dirección y ser NOT NULL. None = por clave primaria.
+        page_size: Registros por página
+        page_token: Token devuelto por la página anterior (None = primera página)
+        connection_name: Nombre de la conexión (None = usar default)
+        timeout: Segundos máximos por sentencia (None = query_timeout)
+    
+    Returns:
+        Dict con los registros de la página y next_page_token
+        
+    Example:
+        page = paginate_records("orders", where={"status": "pending"}, page_size=500)
+        paginate_records("orders", where={"status": "pending"}, page_size=500,
+                         page_token=page["next_page_token"])
+    """
+    try:
+        if page_size < 1:
+            raise ValueError("page_size debe ser mayor que 0")
+        
+        order = _parse_order_by(order_by)
+        directions = {direction for _, direction in order}
+        if len(directions) > 1:
+            raise ValueError("La paginación por clave requiere la misma dirección en todo order_by")
+        direction = directions.pop() if directions else 'ASC'
+        
+        with pooled_handler(connection_name, timeout=timeout) as handler:
+            seek_key = _pick_seek_key(get_metadata(handler, "indexes", table_name))
+            
+            # Un NULL en el token haría la comparación de la tupla NULL y la
+            # página siguiente saldría vacía: solo columnas NOT NULL
+            if order:
+                nullable = _nullable_columns(get_metadata(handler, "columns", table_name))
+                for column, _ in order:
+                    if column.lower() in nullable and column not in seek_key:
+                        raise ValueError(f"La columna {column} admite NULL y no se puede usar en order_by "
+                                         f"de la paginación por clave (filtra los NULL en una consulta aparte)")
+            
+            # Columnas de ordenamiento + clave única como desempate
+            key_columns = [column for column, _ in order]
+            key_columns += [column for column in seek_key if column not in key_columns]
+            
+            signature = _query_signature(table_name, where, [key_columns, direction])
+            
+            select_columns = list(columns) if columns else ['*']
+            if columns:
+                select_columns += [column for column in key_columns if column not in columns]
+            
+            query = f"SELECT {', '.join(select_columns)} FROM {table_name}"
+            where_clause, params = _build_where_clause(where)
+            
+            if page_token:
+                last_values = _decode_page_token(page_token, signature)
+                operator = '>' if direction == 'ASC' else '<'
+                placeholders = ', '.join(['%s'] * len(key_columns))
+                seek = f"({', '.join(key_columns)}) {operator} ({placeholders})"
+                where_clause += (" AND " if where_clause else " WHERE ") + seek
+                params = tuple(params) + tuple(last_values)
+            
+            query += where_clause
+            query += " ORDER BY " + ", ".join(f"{column} {direction}" for column in key_columns)
+            query += f" LIMIT {int(page_size) + 1}"
+            
+            records = handler.fetch_all(query, params if params else None)
+        
+        has_more = len(records) > page_size
+        records = records[:page_size]
+        
+        next_token = None
+        if has_more:
+            next_token = _encode_page_token(signature, [records[-1][column] for column in key_columns])
+        
+        if columns:
+            records = [{column: record[column] for column in columns} for record in records]
+        
+        logger.info(f"✅ Página de {len(records)} registros obtenida de {table_name}")
+        
+        return {
+            "status": "success",
+            "table": table_name,
+            "count": len(records),
+            "records": records,
+            "has_more": has_more,
+            "next_page_token": next_token,
+            "key_columns": key_columns
+        }
+        
+    except QueryTimeoutError as e:
+        return _timeout_error(e, table_name)
+    except Exception as e:
+        logger.error(f"❌ Error paginando {table_name}: {e}")
+        return {
+            "status": "error",
+            "error": str(e),
+            "table": table_name
+        }
+
+
+def get_table_schema(
+    table_name: str,
+    connection_name: Optional[str] = None,
+    database: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Obtiene columnas, clave primaria e índices de una tabla (con caché).
+    
+    Args:
+        table_name: Nombre de la tabla
+        connection_name: Nombre de la conexión (None = usar default)
+        database: Base de datos (None = la de la conexión)
+    
+    Returns:
+        Dict con columns, primary_key e indexes
+        
+    Example:
+        get_table_schema("users")
+    """
+    try:
+        with pooled_handler(connection_name, database) as handler:
+            columns = get_metadata(handler, "columns", table_name)
+            indexes = get_metadata(handler, "indexes", table_name)
+        
+        primary_key = next((index["columns"] for index in indexes if index["primary"]), [])
+        
+        return {
+            "status": "success",
+            "table": table_name,
+            "columns": columns,
+            "primary_key": primary_key,
+            "indexes": indexes
+        }
+        
+    except QueryTimeoutError as e:
+        return _timeout_error(e, table_name)
+    except Exception as e:
+        logger.error(f"❌ Error obteniendo esquema de {table_name}: {e}")
+        return {
+            "status": "error",
+            "error": str(e),
+            "table": table_name
+        }
+
+
+def refresh_schema_cache(
+    connection_name: Optional[str] = None,
+    table_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Invalida la caché de metadatos para forzar una nueva lectura del servidor.
+    
+    Args:
+        connection_name: Nombre de la conexión (None = usar default)
+        table_name: Tabla concreta (None = todas las de la conexión)
+    
+    Returns:
+        Dict con el número de entradas invalidadas
+        
+    Example:
+        refresh_schema_cache(table_name="users")
+    """
+    try:
+        name = connection_name or get_config().default_connection
+        removed = get_schema_cache().invalidate(name, table_name)
+        
+        logger.info(f"🔄 Caché de metadatos invalidada: {name} / {table_name or '*'}")
+        
+        return {
+            "status": "success",
+            "connection": name,
+            "table": table_name,
+            "entries_removed": removed
+        }
+        
+    except Exception as e:
+        logger.error(f"❌ Error invalidando caché de metadatos: {e}")
+        return {
+            "status": "error",
+            "error": str(e)
+        }
+
+
 # ============================================================================
 # UPDATE - Operaciones de UPDATE
 # ============================================================================
@@ -405,8 +1264,6 @@ def update_record(
         update_record("users", 42, {"email": "newemail@example.com", "active": 1})
     """
     try:
-        handler = _get_handler(connection_name)
-        
         # Construir SET clause
         set_parts = [f"{key} = %s" for key in data.keys()]
         set_clause = ", ".join(set_parts)
@@ -414,9 +1271,10 @@ def update_record(
         query = f"UPDATE {table_name} SET {set_clause} WHERE {id_column} = %s"
         params = tuple(list(data.values()) + [id_value])
         
-        with handler:
-            affected = handler.execute_query(query, params)
+        with pooled_handler(connection_name) as handler:
+            affected = handler.execute_prepared(query, params)
             handler.commit()
+        _invalidate_table(connection_name, table_name)
         
         if affected > 0:
             logger.info(f"✅ Registro actualizado en {table_name} ({id_column}={id_value})")
@@ -435,6 +1293,8 @@ def update_record(
                 "rows_affected": 0
             }
         
+    except QueryTimeoutError as e:
+        return _timeout_error(e, table_name)
     except Exception as e:
         logger.error(f"❌ Error actualizando {table_name}: {e}")
         return {
@@ -448,7 +1308,8 @@ def update_records(
     table_name: str,
     data: Dict[str, Any],
     where: Dict[str, Any],
-    connection_name: Optional[str] = None
+    connection_name: Optional[str] = None,
+    timeout: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Actualiza múltiples registros con filtro WHERE.
@@ -458,6 +1319,7 @@ def update_records(
         data: Diccionario con los campos a actualizar
         where: Diccionario con filtros {columna: valor}
         connection_name: Nombre de la conexión (None = usar default)
+        timeout: Segundos máximos por sentencia (None = query_timeout)
     
     Returns:
         Dict con el resultado de la actualización
@@ -472,8 +1334,6 @@ def update_records(
                 "error": "Se requiere condición WHERE para actualizar múltiples registros"
             }
         
-        handler = _get_handler(connection_name)
-        
         # Construir SET clause
         set_parts = [f"{key} = %s" for key in data.keys()]
         set_clause = ", ".join(set_parts)
@@ -484,9 +1344,10 @@ def update_records(
         query = f"UPDATE {table_name} SET {set_clause}{where_clause}"
         params = tuple(list(data.values()) + list(where_params))
         
-        with handler:
+        with pooled_handler(connection_name, timeout=timeout) as handler:
             affected = handler.execute_query(query, params)
             handler.commit()
+        _invalidate_table(connection_name, table_name)
         
         logger.info(f"✅ {affected} registros actualizados en {table_name}")
         
@@ -498,6 +1359,8 @@ def update_records(
             "filters": where
         }
         
+    except QueryTimeoutError as e:
+        return _timeout_error(e, table_name)
     except Exception as e:
         logger.error(f"❌ Error actualizando registros en {table_name}: {e}")
         return {
@@ -533,13 +1396,12 @@ def delete_record(
         delete_record("users", 42)
     """
     try:
-        handler = _get_handler(connection_name)
-        
         query = f"DELETE FROM {table_name} WHERE {id_column} = %s"
         
-        with handler:
-            affected = handler.execute_query(query, (id_value,))
+        with pooled_handler(connection_name) as handler:
+            affected = handler.execute_prepared(query, (id_value,))
             handler.commit()
+        _invalidate_table(connection_name, table_name)
         
         if affected > 0:
             logger.info(f"✅ Registro eliminado de {table_name} ({id_column}={id_value})")
@@ -557,6 +1419,8 @@ def delete_record(
                 "rows_affected": 0
             }
         
+    except QueryTimeoutError as e:
+        return _timeout_error(e, table_name)
     except Exception as e:
         logger.error(f"❌ Error eliminando de {table_name}: {e}")
         return {
@@ -570,7 +1434,8 @@ def delete_records(
     table_name: str,
     where: Dict[str, Any],
     connection_name: Optional[str] = None,
-    confirm: bool = False
+    confirm: bool = False,
+    timeout: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Elimina múltiples registros con filtro WHERE.
@@ -581,6 +1446,7 @@ def delete_records(
         where: Diccionario con filtros {columna: valor}
         connection_name: Nombre de la conexión (None = usar default)
         confirm: DEBE ser True para ejecutar la eliminación
+        timeout: Segundos máximos por sentencia (None = query_timeout)
     
     Returns:
         Dict con el resultado de la eliminación
@@ -603,29 +1469,22 @@ def delete_records(
                 "action": "Agregar confirm=True para ejecutar"
             }
         
-        handler = _get_handler(connection_name)
-        
-        # Primero contar cuántos se van a eliminar
-        count_query = f"SELECT COUNT(*) as total FROM {table_name}"
         where_clause, params = _build_where_clause(where)
-        count_query += where_clause
         
-        with handler:
-            result = handler.fetch_one(count_query, params)
-            to_delete = result['total'] if result else 0
-            
-            if to_delete == 0:
-                return {
-                    "status": "success",
-                    "message": "No se encontraron registros para eliminar",
-                    "rows_affected": 0
-                }
-            
-            # Ejecutar DELETE
+        # El DELETE ya informa de las filas afectadas: no hace falta contar antes
+        with pooled_handler(connection_name, timeout=timeout) as handler:
             delete_query = f"DELETE FROM {table_name}{where_clause}"
             affected = handler.execute_query(delete_query, params)
             handler.commit()
         
+        if affected == 0:
+            return {
+                "status": "success",
+                "message": "No se encontraron registros para eliminar",
+                "rows_affected": 0
+            }
+        _invalidate_table(connection_name, table_name)
+        
         logger.info(f"✅ {affected} registros eliminados de {table_name}")
         
         return {
@@ -635,6 +1494,8 @@ def delete_records(
             "filters": where
         }
         
+    except QueryTimeoutError as e:
+        return _timeout_error(e, table_name)
     except Exception as e:
         logger.error(f"❌ Error eliminando registros de {table_name}: {e}")
         return {
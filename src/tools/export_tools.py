@@ -0,0 +1,380 @@
+"""
+Exportación de resultados de consultas a ficheros locales.
+
+Las filas se leen con un cursor del lado del servidor y se escriben por
+grupos de row_group_size filas, de modo que la memoria usada depende del
+tamaño del grupo y no del de la tabla. Formatos: CSV, NDJSON y Parquet
+(este último requiere pyarrow). CSV y NDJSON admiten compresión gzip o
+zstd (zstd requiere el paquete zstandard).
+"""
+
+from contextlib import ExitStack, contextmanager
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import csv
+import gzip
+import io
+import itertools
+import json
+import logging
+import os
+import re
+import time
+import uuid
+
+from ..config import get_config
+from ..database.connection import QueryTimeoutError
+from . import crud_tools
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("csv", "ndjson", "parquet")
+EXPORT_COMPRESSIONS = (None, "gzip", "zstd")
+
+# Extensión que se añade a la ruta si no la trae
+_EXTENSIONS = {"csv": ".csv", "ndjson": ".ndjson", "parquet": ".parquet"}
+_COMPRESSED_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Agrupa las filas en listas de como mucho size elementos"""
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _text_value(value: Any) -> Any:
+    """Valor de una celda CSV"""
+    if value is None:
+        return ""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str, ensure_ascii=False)
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    """Serialización JSON de los tipos de los drivers"""
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    return str(value)
+
+
+def _open_binary(path: str, compression: Optional[str]):
+    """Abre el fichero de salida en binario aplicando la compresión pedida"""
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    raw = open(path, "wb")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raw.close()
+            raise ImportError("La compresión zstd requiere el paquete 'zstandard' (pip install zstandard)")
+        return zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+    return raw
+
+
+class _CountingWriter(io.RawIOBase):
+    """Cuenta los bytes sin comprimir que atraviesan el flujo de texto"""
+    
+    def __init__(self, target):
+        self.target = target
+        self.bytes = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self.bytes += len(data)
+        self.target.write(data)
+        return len(data)
+    
+    def close(self) -> None:
+        if not self.closed:
+            self.target.close()
+        super().close()
+
+
+def _write_text(path: str, format: str, compression: Optional[str],
+                batches: Iterator[List[Dict[str, Any]]], header: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Escribe CSV o NDJSON por grupos y devuelve filas y bytes sin comprimir.
+    
+    En CSV la cabecera sale de header (columnas de la tabla) y se escribe
+    aunque la consulta no devuelva filas; sin header se toma de la primera fila.
+    """
+    counter = _CountingWriter(_open_binary(path, compression))
+    rows = 0
+    with io.TextIOWrapper(io.BufferedWriter(counter, 1024 * 1024), encoding="utf-8", newline="") as out:
+        writer = None
+        if format == "csv" and header:
+            writer = csv.writer(out)
+            writer.writerow(header)
+        for batch in batches:
+            if format == "csv":
+                if writer is None:
+                    header = list(batch[0].keys())
+                    writer = csv.writer(out)
+                    writer.writerow(header)
+                writer.writerows([_text_value(row.get(column)) for column in header] for row in batch)
+            else:
+                out.write("".join(
+                    json.dumps(row, default=_json_default, ensure_ascii=False) + "\n" for row in batch
+                ))
+            rows += len(batch)
+    return {"rows": rows, "uncompressed_bytes": counter.bytes}
+
+
+def _column_types(schema: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Tipo SQL por columna desde get_table_schema (DESCRIBE de MySQL o information_schema)"""
+    if schema and "Field" in schema[0]:
+        return {row["Field"]: row["Type"].lower() for row in schema}
+    return {row["column_name"]: row["data_type"].lower() for row in schema}
+
+
+def _to_text(value: Any) -> Any:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default, ensure_ascii=False)
+    return _json_default(value)
+
+
+def _to_binary(value: Any) -> Any:
+    return bytes(value) if isinstance(value, (bytearray, memoryview)) else value
+
+
+def _arrow_column(pa, column_type: Optional[str]) -> tuple:
+    """
+    Tipo Arrow y conversión de valores para un tipo SQL.
+    
+    El tipo sale del esquema de la tabla y no de las filas, así una columna
+    toda NULL en el primer grupo o un DECIMAL con distinta precisión en cada
+    grupo no cambian el esquema del fichero. Lo que no se reconoce (o un
+    NUMERIC sin precisión) se escribe como texto.
+    """
+    t = column_type or ""
+    keep = lambda value: value
+    decimal = re.match(r"^(decimal|numeric)\((\d+),\s*(\d+)\)", t)
+    
+    if t == "boolean":
+        return pa.bool_(), keep
+    if re.match(r"^bigint\b.*unsigned", t):
+        return pa.uint64(), keep
+    if re.match(r"^(tiny|small|medium|big)?int(eger|\d+)?\b", t) or "serial" in t or t.startswith("year"):
+        return pa.int64(), keep
+    if decimal and int(decimal.group(2)) <= 38:
+        return pa.decimal128(int(decimal.group(2)), int(decimal.group(3))), keep
+    if t.startswith(("float", "double", "real")):
+        return pa.float64(), keep
+    if t.startswith("timestamp with time zone"):
+        return pa.timestamp("us", tz="UTC"), keep
+    if t.startswith(("datetime", "timestamp")):
+        return pa.timestamp("us"), keep
+    if t == "date":
+        return pa.date32(), keep
+    if t.startswith("time with"):
+        return pa.time64("us"), keep
+    if t.startswith("time"):
+        # MySQL TIME llega como timedelta (admite más de 24 horas)
+        return pa.duration("us"), keep
+    if any(name in t for name in ("blob", "binary", "bytea", "bit")):
+        return pa.binary(), _to_binary
+    return pa.string(), _to_text
+
+
+def _write_parquet(path: str, compression: Optional[str], batches: Iterator[List[Dict[str, Any]]],
+                   column_types: Dict[str, str]) -> Dict[str, int]:
+    """Escribe Parquet con un row group por lote y el esquema derivado de los tipos de la tabla"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("El formato parquet requiere el paquete 'pyarrow' (pip install pyarrow)")
+    
+    writer = None
+    rows = 0
+    try:
+        for batch in batches:
+            if writer is None:
+                columns = [(name, *_arrow_column(pa, column_types.get(name))) for name in batch[0].keys()]
+                schema = pa.schema([(name, arrow_type) for name, arrow_type, _ in columns])
+                writer = pq.ParquetWriter(path, schema, compression=compression or "snappy")
+            table = pa.Table.from_pydict(
+                {name: [convert(row.get(name)) for row in batch] for name, _, convert in columns},
+                schema=writer.schema
+            )
+            writer.write_table(table, row_group_size=len(batch))
+            rows += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        # Sin filas: fichero con el esquema de la tabla completo
+        schema = pa.schema([(name, _arrow_column(pa, column_type)[0]) for name, column_type in column_types.items()])
+        pq.write_table(schema.empty_table(), path, compression=compression or "snappy")
+    return {"rows": rows, "uncompressed_bytes": None}
+
+
+def _resolve_path(path: str, format: str, compression: Optional[str]) -> Path:
+    """
+    Ruta final: relativa a export_directory y con extensión si no la trae.
+    
+    Salvo que export_allow_absolute_paths esté activo, la ruta resuelta debe
+    quedar dentro de export_directory (ni rutas absolutas fuera de él ni "..").
+    
+    Raises:
+        PermissionError: Si la ruta sale de export_directory
+    """
+    settings = get_config().settings
+    base = Path(settings.export_directory).expanduser()
+    target = Path(path).expanduser()
+    if not target.is_absolute():
+        target = base / target
+    if not target.suffix:
+        target = target.with_suffix(_EXTENSIONS[format])
+        if compression and format != "parquet":
+            target = target.with_name(target.name + _COMPRESSED_EXTENSIONS[compression])
+    if not settings.export_allow_absolute_paths and not target.resolve().is_relative_to(base.resolve()):
+        raise PermissionError(f"La ruta {path} está fuera de export_directory ({base}); "
+                              "active export_allow_absolute_paths para permitirlo")
+    return target
+
+
+def export_query(
+    table_name: str,
+    path: str,
+    format: str = "csv",
+    columns: Optional[List[str]] = None,
+    where: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None,
+    connection_name: Optional[str] = None,
+    compression: Optional[str] = None,
+    row_group_size: Optional[int] = None,
+    overwrite: bool = False,
+    timeout: Optional[float] = None,
+    parallel: int = 0
+) -> Dict[str, Any]:
+    """
+    Exporta el resultado de un SELECT a un fichero local en streaming.
+    
+    Args:
+        table_name: Nombre de la tabla
+        path: Fichero de destino dentro de export_directory (relativo a él si no es absoluto)
+        format: "csv", "ndjson" o "parquet"
+        columns: Columnas a exportar (None = todas)
+        where: Diccionario con filtros {columna: valor}
+        limit: Número máximo de filas
+        order_by: Columna para ordenar (ej: "id ASC")
+        connection_name: Nombre de la conexión (None = usar default)
+        compression: None, "gzip" o "zstd" (en parquet es el códec de las páginas)
+        row_group_size: Filas por grupo de escritura (None = export_row_group_size)
+        overwrite: Sobrescribir el fichero si ya existe
+        timeout: Segundos máximos de la consulta (None = export_timeout)
+        parallel: Rangos de la clave primaria leídos a la vez en conexiones distintas (0 o 1 = una sola lectura)
+    
+    Returns:
+        Dict con la ruta, filas, bytes escritos y rendimiento
+    
+    Example:
+        export_query("orders", "orders_2024", format="parquet", where={"year": 2024})
+    """
+    try:
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Formato '{format}' no válido. Use uno de: {', '.join(EXPORT_FORMATS)}")
+        if compression not in EXPORT_COMPRESSIONS:
+            raise ValueError(f"Compresión '{compression}' no válida. Use gzip, zstd o ninguna")
+        
+        settings = get_config().settings
+        group_size = row_group_size or settings.export_row_group_size
+        timeout = settings.export_timeout if timeout is None else timeout
+        target = _resolve_path(path, format, compression)
+        if target.exists() and not overwrite:
+            raise FileExistsError(f"El fichero {target} ya existe (use overwrite=True)")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        
+        query, params = crud_tools._build_select(table_name, columns, where, order_by, limit)
+        column_types = None
+        if format != "ndjson":
+            # Tipos para el esquema Parquet y orden de la cabecera CSV (también sin filas)
+            with crud_tools.pooled_handler(connection_name) as handler:
+                column_types = _column_types(crud_tools.get_metadata(handler, "columns", table_name))
+            if columns:
+                column_types = {name: column_types.get(name) for name in columns}
+        # Se escribe en un temporal y se renombra al terminar: nunca queda un fichero a medias
+        partial = target.with_name(f".{target.name}.{uuid.uuid4().hex[:8]}.part")
+        
+        @contextmanager
+        def lease():
+            with crud_tools.pooled_handler(connection_name, timeout=timeout) as handler:
+                if not timeout:
+                    # Sin límite también en el servidor (reset_session restaura el de la sesión)
+                    handler.set_statement_timeout(None)
+                yield handler
+        
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                if parallel > 1:
+                    rows = crud_tools._parallel_rows(table_name, columns, where, order_by, limit,
+                                                     connection_name, parallel, lease=lease)
+                else:
+                    handler = stack.enter_context(lease())
+                    rows = handler.iter_rows(query, params if params else None, settings.stream_batch_size)
+                try:
+                    batches = _batches(rows, group_size)
+                    if format == "parquet":
+                        written = _write_parquet(str(partial), compression, batches, column_types)
+                    else:
+                        written = _write_text(str(partial), format, compression, batches,
+                                              list(column_types) if column_types else None)
+                finally:
+                    rows.close()
+            os.replace(partial, target)
+        finally:
+            if partial.exists():
+                partial.unlink()
+        elapsed = time.perf_counter() - started
+        
+        size = target.stat().st_size
+        logger.info(f"📤 {written['rows']} filas de {table_name} exportadas a {target} "
+                    f"({size} bytes, {elapsed:.2f}s)")
+        
+        return {
+            "status": "success",
+            "table": table_name,
+            "path": str(target.resolve()),
+            "format": format,
+            "compression": compression,
+            "rows": written["rows"],
+            "bytes": size,
+            "uncompressed_bytes": written["uncompressed_bytes"],
+            "row_group_size": group_size,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(written["rows"] / elapsed, 1) if elapsed > 0 else None,
+            "mb_per_second": round(size / 1048576 / elapsed, 2) if elapsed > 0 else None
+        }
+    
+    except QueryTimeoutError as e:
+        return crud_tools._timeout_error(e, table_name)
+    except Exception as e:
+        logger.error(f"❌ Error exportando {table_name}: {e}")
+        return {
+            "status": "error",
+            "error": str(e),
+            "table": table_name
+        }
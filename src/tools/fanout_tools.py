@@ -0,0 +1,346 @@
+"""
+Consultas repartidas entre varias conexiones (shards o tenants).
+
+La misma lectura se lanza a la vez contra todas las conexiones de destino
+(nombres, patrones glob o etiquetas "tag:x") con un límite de concurrencia
+por llamada y un plazo total. Los resultados se combinan: los conteos se
+suman y los SELECT con order_by se mezclan con un k-way merge, ya que cada
+conexión devuelve sus filas ordenadas (con los NULL como valor mínimo y el
+texto en colación binaria en todos los motores). La respuesta incluye la
+latencia y el estado de cada conexión; si algunas fallan el resto se
+devuelve como parcial.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import cmp_to_key
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import heapq
+import itertools
+import logging
+import re
+import time
+
+from ..config import get_config
+from ..utils.response_budget import collect_rows
+from . import crud_tools, export_tools
+
+logger = logging.getLogger(__name__)
+
+# Columna añadida a cada fila con la conexión de la que procede
+CONNECTION_COLUMN = "_connection"
+
+# Clave de concurrencia del executor para las herramientas multi-conexión
+# (no comparten el semáforo de la conexión por defecto)
+CONCURRENCY_KEY = "@fanout"
+
+# Tipos de texto cuya colación puede no coincidir con el orden de Python
+_TEXT_TYPE = re.compile(r"^((var)?char|character|(tiny|medium|long)?text|enum|set)\b")
+
+# Gravedad de la cota de error al combinar conteos
+_ERROR_BOUNDS = ("none", "lower_bound", "estimate")
+
+
+def _run_on_connections(
+    targets: List[str],
+    call: Callable[[str], Dict[str, Any]],
+    max_concurrency: Optional[int],
+    timeout: Optional[float]
+) -> Tuple[List[str], Dict[str, Dict[str, Any]]]:
+    """
+    Ejecuta call(nombre) para cada conexión de destino en paralelo.
+    
+    Las conexiones que no terminan dentro de timeout se marcan como timeout
+    (su sentencia se cancela al vencer el mismo plazo en el servidor).
+    
+    Returns:
+        Tupla (nombres resueltos, {nombre: resultado con elapsed_ms})
+    """
+    settings = get_config().settings
+    names = get_config().resolve_connections(targets)
+    workers = max(1, min(len(names), max_concurrency or settings.fanout_max_concurrency))
+    
+    def timed_call(name: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            result = call(name)
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+    
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fanout")
+    try:
+        futures = {name: executor.submit(timed_call, name) for name in names}
+        wait(futures.values(), timeout=timeout)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    results = {}
+    for name, future in futures.items():
+        if future.done() and not future.cancelled():
+            results[name] = future.result()
+        else:
+            results[name] = {"status": "error", "error_type": "timeout",
+                             "error": f"Sin respuesta tras {timeout}s", "elapsed_ms": None}
+    return names, results
+
+
+def _overall_status(results: Dict[str, Dict[str, Any]]) -> str:
+    ok = sum(1 for result in results.values() if result["status"] == "success")
+    if ok == len(results):
+        return "success"
+    return "partial" if ok else "error"
+
+
+def _shard_report(result: Dict[str, Any], **extra: Any) -> Dict[str, Any]:
+    """Resumen por conexión sin las filas"""
+    report = {"status": result["status"], "elapsed_ms": result["elapsed_ms"], **extra}
+    if result["status"] != "success":
+        report["error"] = result.get("error")
+        if result.get("error_type"):
+            report["error_type"] = result["error_type"]
+    return report
+
+
+def _compare_values(left: Any, right: Any) -> int:
+    """Compara dos valores con los NULL como valor mínimo (orden de MySQL)"""
+    if left is None or right is None:
+        return (left is not None) - (right is not None)
+    if left == right:
+        return 0
+    try:
+        return -1 if left < right else 1
+    except TypeError:
+        left, right = str(left), str(right)
+        return -1 if left < right else (1 if left > right else 0)
+
+
+def _text_columns(connection_name: str, table_name: str, timeout: Optional[float]) -> set:
+    """Columnas de texto de la tabla en una conexión (en minúsculas, desde la caché de esquema)"""
+    with crud_tools.pooled_handler(connection_name, timeout=timeout) as handler:
+        schema = crud_tools.get_metadata(handler, "columns", table_name)
+    return {name.lower() for name, column_type in export_tools._column_types(schema).items()
+            if _TEXT_TYPE.match(column_type)}
+
+
+def _shard_order_by(sort: List[tuple], dialect: str, text_columns: Iterable[str] = ()) -> Optional[str]:
+    """
+    ORDER BY de cada conexión en el mismo orden que _compare_values.
+    
+    MySQL ya ordena los NULL como valor mínimo (primero en ASC, últimos en
+    DESC); PostgreSQL hace lo contrario, así que se fija con NULLS FIRST/LAST.
+    Las columnas de texto se ordenan con una colación binaria (por punto de
+    código, como las cadenas de Python) en lugar de la colación de la
+    columna, que puede ignorar mayúsculas o acentos. Así heapq.merge recibe
+    todas las entradas en el mismo orden.
+    
+    Args:
+        sort: Ordenamiento parseado [(columna, dirección), ...]
+        dialect: Tipo de la conexión (mysql, postgres o postgresql)
+        text_columns: Columnas de texto de la tabla (en minúsculas)
+    
+    Returns:
+        Cláusula para select_records o None si no hay ordenamiento
+    """
+    if not sort:
+        return None
+    postgres = dialect.startswith("postgres")
+    text_columns = set(text_columns)
+    terms = []
+    for column, direction in sort:
+        expression = column
+        if column.lower() in text_columns and postgres:
+            expression = f'{column} COLLATE "C"'
+        elif column.lower() in text_columns:
+            expression = f"CONVERT({column} USING utf8mb4) COLLATE utf8mb4_bin"
+        term = f"{expression} {direction}"
+        if postgres:
+            term += f" NULLS {'FIRST' if direction == 'ASC' else 'LAST'}"
+        terms.append(term)
+    return ", ".join(terms)
+
+
+def _order_key(sort: List[tuple]) -> Callable[[Dict[str, Any]], Any]:
+    """Clave de ordenación para heapq.merge según [(columna, dirección), ...]"""
+    def compare(left: Dict[str, Any], right: Dict[str, Any]) -> int:
+        for column, direction in sort:
+            result = _compare_values(left.get(column), right.get(column))
+            if result:
+                return -result if direction == "DESC" else result
+        return 0
+    return cmp_to_key(compare)
+
+
+def fanout_select(
+    table_name: str,
+    targets: List[str],
+    columns: Optional[List[str]] = None,
+    where: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    max_response_bytes: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Ejecuta el mismo SELECT en varias conexiones y combina las filas.
+    
+    Con order_by cada conexión devuelve como mucho limit filas ordenadas y
+    se mezclan con un k-way merge, así el resultado es el top-limit global.
+    Sin order_by las filas se concatenan en el orden de las conexiones.
+    Cada fila lleva la columna _connection con su origen.
+    
+    Args:
+        table_name: Nombre de la tabla (igual en todas las conexiones)
+        targets: Nombres de conexión, patrones glob ("tenant_*") o etiquetas ("tag:eu")
+        columns: Columnas a seleccionar (None = todas)
+        where: Diccionario con filtros {columna: valor}
+        limit: Filas máximas del resultado combinado
+        order_by: Ordenamiento (ej: "created_at DESC, id")
+        max_concurrency: Conexiones consultadas a la vez (None = fanout_max_concurrency)
+        timeout: Plazo total en segundos (None = fanout_timeout)
+        max_response_bytes: Presupuesto de la respuesta combinada (None = global, 0 = sin límite)
+    
+    Returns:
+        Dict con las filas combinadas y el estado de cada conexión
+    
+    Example:
+        fanout_select("orders", ["tenant_*"], order_by="created_at DESC", limit=50)
+    """
+    try:
+        config = get_config()
+        settings = config.settings
+        timeout = timeout or settings.fanout_timeout
+        budget = settings.max_response_bytes if max_response_bytes is None else max_response_bytes
+        sort = crud_tools._parse_order_by(order_by)
+        
+        def call(name: str) -> Dict[str, Any]:
+            text_columns = _text_columns(name, table_name, timeout) if sort else ()
+            shard_order_by = _shard_order_by(sort, config.get_connection(name).type, text_columns)
+            return crud_tools.select_records(table_name, columns, where, limit, shard_order_by, name,
+                                             timeout=timeout, max_response_bytes=budget)
+        
+        names, results = _run_on_connections(targets, call, max_concurrency, timeout)
+        
+        shard_rows = []
+        for name in names:
+            if results[name]["status"] == "success":
+                shard_rows.append([{**record, CONNECTION_COLUMN: name} for record in results[name]["records"]])
+        
+        merged = heapq.merge(*shard_rows, key=_order_key(sort)) if sort else itertools.chain(*shard_rows)
+        if limit:
+            merged = itertools.islice(merged, limit)
+        records, truncated, size = collect_rows(merged, budget)
+        
+        status = _overall_status(results)
+        shards = {
+            name: _shard_report(result, count=len(result.get("records", [])),
+                                **({"truncated": True} if result.get("truncated") else {}))
+            for name, result in results.items()
+        }
+        failed = [name for name, result in results.items() if result["status"] != "success"]
+        truncated = truncated or any(result.get("truncated") for result in results.values())
+        
+        log = logger.warning if failed else logger.info
+        log(f"🌐 {len(records)} registros de {table_name} en {len(names) - len(failed)}/{len(names)} conexiones")
+        
+        response = {
+            "status": status,
+            "table": table_name,
+            "count": len(records),
+            "records": records,
+            "connections": len(names),
+            "failed": failed,
+            "shards": shards
+        }
+        if truncated:
+            response.update(truncated=True, max_response_bytes=budget, returned_bytes=size)
+        if status == "error":
+            response["error"] = "Todas las conexiones fallaron"
+        return response
+    
+    except Exception as e:
+        logger.error(f"❌ Error consultando {table_name} en varias conexiones: {e}")
+        return {
+            "status": "error",
+            "error": str(e),
+            "table": table_name
+        }
+
+
+def fanout_count(
+    table_name: str,
+    targets: List[str],
+    where: Optional[Dict[str, Any]] = None,
+    mode: str = "exact",
+    limit: int = 1000,
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Cuenta registros en varias conexiones y suma los resultados.
+    
+    El total es exacto solo si todas las conexiones responden con un conteo
+    exacto; si alguna falla el total es una cota inferior.
+    
+    Args:
+        table_name: Nombre de la tabla (igual en todas las conexiones)
+        targets: Nombres de conexión, patrones glob ("tenant_*") o etiquetas ("tag:eu")
+        where: Diccionario con filtros {columna: valor}
+        mode: Modo de conteo de count_records (exact, estimated, bounded, exists)
+        limit: Máximo a contar por conexión en modo bounded
+        max_concurrency: Conexiones consultadas a la vez (None = fanout_max_concurrency)
+        timeout: Plazo total en segundos (None = fanout_timeout)
+    
+    Returns:
+        Dict con el total, su cota de error y el conteo de cada conexión
+    
+    Example:
+        fanout_count("users", ["tag:tenant"], where={"active": 1})
+    """
+    try:
+        if mode not in crud_tools.COUNT_MODES:
+            raise ValueError(f"Modo de conteo no soportado: {mode}. Modos: {', '.join(crud_tools.COUNT_MODES)}")
+        timeout = timeout or get_config().settings.fanout_timeout
+        
+        def call(name: str) -> Dict[str, Any]:
+            return crud_tools.count_records(table_name, where, name, mode, limit, timeout=timeout)
+        
+        names, results = _run_on_connections(targets, call, max_concurrency, timeout)
+        ok = [result for result in results.values() if result["status"] == "success"]
+        failed = [name for name, result in results.items() if result["status"] != "success"]
+        
+        total = sum(result["count"] for result in ok)
+        error_bound = max((result["error_bound"] for result in ok), key=_ERROR_BOUNDS.index, default="none")
+        if failed and error_bound == "none":
+            error_bound = "lower_bound"
+        
+        status = _overall_status(results)
+        response = {
+            "status": status,
+            "table": table_name,
+            "count": total,
+            "mode": mode,
+            "exact": not failed and all(result["exact"] for result in ok),
+            "error_bound": error_bound,
+            "filters": where,
+            "connections": len(names),
+            "failed": failed,
+            "shards": {name: _shard_report(result, count=result.get("count")) for name, result in results.items()}
+        }
+        if mode == "exists":
+            response["exists"] = any(result["exists"] for result in ok)
+        if status == "error":
+            response["error"] = "Todas las conexiones fallaron"
+        
+        log = logger.warning if failed else logger.info
+        log(f"🌐 Conteo en {table_name} ({mode}): {total} en {len(ok)}/{len(names)} conexiones")
+        return response
+    
+    except Exception as e:
+        logger.error(f"❌ Error contando en {table_name} en varias conexiones: {e}")
+        return {
+            "status": "error",
+            "error": str(e),
+            "table": table_name
+        }
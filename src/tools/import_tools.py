@@ -0,0 +1,535 @@
+"""
+Importación de ficheros locales a tablas.
+
+El fichero (CSV/TSV o NDJSON, opcionalmente .gz o .zst) se lee en streaming
+por trozos de chunk_size filas. Cada fila se mapea a las columnas de la
+tabla y se convierte a su tipo según get_table_schema; las filas que no
+encajan van a un fichero de rechazos. Cada trozo se envía por la vía más
+rápida disponible (carga nativa o INSERT multi-fila), se confirma y se
+guarda un checkpoint con el offset alcanzado para poder reanudar.
+"""
+
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import csv
+import gzip
+import io
+import itertools
+import json
+import logging
+import os
+import re
+import time
+
+from ..config import get_config
+from ..database.connection import BulkLoadUnavailable, QueryTimeoutError
+from . import crud_tools
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "tsv", "ndjson")
+
+_FORMAT_BY_EXTENSION = {".csv": "csv", ".tsv": "tsv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "ndjson"}
+
+_TRUE = {"1", "true", "t", "yes", "y", "on"}
+_FALSE = {"0", "false", "f", "no", "n", "off"}
+
+_LENGTH = re.compile(r"\((\d+)\)")
+_INTEGER = re.compile(r"^(tiny|small|medium|big)?int(eger|\d+)?\b")
+
+
+class RejectedRow(ValueError):
+    """La fila no se puede convertir al esquema de la tabla"""
+    pass
+
+
+# ============================================================================
+# Conversión de valores según el tipo de columna
+# ============================================================================
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"{value} no es entero")
+        return int(value)
+    text = str(value).strip()
+    if text.lower() in _TRUE | _FALSE and not text.isdigit():
+        return 1 if text.lower() in _TRUE else 0
+    return int(text)
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"'{value}' no es booleano")
+
+
+def _to_decimal(value: Any) -> Decimal:
+    try:
+        return Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"'{value}' no es numérico")
+
+
+def _to_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    text = str(value).strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    return datetime.fromisoformat(text)
+
+
+def _to_date(value: Any) -> date:
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip()[:10])
+
+
+def _to_time(value: Any) -> dt_time:
+    if isinstance(value, dt_time):
+        return value
+    return dt_time.fromisoformat(str(value).strip())
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return value
+    return json.loads(value)
+
+
+def _to_bytes(value: Any) -> bytes:
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    text = str(value)
+    if text.startswith("\\x"):
+        text = text[2:]
+    return bytes.fromhex(text)
+
+
+def _converter(column_type: str) -> Tuple[Callable[[Any], Any], Optional[int]]:
+    """Función de conversión y longitud máxima para un tipo SQL (MySQL o PostgreSQL)"""
+    t = column_type.lower()
+    match = _LENGTH.search(t)
+    length = int(match.group(1)) if match else None
+    
+    if t.startswith(("tinyint(1)", "bool")):
+        return _to_bool, None
+    if _INTEGER.match(t) or "serial" in t:
+        return _to_int, None
+    if any(name in t for name in ("decimal", "numeric")):
+        return _to_decimal, None
+    if any(name in t for name in ("float", "double", "real")):
+        return float, None
+    if t.startswith(("datetime", "timestamp")):
+        return _to_datetime, None
+    if t.startswith("date"):
+        return _to_date, None
+    if t.startswith("time"):
+        return _to_time, None
+    if t.startswith("json"):
+        return _to_json, None
+    if any(name in t for name in ("blob", "binary", "bytea")):
+        return _to_bytes, None
+    if any(name in t for name in ("char", "text", "enum", "set", "uuid")):
+        return str, length if "char" in t else None
+    # Tipo desconocido: se pasa tal cual y decide el servidor
+    return (lambda value: value), None
+
+
+class _Column:
+    """Columna destino con su conversión y restricciones"""
+    
+    __slots__ = ("name", "convert", "max_length", "nullable", "has_default")
+    
+    def __init__(self, name: str, column_type: str, nullable: bool, has_default: bool):
+        self.name = name
+        self.convert, self.max_length = _converter(column_type)
+        self.nullable = nullable
+        self.has_default = has_default
+    
+    def coerce(self, value: Any) -> Any:
+        if value is None:
+            if not self.nullable and not self.has_default:
+                raise RejectedRow(f"{self.name}: NULL en columna NOT NULL")
+            return None
+        try:
+            converted = self.convert(value)
+        except (TypeError, ValueError) as e:
+            raise RejectedRow(f"{self.name}: {e}")
+        if self.max_length is not None and len(converted) > self.max_length:
+            raise RejectedRow(f"{self.name}: longitud {len(converted)} > {self.max_length}")
+        return converted
+
+
+def _table_columns(schema: List[Dict[str, Any]]) -> Dict[str, _Column]:
+    """Normaliza la salida de get_table_schema (DESCRIBE de MySQL o information_schema)"""
+    columns = {}
+    for row in schema:
+        if "Field" in row:
+            name, column_type = row["Field"], row["Type"]
+            nullable = row.get("Null") == "YES"
+            has_default = row.get("Default") is not None or "auto_increment" in (row.get("Extra") or "")
+        else:
+            name, column_type = row["column_name"], row["data_type"]
+            if row.get("character_maximum_length"):
+                column_type = f"{column_type}({row['character_maximum_length']})"
+            nullable = row.get("is_nullable") == "YES"
+            has_default = row.get("column_default") is not None
+        columns[name.lower()] = _Column(name, column_type, nullable, has_default)
+    return columns
+
+
+# ============================================================================
+# Lectura incremental con offset
+# ============================================================================
+
+class _LineSource:
+    """Itera las líneas decodificadas del flujo contando los bytes consumidos"""
+    
+    def __init__(self, binary, offset: int = 0):
+        self.binary = binary
+        self.offset = offset
+    
+    def __iter__(self) -> Iterator[str]:
+        for raw in self.binary:
+            self.offset += len(raw)
+            yield raw.decode("utf-8")
+    
+    def seek(self, offset: int) -> None:
+        """Salta a un offset del flujo descomprimido (hacia delante si no es seekable)"""
+        if self.binary.seekable():
+            self.binary.seek(offset)
+        else:
+            remaining = offset - self.offset
+            while remaining > 0:
+                data = self.binary.read(min(remaining, 1024 * 1024))
+                if not data:
+                    break
+                remaining -= len(data)
+        self.offset = offset
+
+
+def _open_source(path: Path):
+    """Abre el fichero en binario descomprimiendo según la extensión"""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    if path.suffix == ".zst":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Los ficheros .zst requieren el paquete 'zstandard' (pip install zstandard)")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True))
+    return open(path, "rb")
+
+
+def _detect_format(path: Path) -> str:
+    suffix = Path(path.stem).suffix if path.suffix in (".gz", ".zst") else path.suffix
+    format = _FORMAT_BY_EXTENSION.get(suffix.lower())
+    if format is None:
+        raise ValueError(f"No se puede deducir el formato de {path.name}; indique format={IMPORT_FORMATS}")
+    return format
+
+
+def _records(source: _LineSource, format: str, offset: int, null_value: Optional[str]) -> Iterator[Tuple[Optional[dict], Optional[str]]]:
+    """
+    Genera (registro, error) desde offset. El offset de source queda siempre
+    al final del último registro generado.
+    """
+    if format == "ndjson":
+        source.seek(offset)
+        for line in source:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield None, f"JSON inválido: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield None, "La línea no es un objeto JSON"
+                continue
+            yield record, None
+        return
+    
+    reader = csv.reader(source, delimiter="\t" if format == "tsv" else ",")
+    header = next(reader, None)
+    if header is None:
+        return
+    header[0] = header[0].lstrip("﻿")
+    if offset > source.offset:
+        source.seek(offset)
+    for values in reader:
+        if not values:
+            continue
+        if len(values) != len(header):
+            yield None, f"{len(values)} campos, se esperaban {len(header)}"
+            continue
+        yield {name: (None if value == null_value else value) for name, value in zip(header, values)}, None
+
+
+# ============================================================================
+# Checkpoint y rechazos
+# ============================================================================
+
+def _checkpoint_path(path: Path) -> Path:
+    return path.with_name(path.name + ".checkpoint.json")
+
+
+def _load_checkpoint(path: Path, table_name: str) -> Optional[Dict[str, Any]]:
+    """Checkpoint válido para este fichero y tabla (None si no hay o no coincide)"""
+    checkpoint_file = _checkpoint_path(path)
+    if not checkpoint_file.exists():
+        return None
+    checkpoint = json.loads(checkpoint_file.read_text(encoding="utf-8"))
+    stat = path.stat()
+    if (checkpoint.get("table") != table_name or checkpoint.get("size") != stat.st_size
+            or checkpoint.get("mtime") != stat.st_mtime):
+        logger.warning(f"⚠️ Checkpoint de {path.name} no corresponde al fichero actual; se empieza de cero")
+        return None
+    return checkpoint
+
+
+def _save_checkpoint(path: Path, checkpoint: Dict[str, Any]) -> None:
+    """Escribe el checkpoint de forma atómica"""
+    checkpoint_file = _checkpoint_path(path)
+    tmp = checkpoint_file.with_name(checkpoint_file.name + ".tmp")
+    tmp.write_text(json.dumps(checkpoint), encoding="utf-8")
+    os.replace(tmp, checkpoint_file)
+
+
+# ============================================================================
+# Carga
+# ============================================================================
+
+def _load_chunk(connection_name: Optional[str], table_name: str, records: List[Dict[str, Any]],
+                native: bool, max_rows: int, timeout: Optional[float]) -> Tuple[int, bool]:
+    """
+    Carga un trozo en una transacción por la vía más rápida disponible.
+    
+    Returns:
+        Tupla (filas cargadas, si la carga nativa sigue disponible)
+    """
+    loaded = 0
+    with crud_tools.pooled_handler(connection_name, timeout=timeout) as handler:
+        with handler.transaction():
+            for columns, rows in crud_tools._group_by_columns(records):
+                if native:
+                    try:
+                        loaded += handler.bulk_load(table_name, columns, rows)["rows"]
+                        continue
+                    except BulkLoadUnavailable as e:
+                        logger.info(f"ℹ️ Carga nativa no disponible, usando INSERT por lotes: {e}")
+                        native = False
+                loaded += handler.insert_many(table_name, columns, rows, max_rows)[0]
+    return loaded, native
+
+
+def _load_rows_individually(connection_name: Optional[str], table_name: str,
+                            records: List[Tuple[int, Dict[str, Any]]], timeout: Optional[float],
+                            reject: Callable[[int, str, Any], None]) -> int:
+    """
+    Carga fila a fila un trozo que el servidor rechazó, para aislar las filas culpables.
+    
+    El plazo de deadline() se aplica a cada sentencia, así que un trozo
+    grande no agota el timeout; un timeout se propaga en lugar de rechazar la fila.
+    """
+    loaded = 0
+    with crud_tools.pooled_handler(connection_name, timeout=timeout) as handler:
+        for number, record in records:
+            try:
+                handler.insert_many(table_name, list(record.keys()), [tuple(record.values())], 1)
+                handler.commit()
+                loaded += 1
+            except Exception as e:
+                if handler.is_timeout_error(e):
+                    # Cancelación por plazo vencido: no es culpa de la fila
+                    raise
+                handler.rollback()
+                reject(number, f"servidor: {e}", record)
+    return loaded
+
+
+def import_file(
+    table_name: str,
+    path: str,
+    format: Optional[str] = None,
+    connection_name: Optional[str] = None,
+    column_map: Optional[Dict[str, str]] = None,
+    chunk_size: Optional[int] = None,
+    null_value: Optional[str] = "",
+    resume: bool = True,
+    reject_path: Optional[str] = None,
+    max_rejects: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Importa un fichero CSV/TSV/NDJSON a una tabla en streaming.
+    
+    Args:
+        table_name: Tabla destino
+        path: Fichero de origen (.csv, .tsv, .ndjson/.jsonl, opcionalmente .gz o .zst)
+        format: "csv", "tsv" o "ndjson" (None = según la extensión)
+        connection_name: Nombre de la conexión (None = usar default)
+        column_map: Renombrado {campo_del_fichero: columna_de_la_tabla}
+        chunk_size: Filas por trozo confirmado (None = import_chunk_size)
+        null_value: Celda CSV que se interpreta como NULL (None = ninguna)
+        resume: Continuar desde el checkpoint si existe
+        reject_path: Fichero NDJSON de filas rechazadas (None = <path>.rejects.ndjson)
+        max_rejects: Abortar si se superan tantos rechazos (None = sin límite)
+        timeout: Segundos máximos por trozo (None = query_timeout)
+    
+    Returns:
+        Dict con filas leídas, cargadas y rechazadas, checkpoint y rendimiento
+    
+    Example:
+        import_file("orders", "data/orders.csv.gz", column_map={"order_id": "id"})
+    """
+    try:
+        source_path = Path(path).expanduser()
+        if not source_path.exists():
+            raise FileNotFoundError(f"No existe el fichero {source_path}")
+        format = format or _detect_format(source_path)
+        if format not in IMPORT_FORMATS:
+            raise ValueError(f"Formato '{format}' no válido. Use uno de: {', '.join(IMPORT_FORMATS)}")
+        
+        settings = get_config().settings
+        chunk_size = chunk_size or settings.import_chunk_size
+        rename = {key.lower(): value for key, value in (column_map or {}).items()}
+        
+        with crud_tools.pooled_handler(connection_name) as handler:
+            columns = _table_columns(crud_tools.get_metadata(handler, "columns", table_name))
+        if not columns:
+            raise ValueError(f"La tabla {table_name} no existe o no tiene columnas")
+        
+        checkpoint = _load_checkpoint(source_path, table_name) if resume else None
+        stat = source_path.stat()
+        state = checkpoint or {
+            "source": str(source_path.resolve()), "table": table_name,
+            "size": stat.st_size, "mtime": stat.st_mtime,
+            "offset": 0, "rows_read": 0, "rows_loaded": 0, "rows_rejected": 0
+        }
+        resumed_from = state["offset"] if checkpoint else None
+        
+        reject_file = Path(reject_path).expanduser() if reject_path else source_path.with_name(source_path.name + ".rejects.ndjson")
+        rejects_out = None
+        ignored = set()
+        
+        def reject(number: int, reason: str, record: Any) -> None:
+            nonlocal rejects_out
+            if rejects_out is None:
+                rejects_out = open(reject_file, "a" if checkpoint else "w", encoding="utf-8")
+            rejects_out.write(json.dumps({"record_number": number, "reason": reason, "record": record},
+                                         default=str, ensure_ascii=False) + "\n")
+            state["rows_rejected"] += 1
+            if max_rejects is not None and state["rows_rejected"] > max_rejects:
+                raise RejectedRow(f"Se superó max_rejects ({max_rejects}); importación detenida")
+        
+        def coerce(record: Dict[str, Any]) -> Dict[str, Any]:
+            row = {}
+            for field, value in record.items():
+                column = columns.get(rename.get(field.lower(), field).lower())
+                if column is None:
+                    ignored.add(field)
+                    continue
+                row[column.name] = column.coerce(value)
+            missing = [c.name for key, c in columns.items()
+                       if c.name not in row and not c.nullable and not c.has_default]
+            if missing:
+                raise RejectedRow(f"faltan columnas obligatorias: {', '.join(missing)}")
+            return row
+        
+        native = bool(settings.bulk_load_threshold)
+        chunks = 0
+        bytes_start = state["offset"]
+        rows_start = state["rows_read"]
+        started = time.perf_counter()
+        
+        try:
+            with _open_source(source_path) as binary:
+                source = _LineSource(binary)
+                records = _records(source, format, state["offset"], null_value)
+                while True:
+                    good: List[Tuple[int, Dict[str, Any]]] = []
+                    for record, error in itertools.islice(records, chunk_size):
+                        state["rows_read"] += 1
+                        number = state["rows_read"]
+                        if error:
+                            reject(number, error, None)
+                            continue
+                        try:
+                            good.append((number, coerce(record)))
+                        except RejectedRow as e:
+                            reject(number, str(e), record)
+                    if not good and source.offset == state["offset"]:
+                        break
+                    
+                    if good:
+                        try:
+                            loaded, native = _load_chunk(connection_name, table_name, [r for _, r in good],
+                                                         native, settings.bulk_insert_max_rows, timeout)
+                        except QueryTimeoutError:
+                            raise
+                        except Exception as e:
+                            # Incluye BulkLoadRejected: LOAD DATA LOCAL descarta filas con solo advertencias
+                            logger.warning(f"⚠️ Trozo rechazado por el servidor ({e}); cargando fila a fila")
+                            loaded = _load_rows_individually(connection_name, table_name, good, timeout, reject)
+                        state["rows_loaded"] += loaded
+                        chunks += 1
+                    
+                    state["offset"] = source.offset
+                    if rejects_out is not None:
+                        rejects_out.flush()
+                    _save_checkpoint(source_path, state)
+        finally:
+            if rejects_out is not None:
+                rejects_out.close()
+            crud_tools._invalidate_table(connection_name, table_name)
+        
+        elapsed = time.perf_counter() - started
+        _checkpoint_path(source_path).unlink(missing_ok=True)
+        bytes_read = state["offset"] - bytes_start
+        
+        logger.info(f"📥 {state['rows_loaded']} filas importadas en {table_name} desde {source_path.name} "
+                    f"({state['rows_rejected']} rechazadas, {elapsed:.2f}s)")
+        
+        return {
+            "status": "success",
+            "table": table_name,
+            "path": str(source_path.resolve()),
+            "format": format,
+            "rows_read": state["rows_read"],
+            "rows_loaded": state["rows_loaded"],
+            "rows_rejected": state["rows_rejected"],
+            "reject_file": str(reject_file) if state["rows_rejected"] else None,
+            "ignored_fields": sorted(ignored),
+            "chunks": chunks,
+            "method": "bulk_load" if native else "insert",
+            "resumed_from_offset": resumed_from,
+            "bytes_read": bytes_read,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round((state["rows_read"] - rows_start) / elapsed, 1) if elapsed > 0 else None
+        }
+    
+    except QueryTimeoutError as e:
+        return crud_tools._timeout_error(e, table_name)
+    except Exception as e:
+        logger.error(f"❌ Error importando {path} en {table_name}: {e}")
+        return {
+            "status": "error",
+            "error": str(e),
+            "table": table_name,
+            "checkpoint": str(_checkpoint_path(Path(path).expanduser()))
+            if _checkpoint_path(Path(path).expanduser()).exists() else None
+        }
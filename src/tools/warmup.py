@@ -0,0 +1,159 @@
+"""
+Calentamiento de conexiones al arrancar el servidor.
+
+Abre en segundo plano las conexiones del pool de cada conexión activa y
+precarga la versión del servidor y los metadatos de esquema, para que la
+primera herramienta no pague DNS, TCP, TLS y autenticación. Nunca bloquea el
+arranque: si una base de datos no responde, solo queda registrado el fallo.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+import logging
+import threading
+import time
+
+from ..config import get_config
+from . import crud_tools
+
+logger = logging.getLogger(__name__)
+
+_status: Dict[str, Dict[str, Any]] = {}
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+def _update(name: str, **fields: Any) -> None:
+    with _lock:
+        _status.setdefault(name, {}).update(fields)
+
+
+def warm_connection(name: str, connections: int, metadata_tables: int) -> Dict[str, Any]:
+    """
+    Calienta una conexión: abre `connections` handlers en paralelo y precarga metadatos.
+    
+    Args:
+        name: Nombre de la conexión
+        connections: Handlers a dejar abiertos en el pool
+        metadata_tables: Tablas de las que precargar columnas (0 = solo la lista de tablas)
+    
+    Returns:
+        Estado del calentamiento de la conexión
+    """
+    started = time.perf_counter()
+    with _lock:
+        _status[name] = {"status": "warming"}
+    pool = crud_tools.get_pool()
+    handlers = []
+    
+    try:
+        pool_key, handler_class, handler_kwargs = crud_tools._resolve_connection(name)
+        
+        # Acquire concurrente: cada hueco vacío abre su propia conexión
+        count = max(1, min(connections, pool.max_connections))
+        with ThreadPoolExecutor(max_workers=count, thread_name_prefix=f"warmup-{name}") as executor:
+            futures = [executor.submit(pool.acquire, pool_key, handler_class, None, **handler_kwargs)
+                       for _ in range(count)]
+            errors = []
+            for future in futures:
+                try:
+                    handlers.append(future.result())
+                except Exception as e:
+                    errors.append(e)
+        connected = time.perf_counter()
+        if not handlers:
+            raise errors[0]
+        
+        handler = handlers[0]
+        version_getter = getattr(handler, "get_server_version", None)
+        version = version_getter() if version_getter else None
+        tables = crud_tools.get_metadata(handler, "tables")
+        for table in tables[:metadata_tables]:
+            crud_tools.get_metadata(handler, "columns", table)
+        finished = time.perf_counter()
+        
+        _update(
+            name,
+            status="ready" if not errors else "partial",
+            connections_opened=len(handlers),
+            connect_ms=_ms(connected - started),
+            metadata_ms=_ms(finished - connected),
+            total_ms=_ms(finished - started),
+            server_version=version,
+            tables=len(tables),
+            tables_with_columns=min(len(tables), metadata_tables),
+            error=str(errors[0]) if errors else None
+        )
+        logger.info(f"🔥 Conexión {name} calentada en {_ms(finished - started)} ms "
+                    f"({len(handlers)} conexiones, {len(tables)} tablas)")
+    
+    except Exception as e:
+        _update(name, status="failed", total_ms=_ms(time.perf_counter() - started),
+                connections_opened=len(handlers), error=str(e))
+        logger.warning(f"⚠️ No se pudo calentar la conexión {name}: {e}")
+    
+    finally:
+        for handler in handlers:
+            pool.release(handler.pool_name, handler)
+    
+    with _lock:
+        return dict(_status[name])
+
+
+def start_warmup(connections: Optional[int] = None, metadata_tables: Optional[int] = None) -> Optional[threading.Thread]:
+    """
+    Lanza el calentamiento de todas las conexiones activas en un hilo de fondo.
+    
+    Args:
+        connections: Handlers por conexión (None = pool_min_idle, mínimo 1)
+        metadata_tables: Tablas con columnas precargadas (None = warmup_metadata_tables)
+    
+    Returns:
+        Hilo lanzado, o None si no hay conexiones activas o ya estaba en marcha
+    
+    Example:
+        start_warmup()
+        get_warmup_status()
+    """
+    global _thread
+    config = get_config()
+    settings = config.settings
+    names = [name for name, conn in config.list_connections().items() if conn["active"]]
+    if not names or (_thread is not None and _thread.is_alive()):
+        return None
+    
+    connections = max(1, settings.pool_min_idle if connections is None else connections)
+    metadata_tables = settings.warmup_metadata_tables if metadata_tables is None else metadata_tables
+    for name in names:
+        _update(name, status="pending")
+    
+    def run() -> None:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="warmup") as executor:
+            for name in names:
+                executor.submit(warm_connection, name, connections, metadata_tables)
+        logger.info(f"🔥 Calentamiento terminado en {_ms(time.perf_counter() - started)} ms")
+    
+    _thread = threading.Thread(target=run, name="connection-warmup", daemon=True)
+    _thread.start()
+    logger.info(f"🔥 Calentando {len(names)} conexiones en segundo plano: {', '.join(names)}")
+    return _thread
+
+
+def get_warmup_status() -> Dict[str, Any]:
+    """
+    Estado del calentamiento por conexión.
+    
+    Returns:
+        Dict con "running" y el estado, latencias y errores de cada conexión
+    """
+    with _lock:
+        connections = {name: dict(status) for name, status in _status.items()}
+    return {
+        "running": _thread is not None and _thread.is_alive(),
+        "connections": connections
+    }
@@ -0,0 +1,102 @@
+"""
+Ejecución de herramientas bloqueantes fuera del event loop de FastMCP.
+Las llamadas a los drivers (pymysql / psycopg2) son síncronas: se ejecutan
+en un ThreadPoolExecutor acotado y, por conexión, nunca hay más llamadas
+simultáneas que conexiones en su pool.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Obtiene el executor global para herramientas bloqueantes (singleton).
+    
+    Returns:
+        ThreadPoolExecutor: Executor con executor_max_workers hilos
+    """
+    global _executor
+    if _executor is None:
+        from ..config import get_config
+        with _lock:
+            if _executor is None:
+                workers = get_config().settings.executor_max_workers
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-tool")
+                logger.info(f"Executor de herramientas inicializado (workers: {workers})")
+    return _executor
+
+
+def _get_semaphore(connection_name: Optional[str]) -> asyncio.Semaphore:
+    """Semáforo que limita las llamadas simultáneas a una conexión a su pool_size"""
+    from ..config import get_config
+    config = get_config()
+    name = connection_name or config.default_connection or ""
+    semaphore = _semaphores.get(name)
+    if semaphore is None:
+        semaphore = _semaphores.setdefault(name, asyncio.Semaphore(config.settings.pool_size))
+    return semaphore
+
+
+async def run_blocking(func: Callable[..., Any], *args, concurrency_key: Optional[str] = None,
+                       **kwargs) -> Any:
+    """
+    Ejecuta una función bloqueante en el executor sin parar el event loop.
+    
+    Args:
+        func: Función síncrona a ejecutar
+        *args: Argumentos posicionales
+        concurrency_key: Conexión usada por la función (limita la concurrencia)
+        **kwargs: Argumentos con nombre
+    
+    Returns:
+        El resultado de func
+    """
+    loop = asyncio.get_running_loop()
+    async with _get_semaphore(concurrency_key):
+        return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def offload(func: Optional[Callable[..., Any]] = None, *,
+            concurrency_key: Optional[str] = None) -> Callable[..., Any]:
+    """
+    Decorador que convierte una herramienta síncrona en async ejecutándola
+    con run_blocking. Si la función tiene parámetro connection_name, se usa
+    para limitar la concurrencia por conexión; las herramientas que no usan
+    una sola conexión indican su propia clave con concurrency_key.
+    
+    Example:
+        @mcp.tool()
+        @offload
+        def select_records(table_name: str, connection_name: Optional[str] = None) -> dict:
+            ...
+        
+        @mcp.tool()
+        @offload(concurrency_key="@fanout")
+        def fanout_select_records(table_name: str, targets: list) -> dict:
+            ...
+    """
+    if func is None:
+        return functools.partial(offload, concurrency_key=concurrency_key)
+    
+    signature = inspect.signature(func)
+    
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = concurrency_key
+        if key is None:
+            key = signature.bind_partial(*args, **kwargs).arguments.get("connection_name")
+        return await run_blocking(func, *args, concurrency_key=key, **kwargs)
+    
+    return wrapper
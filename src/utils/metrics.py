@@ -0,0 +1,506 @@
+"""
+Métricas de latencia de herramientas MCP y de llamadas a los handlers.
+
+Cada serie (tipo, nombre, conexión) guarda un histograma log-lineal estilo
+HDR (error relativo < 7%, memoria proporcional a los rangos usados), el
+número de errores y las filas/bytes devueltos. Se exponen con la herramienta
+get_metrics y, opcionalmente, en formato de texto Prometheus en un fichero
+o un puerto HTTP local.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+
+from .response_budget import estimate_row_bytes
+from .slow_query_log import observe_statement
+
+logger = logging.getLogger(__name__)
+
+# Sub-buckets por potencia de 2 (precisión de 1/16 sobre el valor)
+_SUB_BITS = 4
+_SUB_COUNT = 1 << _SUB_BITS
+
+# Límites de los buckets acumulados en la exportación Prometheus (segundos)
+_PROMETHEUS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Tipos de serie y nombre de la etiqueta de su operación
+KINDS = {"tool": "tool", "query": "operation"}
+
+
+class LatencyHistogram:
+    """
+    Histograma log-lineal de latencias en microsegundos.
+    
+    Los valores menores que 2 * 16 µs se guardan exactos; por encima, cada
+    potencia de 2 se divide en 16 sub-buckets. Los contadores son un dict
+    disperso indexado por bucket.
+    """
+    
+    __slots__ = ("counts", "count", "total", "min", "max")
+    
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+    
+    @staticmethod
+    def _index(micros: int) -> int:
+        """Bucket de un valor en microsegundos"""
+        if micros < 2 * _SUB_COUNT:
+            return micros
+        shift = micros.bit_length() - _SUB_BITS - 1
+        return 2 * _SUB_COUNT + (shift - 1) * _SUB_COUNT + (micros >> shift) - _SUB_COUNT
+    
+    @staticmethod
+    def _upper_bound(index: int) -> int:
+        """Mayor valor en microsegundos que cae en el bucket"""
+        if index < 2 * _SUB_COUNT:
+            return index
+        shift = (index - 2 * _SUB_COUNT) // _SUB_COUNT + 1
+        lower = ((index - 2 * _SUB_COUNT) % _SUB_COUNT + _SUB_COUNT) << shift
+        return lower + (1 << shift) - 1
+    
+    def record(self, seconds: float) -> None:
+        """Registra una latencia en segundos"""
+        index = self._index(max(0, int(seconds * 1_000_000)))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Latencia (segundos) bajo la que queda la fracción indicada de muestras.
+        
+        Args:
+            fraction: Entre 0 y 1 (0.99 = p99)
+        
+        Returns:
+            Límite superior del bucket, acotado al mínimo y máximo observados
+        """
+        if not self.count:
+            return None
+        rank = max(1, int(fraction * self.count + 0.999999))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return max(self.min, min(self._upper_bound(index) / 1_000_000, self.max))
+        return self.max
+    
+    def cumulative(self, bounds: Tuple[float, ...]) -> List[int]:
+        """Muestras menores o iguales a cada límite (segundos), para buckets Prometheus"""
+        result = []
+        ordered = sorted(self.counts.items())
+        for bound in bounds:
+            limit = bound * 1_000_000
+            result.append(sum(count for index, count in ordered if self._upper_bound(index) <= limit))
+        return result
+    
+    def summary(self) -> Dict[str, Any]:
+        """Resumen en milisegundos"""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 3) if value is not None else None
+        
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.total / self.count) if self.count else None,
+            "min_ms": ms(self.min),
+            "p50_ms": ms(self.percentile(0.50)),
+            "p90_ms": ms(self.percentile(0.90)),
+            "p99_ms": ms(self.percentile(0.99)),
+            "max_ms": ms(self.max),
+        }
+
+
+class _Series:
+    """Métricas de una operación en una conexión"""
+    
+    __slots__ = ("histogram", "errors", "rows", "bytes")
+    
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+
+
+class MetricsRegistry:
+    """
+    Registro de series de latencia por (tipo, operación, conexión).
+    
+    Example:
+        registry = get_metrics_registry()
+        registry.observe("query", "fetch_all", "mysql_local", 0.012, rows=40)
+        registry.snapshot()["query"]["fetch_all"]["mysql_local"]["p99_ms"]
+    """
+    
+    def __init__(self):
+        self._series: Dict[Tuple[str, str, str], _Series] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+    
+    def observe(self, kind: str, name: str, connection: Optional[str], seconds: float,
+                error: bool = False, rows: int = 0, nbytes: int = 0) -> None:
+        """
+        Registra una ejecución.
+        
+        Args:
+            kind: "tool" o "query"
+            name: Herramienta u operación del handler
+            connection: Nombre de la conexión ("" si no aplica)
+            seconds: Duración
+            error: Si terminó con error
+            rows: Filas devueltas o afectadas
+            nbytes: Bytes de la respuesta (solo herramientas)
+        """
+        key = (kind, name, connection or "")
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.histogram.record(seconds)
+            series.errors += error
+            series.rows += rows
+            series.bytes += nbytes
+    
+    def snapshot(self, kind: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Copia de las métricas agrupadas por tipo, operación y conexión.
+        
+        Args:
+            kind: Filtrar por "tool" o "query" (None = todos)
+        
+        Returns:
+            {tipo: {operación: {conexión: {count, p50_ms, ..., errors, rows[, bytes]}}}}
+        """
+        result: Dict[str, Any] = {name: {} for name in KINDS if kind in (None, name)}
+        with self._lock:
+            for (series_kind, name, connection), series in self._series.items():
+                if series_kind not in result:
+                    continue
+                entry = {**series.histogram.summary(), "errors": series.errors, "rows": series.rows}
+                if series_kind == "tool":
+                    entry["bytes"] = series.bytes
+                result[series_kind].setdefault(name, {})[connection or "-"] = entry
+        return result
+    
+    def to_prometheus(self) -> str:
+        """Métricas en formato de texto de exposición de Prometheus"""
+        lines: List[str] = []
+        with self._lock:
+            items = sorted(self._series.items())
+            for kind, label in KINDS.items():
+                series_of_kind = [(key, series) for key, series in items if key[0] == kind]
+                if not series_of_kind:
+                    continue
+                
+                prefix = f"mcp_{kind}"
+                lines.append(f"# HELP {prefix}_duration_seconds Latencia por {label} y conexión")
+                lines.append(f"# TYPE {prefix}_duration_seconds histogram")
+                for (_, name, connection), series in series_of_kind:
+                    labels = f'{label}="{_escape_label(name)}",connection="{_escape_label(connection)}"'
+                    histogram = series.histogram
+                    for bound, count in zip(_PROMETHEUS_BUCKETS, histogram.cumulative(_PROMETHEUS_BUCKETS)):
+                        lines.append(f'{prefix}_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f'{prefix}_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{prefix}_duration_seconds_sum{{{labels}}} {histogram.total:.6f}")
+                    lines.append(f"{prefix}_duration_seconds_count{{{labels}}} {histogram.count}")
+                
+                counters = ("errors", "rows", "bytes") if kind == "tool" else ("errors", "rows")
+                for counter in counters:
+                    lines.append(f"# TYPE {prefix}_{counter}_total counter")
+                    for (_, name, connection), series in series_of_kind:
+                        labels = f'{label}="{_escape_label(name)}",connection="{_escape_label(connection)}"'
+                        lines.append(f"{prefix}_{counter}_total{{{labels}}} {getattr(series, counter)}")
+        return "\n".join(lines) + "\n"
+    
+    def reset(self) -> None:
+        """Descarta todas las series"""
+        with self._lock:
+            self._series.clear()
+            self.started_at = time.time()
+
+
+def _escape_label(value: str) -> str:
+    """Escapa un valor de etiqueta Prometheus"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Instancia global del registro
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Obtiene el registro global de métricas (singleton).
+    
+    Returns:
+        MetricsRegistry: Instancia del registro
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
+
+
+def _result_size(result: Any) -> Tuple[int, int]:
+    """
+    Filas y bytes aproximados de la respuesta de una herramienta.
+    
+    No vuelve a serializar la respuesta: usa el tamaño que ya calculó la
+    herramienta (returned_bytes o el informe bytes del formato columnar) y
+    si no lo estima fila a fila con estimate_row_bytes.
+    """
+    if not isinstance(result, dict):
+        return 0, 0
+    rows = result.get("count", result.get("records_count", result.get("rows_affected", 0)))
+    report = result.get("bytes")
+    if isinstance(result.get("returned_bytes"), int):
+        nbytes = result["returned_bytes"]
+    elif isinstance(report, dict) and isinstance(report.get("columnar"), int):
+        nbytes = report["columnar"]
+    elif isinstance(result.get("records"), list):
+        nbytes = sum(estimate_row_bytes(record) for record in result["records"] if isinstance(record, dict))
+    elif isinstance(result.get("record"), dict):
+        nbytes = estimate_row_bytes(result["record"])
+    else:
+        nbytes = estimate_row_bytes(result)
+    return (rows if isinstance(rows, int) else 0), nbytes
+
+
+def timed_tool(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Decorador que mide una herramienta MCP (síncrona o async).
+    
+    Cuenta como error tanto una excepción como una respuesta con
+    status "error". La conexión se toma del argumento connection_name.
+    
+    Example:
+        @mcp.tool()
+        @timed_tool
+        @offload
+        def select_records(table_name: str, connection_name: Optional[str] = None) -> dict:
+            ...
+    """
+    signature = inspect.signature(func)
+    name = func.__name__
+    
+    def record(started: float, result: Any, failed: bool, args, kwargs) -> None:
+        elapsed = time.perf_counter() - started
+        connection = signature.bind_partial(*args, **kwargs).arguments.get("connection_name")
+        if connection is None and "connection_name" in signature.parameters:
+            from ..config import get_config
+            connection = get_config().default_connection
+        rows, nbytes = _result_size(result)
+        error = failed or (isinstance(result, dict) and result.get("status") == "error")
+        get_metrics_registry().observe("tool", name, connection, elapsed, error, rows, nbytes)
+    
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result, failed = None, True
+            try:
+                result = await func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                record(started, result, failed, args, kwargs)
+        return async_wrapper
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        result, failed = None, True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            record(started, result, failed, args, kwargs)
+    return wrapper
+
+
+def _handler_connection(handler: Any) -> str:
+    """Nombre de conexión de un handler (pool o host:puerto)"""
+    return handler.cache_scope.split('/')[0]
+
+
+def _rows_of(operation: str, result: Any) -> int:
+    """Filas devueltas o afectadas por una llamada del handler"""
+    if operation == "bulk_load" and isinstance(result, dict):
+        return result.get("rows") or 0
+    if isinstance(result, int) and not isinstance(result, bool):
+        return result
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return 1
+    return 0
+
+
+# Operaciones cuyo primer argumento es la sentencia SQL (pasan por el registro de consultas lentas)
+_STATEMENT_OPERATIONS = {
+    "execute_query", "fetch_one", "fetch_all", "iter_rows",
+    "execute_many", "execute_prepared", "fetch_one_prepared"
+}
+
+
+def _finish(handler: Any, operation: str, args: tuple, kwargs: Dict[str, Any], seconds: float,
+            error: Optional[BaseException], rows: int) -> None:
+    """Registra una llamada del handler en las métricas y en el registro de consultas lentas"""
+    get_metrics_registry().observe("query", operation, _handler_connection(handler), seconds, error is not None, rows)
+    
+    if operation in _STATEMENT_OPERATIONS and args and isinstance(args[0], str):
+        params = args[1] if len(args) > 1 else kwargs.get("params", kwargs.get("params_list"))
+        observe_statement(handler, operation, args[0], params, seconds, rows, error)
+
+
+def timed(operation: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorador para métodos de DatabaseHandler.
+    
+    Registra la latencia en las métricas y pasa las sentencias SQL al
+    registro de consultas lentas. En generadores (iter_rows) mide desde la
+    primera fila hasta agotarlo o cerrarlo y cuenta las filas producidas.
+    También delimita la sentencia para el plazo de handler.deadline()
+    (statement_started / statement_finished).
+    
+    Args:
+        operation: Nombre de la operación en las métricas
+    
+    Example:
+        @timed("fetch_all")
+        def fetch_all(self, query, params=None): ...
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(self, *args, **kwargs) -> Iterator[Any]:
+                started = time.perf_counter()
+                rows, error = 0, None
+                inner = func(self, *args, **kwargs)
+                self.statement_started()
+                try:
+                    for row in inner:
+                        rows += 1
+                        yield row
+                except GeneratorExit:
+                    raise
+                except Exception as e:
+                    error = e
+                    raise
+                finally:
+                    # Cerrar el generador interno ya: libera el cursor si el consumidor paró antes
+                    try:
+                        inner.close()
+                    finally:
+                        self.statement_finished()
+                    _finish(self, operation, args, kwargs, time.perf_counter() - started, error, rows)
+            return generator_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            started = time.perf_counter()
+            result, error = None, None
+            self.statement_started()
+            try:
+                result = func(self, *args, **kwargs)
+                return result
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self.statement_finished()
+                _finish(self, operation, args, kwargs, time.perf_counter() - started,
+                        error, _rows_of(operation, result))
+        return wrapper
+    return decorator
+
+
+# ============================================================================
+# Exportación Prometheus
+# ============================================================================
+
+def write_prometheus_file(path: str) -> None:
+    """Escribe las métricas en un fichero de forma atómica (para node_exporter textfile)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(get_metrics_registry().to_prometheus())
+    os.replace(tmp_path, path)
+
+
+def _metrics_request_handler() -> type:
+    """
+    Handler HTTP que sirve /metrics en formato Prometheus.
+    
+    http.server solo se importa si se activa el exportador por puerto.
+    """
+    from http.server import BaseHTTPRequestHandler
+    
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = get_metrics_registry().to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            # stdout lo usa el transporte stdio de MCP
+            logger.debug(f"metrics http: {format % args}")
+    
+    return MetricsRequestHandler
+
+
+def start_prometheus_exporter(file_path: Optional[str] = None, port: Optional[int] = None,
+                              interval: float = 15) -> None:
+    """
+    Arranca la exportación en hilos de fondo.
+    
+    Args:
+        file_path: Fichero que se reescribe cada interval segundos (opcional)
+        port: Puerto local en el que servir /metrics (opcional)
+        interval: Segundos entre escrituras del fichero
+    """
+    if file_path:
+        def write_loop() -> None:
+            while True:
+                try:
+                    write_prometheus_file(file_path)
+                except OSError as e:
+                    logger.warning(f"⚠️ No se pudo escribir {file_path}: {e}")
+                time.sleep(interval)
+        
+        threading.Thread(target=write_loop, name="metrics-file", daemon=True).start()
+        logger.info(f"📈 Métricas Prometheus en {file_path} (cada {interval}s)")
+    
+    if port:
+        from http.server import ThreadingHTTPServer
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", port), _metrics_request_handler())
+        except OSError as e:
+            # El exportador es opcional: un puerto ocupado no debe parar el servidor MCP
+            logger.warning(f"⚠️ No se pudo abrir el puerto {port} para las métricas: {e}")
+            return
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info(f"📈 Métricas Prometheus en http://127.0.0.1:{port}/metrics")
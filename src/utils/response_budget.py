@@ -0,0 +1,148 @@
+"""
+Presupuesto de bytes para respuestas de consultas.
+
+Las filas se consumen de un iterador (cursor del lado del servidor) sumando
+su tamaño JSON estimado; al superar el presupuesto se deja de leer, de modo
+que el handler puede cerrar o cancelar el cursor sin traer el resto. Si la
+respuesta queda truncada se acompaña de un resumen por columna calculado en
+una sola pasada sobre las filas devueltas.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import heapq
+
+# Valores mínimos de hash que conserva el estimador de distintos (KMV)
+_DISTINCT_SKETCH_SIZE = 256
+
+_HASH_SPACE = float(2 ** 64)
+
+
+def estimate_value_bytes(value: Any) -> int:
+    """Tamaño aproximado de un valor serializado en JSON"""
+    if value is None:
+        return 4
+    if isinstance(value, bool):
+        return 5
+    if isinstance(value, (int, float)):
+        return len(repr(value))
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value) * 2 + 2
+    return len(str(value)) + 2
+
+
+def estimate_row_bytes(row: Dict[str, Any]) -> int:
+    """Tamaño aproximado de una fila serializada como objeto JSON"""
+    # {"clave": valor, ...}: comillas, dos puntos, espacio y coma por columna
+    return 2 + sum(len(key) + 6 + estimate_value_bytes(value) for key, value in row.items())
+
+
+def collect_rows(rows: Iterable[Dict[str, Any]], max_bytes: Optional[int]) -> Tuple[List[Dict[str, Any]], bool, int]:
+    """
+    Consume filas hasta agotar el iterador o superar el presupuesto.
+    
+    La fila que haría superar el presupuesto no se incluye. El llamador debe
+    cerrar el iterador para liberar el cursor.
+    
+    Args:
+        rows: Iterador de filas
+        max_bytes: Presupuesto en bytes (None o 0 = sin límite)
+    
+    Returns:
+        Tupla (filas, si se truncó, bytes estimados de las filas devueltas)
+    
+    Example:
+        records, truncated, size = collect_rows(handler.iter_rows(query), 1_000_000)
+    """
+    records: List[Dict[str, Any]] = []
+    total = 0
+    if not max_bytes:
+        for row in rows:
+            records.append(row)
+        return records, False, 0
+    
+    for row in rows:
+        size = estimate_row_bytes(row)
+        if total + size > max_bytes:
+            return records, True, total
+        total += size
+        records.append(row)
+    return records, False, total
+
+
+class _ColumnStats:
+    """Mínimo, máximo, nulos y estimación de distintos de una columna"""
+    
+    __slots__ = ("nulls", "min", "max", "comparable", "hashes", "seen")
+    
+    def __init__(self):
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.comparable = True
+        # Montículo de máximos (negados) con los menores hashes vistos
+        self.hashes: List[int] = []
+        self.seen = set()
+    
+    def add(self, value: Any) -> None:
+        if value is None:
+            self.nulls += 1
+            return
+        
+        if self.comparable:
+            try:
+                if self.min is None or value < self.min:
+                    self.min = value
+                if self.max is None or value > self.max:
+                    self.max = value
+            except TypeError:
+                self.comparable = False
+                self.min = self.max = None
+        
+        digest = int.from_bytes(hashlib.blake2b(repr(value).encode(), digest_size=8).digest(), "big")
+        if digest in self.seen:
+            return
+        if len(self.hashes) < _DISTINCT_SKETCH_SIZE:
+            heapq.heappush(self.hashes, -digest)
+            self.seen.add(digest)
+        elif digest < -self.hashes[0]:
+            self.seen.discard(-heapq.heappushpop(self.hashes, -digest))
+            self.seen.add(digest)
+    
+    def distinct_estimate(self) -> int:
+        if len(self.hashes) < _DISTINCT_SKETCH_SIZE:
+            return len(self.hashes)
+        # Estimador KMV: (k - 1) / k-ésimo menor hash normalizado
+        return int((_DISTINCT_SKETCH_SIZE - 1) / (-self.hashes[0] / _HASH_SPACE))
+    
+    def to_dict(self, rows: int) -> Dict[str, Any]:
+        return {
+            "min": self.min,
+            "max": self.max,
+            "null_count": self.nulls,
+            "non_null_count": rows - self.nulls,
+            "distinct_estimate": self.distinct_estimate(),
+            "distinct_exact": len(self.hashes) < _DISTINCT_SKETCH_SIZE
+        }
+
+
+def summarize_columns(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Resumen por columna en una sola pasada sobre las filas.
+    
+    Args:
+        records: Lista de diccionarios
+    
+    Returns:
+        Dict columna -> min, max, null_count, non_null_count y distinct_estimate
+        (exacto hasta 256 distintos, estimación KMV por encima)
+    """
+    if not records:
+        return {}
+    stats = {column: _ColumnStats() for column in records[0]}
+    for record in records:
+        for column, column_stats in stats.items():
+            column_stats.add(record.get(column))
+    return {column: column_stats.to_dict(len(records)) for column, column_stats in stats.items()}
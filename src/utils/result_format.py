@@ -0,0 +1,200 @@
+"""
+Formatos de respuesta para resultados de consultas.
+
+"rows" devuelve una lista de diccionarios (una clave por columna en cada
+fila). "columnar" devuelve los nombres de columna una sola vez y las filas
+como arrays, con dos codificaciones opcionales por columna:
+
+- dictionary: columnas de texto con pocos valores distintos; cada celda es
+  el índice de su valor en la lista `values`.
+- delta: columnas enteras no decrecientes (claves autoincrementales); la
+  primera celda lleva el valor absoluto y las siguientes la diferencia con
+  la anterior.
+"""
+
+from typing import Any, Dict, List, Optional
+import json
+
+RESULT_FORMATS = ("rows", "columnar")
+
+# Máximo de valores distintos para codificar una columna con diccionario
+_DICTIONARY_MAX_VALUES = 256
+
+# Filas mínimas para que compense codificar una columna
+_ENCODE_MIN_ROWS = 8
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _dictionary_encode(values: List[Any]) -> Optional[Dict[str, Any]]:
+    """Índices y lista de valores si la columna es de texto y de baja cardinalidad"""
+    distinct: Dict[str, int] = {}
+    for value in values:
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            return None
+        if value not in distinct:
+            if len(distinct) >= _DICTIONARY_MAX_VALUES:
+                return None
+            distinct[value] = len(distinct)
+    if not distinct or len(distinct) * 2 > len(values):
+        return None
+    return {
+        "values": list(distinct),
+        "cells": [None if value is None else distinct[value] for value in values]
+    }
+
+
+def _delta_encode(values: List[Any]) -> Optional[List[int]]:
+    """Diferencias sucesivas si la columna es entera, sin nulos y no decreciente"""
+    if not all(_is_int(value) for value in values):
+        return None
+    if any(current < previous for previous, current in zip(values, values[1:])):
+        return None
+    return [values[0]] + [current - previous for previous, current in zip(values, values[1:])]
+
+
+def to_columnar(records: List[Dict[str, Any]], encode: bool = True) -> Dict[str, Any]:
+    """
+    Convierte filas en formato columnar.
+    
+    Args:
+        records: Lista de diccionarios con las mismas claves
+        encode: Aplicar codificación por diccionario y delta cuando compense
+    
+    Returns:
+        Dict con columns, rows y encodings (solo las columnas codificadas)
+    
+    Example:
+        to_columnar([{"id": 1, "status": "ok"}, {"id": 2, "status": "ok"}])
+        # {"columns": ["id", "status"], "rows": [[1, "ok"], [2, "ok"]], "encodings": {}}
+    """
+    columns = list(records[0].keys()) if records else []
+    encodings: Dict[str, Dict[str, Any]] = {}
+    
+    if encode and len(records) >= _ENCODE_MIN_ROWS:
+        cells_by_column = []
+        for column in columns:
+            values = [record.get(column) for record in records]
+            dictionary = _dictionary_encode(values)
+            if dictionary is not None:
+                encodings[column] = {"type": "dictionary", "values": dictionary["values"]}
+                cells_by_column.append(dictionary["cells"])
+                continue
+            deltas = _delta_encode(values)
+            if deltas is not None:
+                encodings[column] = {"type": "delta"}
+                cells_by_column.append(deltas)
+                continue
+            cells_by_column.append(values)
+        rows = [list(row) for row in zip(*cells_by_column)]
+    else:
+        rows = [[record.get(column) for column in columns] for record in records]
+    
+    return {"columns": columns, "rows": rows, "encodings": encodings}
+
+
+def from_columnar(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Reconstruye la lista de diccionarios a partir de una respuesta columnar.
+    
+    Args:
+        payload: Dict con columns, rows y encodings
+    
+    Returns:
+        Lista de diccionarios
+    """
+    columns = payload["columns"]
+    encodings = payload.get("encodings") or {}
+    rows = [list(row) for row in payload["rows"]]
+    
+    for index, column in enumerate(columns):
+        encoding = encodings.get(column)
+        if not encoding:
+            continue
+        if encoding["type"] == "dictionary":
+            values = encoding["values"]
+            for row in rows:
+                if row[index] is not None:
+                    row[index] = values[row[index]]
+        elif encoding["type"] == "delta":
+            total = 0
+            for row in rows:
+                total += row[index]
+                row[index] = total
+    
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def check_format(format: str) -> None:
+    """
+    Valida el nombre de formato.
+    
+    Raises:
+        ValueError: Si el formato no es válido
+    """
+    if format not in RESULT_FORMATS:
+        raise ValueError(f"Formato '{format}' no válido. Use uno de: {', '.join(RESULT_FORMATS)}")
+
+
+def format_records(records: List[Dict[str, Any]], format: str = "rows") -> Dict[str, Any]:
+    """
+    Construye la parte de la respuesta con los registros en el formato pedido.
+    
+    Args:
+        records: Lista de diccionarios
+        format: "rows" (lista de diccionarios) o "columnar"
+    
+    Returns:
+        Dict con records, o con format, columns, rows, encodings y bytes
+        (tamaño JSON en formato rows, en columnar y bytes ahorrados)
+    
+    Raises:
+        ValueError: Si el formato no es válido
+    """
+    check_format(format)
+    if format == "rows":
+        return {"records": records}
+    
+    columnar = to_columnar(records)
+    return {
+        "format": "columnar",
+        **columnar,
+        "bytes": _bytes_report(_json_size(records), _json_size(columnar))
+    }
+
+
+def format_record(record: Dict[str, Any], format: str = "rows") -> Dict[str, Any]:
+    """
+    Igual que format_records para un único registro.
+    
+    Returns:
+        Dict con record, o con format, columns, row y bytes
+    """
+    check_format(format)
+    if format == "rows":
+        return {"record": record}
+    
+    columnar = {"columns": list(record.keys()), "row": list(record.values())}
+    return {
+        "format": "columnar",
+        **columnar,
+        "bytes": _bytes_report(_json_size(record), _json_size(columnar))
+    }
+
+
+def _bytes_report(rows_bytes: int, columnar_bytes: int) -> Dict[str, Any]:
+    """Tamaño JSON en ambos formatos y bytes ahorrados"""
+    return {
+        "rows_format": rows_bytes,
+        "columnar": columnar_bytes,
+        "saved": rows_bytes - columnar_bytes,
+        "saved_pct": round((rows_bytes - columnar_bytes) * 100 / rows_bytes, 1) if rows_bytes else 0.0
+    }
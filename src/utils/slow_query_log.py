@@ -0,0 +1,293 @@
+"""
+Registro de consultas lentas.
+
+Las sentencias que superan slow_query_threshold_ms se guardan normalizadas
+(literales sustituidos por ?) junto con la forma de los parámetros, la
+duración, las filas y la conexión, en un buffer circular acotado y en un
+fichero rotativo (una línea JSON por consulta). De los SELECT se captura el
+plan con EXPLAIN en formato JSON en segundo plano, usando otra conexión del
+pool. Con log_queries activo, además se registra cada sentencia en el log.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Logger dedicado al fichero rotativo (no se propaga al log general)
+_file_logger = logging.getLogger("mcp.slow_queries")
+_file_logger.propagate = False
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\$\d+")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_ROW = r"\(\s*\?(?:\s*,\s*\?)*\s*\)"
+_VALUES_ROWS = re.compile(rf"({_ROW})(?:\s*,\s*{_ROW})+")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+
+# Longitud máxima del SQL normalizado que se guarda
+_MAX_SQL_LENGTH = 4000
+
+# Segundos máximos esperando una conexión libre para el EXPLAIN
+_EXPLAIN_POOL_TIMEOUT = 5
+
+
+def normalize_sql(query: str) -> str:
+    """
+    Normaliza una consulta para agrupar las que solo difieren en valores.
+    
+    Args:
+        query: SQL original
+    
+    Returns:
+        SQL con literales y marcadores como ?, listas IN y filas VALUES colapsadas
+    
+    Example:
+        normalize_sql("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'x'")
+        # "SELECT * FROM t WHERE id IN (?+) AND name = ?"
+    """
+    sql = _STRING_LITERAL.sub("?", query)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (?+)", sql)
+    sql = _VALUES_ROWS.sub(r"\1, ...", sql)
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    return sql if len(sql) <= _MAX_SQL_LENGTH else sql[:_MAX_SQL_LENGTH] + " ..."
+
+
+def params_shape(params: Any) -> Optional[str]:
+    """
+    Describe los parámetros sin incluir sus valores.
+    
+    Returns:
+        Tipos de los parámetros, p. ej. "(int, str)", o "500 x (int, str)" en lotes
+    """
+    if params is None:
+        return None
+    if isinstance(params, list):
+        if not params:
+            return "0 x ()"
+        return f"{len(params)} x {params_shape(params[0])}"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in params.items()) + "}"
+    if isinstance(params, (tuple, set)):
+        return "(" + ", ".join(type(value).__name__ for value in params) + ")"
+    return type(params).__name__
+
+
+class SlowQueryLog:
+    """
+    Buffer circular de consultas lentas con volcado a fichero rotativo.
+    
+    Example:
+        log = get_slow_query_log()
+        log.entries(limit=10)
+    """
+    
+    def __init__(self, max_entries: int = 200, file_path: Optional[str] = None,
+                 file_max_bytes: int = 10 * 1024 * 1024, file_backups: int = 5):
+        """
+        Inicializa el registro.
+        
+        Args:
+            max_entries: Consultas lentas conservadas en memoria
+            file_path: Fichero rotativo (None = solo memoria)
+            file_max_bytes: Tamaño a partir del cual se rota el fichero
+            file_backups: Ficheros rotados que se conservan
+        """
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+        self._explainer: Optional[ThreadPoolExecutor] = None
+        self.file_path = file_path
+        self.total_recorded = 0
+        self.plans_captured = 0
+        self.plans_failed = 0
+        
+        if file_path and not _file_logger.handlers:
+            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(file_path, maxBytes=file_max_bytes,
+                                          backupCount=file_backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _file_logger.addHandler(handler)
+            _file_logger.setLevel(logging.INFO)
+    
+    def record(self, handler: Any, operation: str, query: str, params: Any, seconds: float,
+               rows: int, error: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Añade una consulta lenta y, si es un SELECT, programa la captura del plan.
+        
+        Args:
+            handler: Handler que ejecutó la consulta
+            operation: Método del handler (fetch_all, execute_query...)
+            query: SQL original
+            params: Parámetros (solo se guarda su forma)
+            seconds: Duración
+            rows: Filas devueltas o afectadas
+            error: Mensaje de error si la sentencia falló
+        
+        Returns:
+            La entrada registrada
+        """
+        sql = normalize_sql(query)
+        explainable = bool(_EXPLAINABLE.match(query)) and bool(getattr(handler, "pool_name", None))
+        entry = {
+            "timestamp": time.time(),
+            "connection": handler.cache_scope.split('/')[0],
+            "operation": operation,
+            "fingerprint": hashlib.md5(sql.encode("utf-8")).hexdigest()[:16],
+            "sql": sql,
+            "params_shape": params_shape(params),
+            "duration_ms": round(seconds * 1000, 3),
+            "rows": rows,
+            "error": error,
+            "plan_status": "pending" if explainable else "not_applicable",
+            "plan": None
+        }
+        
+        with self._lock:
+            self._entries.append(entry)
+            self.total_recorded += 1
+        
+        logger.warning(f"🐢 Consulta lenta ({entry['duration_ms']} ms) en {entry['connection']}: {sql[:200]}")
+        
+        if explainable:
+            self._get_explainer().submit(self._capture_plan, entry, handler, query, params)
+        else:
+            self._write(entry)
+        return entry
+    
+    def _get_explainer(self) -> ThreadPoolExecutor:
+        """Hilo propio para los EXPLAIN, para no ocupar el executor de herramientas"""
+        if self._explainer is None:
+            with self._lock:
+                if self._explainer is None:
+                    self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        return self._explainer
+    
+    def _capture_plan(self, entry: Dict[str, Any], handler: Any, query: str, params: Any) -> None:
+        """Ejecuta EXPLAIN en otra conexión del mismo pool y guarda el plan en la entrada"""
+        from ..database.connection import get_connection_pool
+        
+        try:
+            pool = get_connection_pool()
+            with pool.connection(handler.pool_name, type(handler), timeout=_EXPLAIN_POOL_TIMEOUT) as explainer:
+                entry["plan"] = explainer.explain_plan(query, params)
+            entry["plan_status"] = "captured"
+            self.plans_captured += 1
+        except Exception as e:
+            entry["plan_status"] = f"failed: {e}"
+            self.plans_failed += 1
+            logger.debug(f"No se pudo capturar el plan de {entry['fingerprint']}: {e}")
+        self._write(entry)
+    
+    def _write(self, entry: Dict[str, Any]) -> None:
+        """Vuelca la entrada al fichero rotativo"""
+        if self.file_path:
+            _file_logger.info(json.dumps(entry, default=str, ensure_ascii=False))
+    
+    def entries(self, limit: int = 50, connection_name: Optional[str] = None,
+                min_duration_ms: float = 0, include_plans: bool = True) -> List[Dict[str, Any]]:
+        """
+        Consultas lentas registradas, de la más reciente a la más antigua.
+        
+        Args:
+            limit: Máximo de entradas
+            connection_name: Filtrar por conexión (opcional)
+            min_duration_ms: Duración mínima
+            include_plans: Incluir el plan capturado
+        
+        Returns:
+            Lista de entradas
+        """
+        with self._lock:
+            snapshot = list(self._entries)
+        
+        result = []
+        for entry in reversed(snapshot):
+            if connection_name and entry["connection"] != connection_name:
+                continue
+            if entry["duration_ms"] < min_duration_ms:
+                continue
+            result.append(entry if include_plans else {k: v for k, v in entry.items() if k != "plan"})
+            if len(result) >= limit:
+                break
+        return result
+    
+    def clear(self) -> int:
+        """Vacía el buffer en memoria. Devuelve las entradas eliminadas"""
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+        return removed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Estadísticas del registro"""
+        with self._lock:
+            buffered = len(self._entries)
+        return {
+            "buffered": buffered,
+            "max_entries": self._entries.maxlen,
+            "total_recorded": self.total_recorded,
+            "plans_captured": self.plans_captured,
+            "plans_failed": self.plans_failed,
+            "file": self.file_path
+        }
+
+
+# Instancia global del registro
+_slow_query_log: Optional[SlowQueryLog] = None
+_lock = threading.Lock()
+
+
+def get_slow_query_log() -> SlowQueryLog:
+    """
+    Obtiene el registro global de consultas lentas (singleton) configurado
+    según ServerSettings.
+    
+    Returns:
+        SlowQueryLog: Instancia del registro
+    """
+    global _slow_query_log
+    if _slow_query_log is None:
+        from ..config import get_config
+        with _lock:
+            if _slow_query_log is None:
+                settings = get_config().settings
+                _slow_query_log = SlowQueryLog(
+                    settings.slow_query_log_size,
+                    settings.slow_query_log_file or None,
+                    settings.slow_query_log_max_bytes,
+                    settings.slow_query_log_backups
+                )
+    return _slow_query_log
+
+
+def observe_statement(handler: Any, operation: str, query: str, params: Any, seconds: float,
+                      rows: int, error: Optional[BaseException] = None) -> None:
+    """
+    Punto de entrada desde la instrumentación de los handlers.
+    
+    Registra la sentencia en el log si log_queries está activo y en el
+    registro de consultas lentas si supera slow_query_threshold_ms.
+    """
+    from ..config import get_config
+    settings = get_config().settings
+    
+    if settings.log_queries:
+        logger.info(f"🧾 {operation} {seconds * 1000:.1f} ms | {handler.cache_scope} | {normalize_sql(query)[:500]}")
+    
+    threshold = settings.slow_query_threshold_ms
+    if threshold and seconds * 1000 >= threshold and not query.lstrip()[:7].upper() == "EXPLAIN":
+        get_slow_query_log().record(handler, operation, query, params, seconds, rows,
+                                    str(error) if error else None)
@@ -1,6 +1,8 @@
 """
 Script para probar las herramientas MCP directamente
 """
+import asyncio
+
 from src.server import (
     test_server,
     get_server_info,
@@ -29,14 +31,14 @@ print(f"  Estado: {info['status']}")
 
 # 3. Listar bases de datos
 print("\n[3] Bases de datos disponibles:")
-dbs = list_databases()
+dbs = asyncio.run(list_databases())
 print(f"  Total: {len(dbs['databases'])}")
 for i, db in enumerate(dbs['databases'], 1):
     print(f"    {i:2d}. {db}")
 
 # 4. Listar tablas de una base de datos
 print("\n[4] Tablas en 'test_mcp_health':")
-tables = list_tables(database_name='test_mcp_health')
+tables = asyncio.run(list_tables(database='test_mcp_health'))
 if tables['status'] == 'success':
     print(f"  Total tablas: {len(tables['tables'])}")
     for table in tables['tables']:
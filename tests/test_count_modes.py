@@ -0,0 +1,104 @@
+"""
+Pruebas de los modos de count_records: consulta generada y cota de error.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+
+from src.config import get_config
+from src.tools import crud_tools
+
+
+class _CountHandler:
+    """Handler que devuelve un total fijo y guarda las consultas"""
+    
+    def __init__(self, total=0, statistics=None, explain=None):
+        self.total = total
+        self.statistics = statistics
+        self.explain = explain
+        self.queries = []
+    
+    def fetch_one(self, query, params=None):
+        self.queries.append((query, params))
+        return {"total": self.total}
+    
+    def estimate_row_count(self, table_name):
+        return self.statistics
+    
+    def explain_row_estimate(self, query, params=None):
+        self.queries.append((query, params))
+        return self.explain
+
+
+@pytest.fixture
+def use_handler(monkeypatch):
+    monkeypatch.setattr(get_config().settings, "result_cache_enabled", False)
+    
+    def use(handler):
+        @contextmanager
+        def pooled_handler(connection_name=None, database=None, timeout=None):
+            yield handler
+        monkeypatch.setattr(crud_tools, "pooled_handler", pooled_handler)
+        return handler
+    return use
+
+
+def test_exact(use_handler):
+    handler = use_handler(_CountHandler(total=42))
+    
+    result = crud_tools.count_records("users", where={"active": 1})
+    
+    assert handler.queries == [("SELECT COUNT(*) as total FROM users WHERE active = %s", (1,))]
+    assert (result["count"], result["exact"], result["error_bound"]) == (42, True, "none")
+
+
+@pytest.mark.parametrize("total, exact, error_bound", [(10, False, "lower_bound"), (7, True, "none")])
+def test_bounded(use_handler, total, exact, error_bound):
+    handler = use_handler(_CountHandler(total=total))
+    
+    result = crud_tools.count_records("events", mode="bounded", limit=10)
+    
+    assert handler.queries[0][0] == ("SELECT COUNT(*) as total FROM "
+                                     "(SELECT 1 FROM events LIMIT 10) AS bounded")
+    assert (result["count"], result["exact"], result["error_bound"]) == (total, exact, error_bound)
+
+
+@pytest.mark.parametrize("total, exists, exact, error_bound", [(1, True, False, "lower_bound"),
+                                                                (0, False, True, "none")])
+def test_exists(use_handler, total, exists, exact, error_bound):
+    handler = use_handler(_CountHandler(total=total))
+    
+    result = crud_tools.count_records("events", where={"type": "click"}, mode="exists")
+    
+    assert handler.queries[0][0] == "SELECT 1 as total FROM events WHERE type = %s LIMIT 1"
+    assert (result["exists"], result["exact"], result["error_bound"]) == (exists, exact, error_bound)
+
+
+def test_estimated_uses_statistics_without_filters(use_handler):
+    handler = use_handler(_CountHandler(statistics=1500, explain=99))
+    
+    result = crud_tools.count_records("events", mode="estimated")
+    
+    assert handler.queries == []
+    assert (result["count"], result["estimate_source"], result["error_bound"]) == (1500, "table_statistics", "estimate")
+
+
+@pytest.mark.parametrize("where, statistics", [({"type": "click"}, 1500), (None, None)])
+def test_estimated_falls_back_to_explain(use_handler, where, statistics):
+    handler = use_handler(_CountHandler(statistics=statistics, explain=99))
+    
+    result = crud_tools.count_records("events", where=where, mode="estimated")
+    
+    assert len(handler.queries) == 1
+    assert (result["count"], result["estimate_source"], result["exact"]) == (99, "explain", False)
+
+
+@pytest.mark.parametrize("mode, limit, message", [("fast", 1000, "no soportado"), ("bounded", 0, "limit")])
+def test_invalid_arguments(use_handler, mode, limit, message):
+    use_handler(_CountHandler())
+    
+    result = crud_tools.count_records("events", mode=mode, limit=limit)
+    
+    assert result["status"] == "error"
+    assert message in result["error"]
@@ -0,0 +1,108 @@
+"""
+Pruebas del plazo en cliente de DatabaseHandler.deadline().
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.database import connection
+from src.database.connection import DatabaseHandler, QueryTimeoutError
+from src.utils.metrics import timed
+
+
+class SleepHandler(DatabaseHandler):
+    """Handler sin servidor: fetch_one duerme params[0] segundos salvo que se cancele"""
+    
+    def __init__(self, cancel_delay: float = 0):
+        super().__init__("fake", 0, "test", "", "test")
+        self.cancel_delay = cancel_delay
+        self.cancels = []
+        self._interrupt = threading.Event()
+    
+    def connect(self):
+        self._is_connected = True
+    
+    def disconnect(self):
+        self._is_connected = False
+    
+    @timed("fetch_one")
+    def fetch_one(self, query, params=None):
+        if self._interrupt.wait(params[0]):
+            self._interrupt.clear()
+            raise RuntimeError("interrupted")
+        return {"slept": params[0]}
+    
+    def execute_query(self, query, params=None):
+        return 0
+    
+    def fetch_all(self, query, params=None):
+        return []
+    
+    def begin_transaction(self):
+        pass
+    
+    def commit(self):
+        pass
+    
+    def rollback(self):
+        pass
+    
+    def get_last_insert_id(self):
+        return None
+    
+    def cancel(self):
+        time.sleep(self.cancel_delay)
+        self.cancels.append(time.monotonic())
+        self._interrupt.set()
+    
+    def _is_timeout_error(self, error):
+        return "interrupted" in str(error)
+
+
+@pytest.fixture(autouse=True)
+def no_grace(monkeypatch):
+    monkeypatch.setattr(connection, "_CANCEL_GRACE", 0)
+
+
+def test_deadline_applies_per_statement():
+    handler = SleepHandler()
+    handler.connect()
+    with handler.deadline(0.3):
+        for _ in range(4):
+            handler.fetch_one("SELECT SLEEP(%s)", (0.15,))
+    assert handler.cancels == []
+
+
+def test_slow_statement_is_cancelled():
+    handler = SleepHandler()
+    handler.connect()
+    started = time.monotonic()
+    with pytest.raises(QueryTimeoutError):
+        with handler.deadline(0.2):
+            handler.fetch_one("SELECT SLEEP(%s)", (5,))
+    assert len(handler.cancels) == 1
+    assert time.monotonic() - started < 2
+
+
+def test_exit_waits_for_running_cancel():
+    handler = SleepHandler(cancel_delay=0.3)
+    handler.connect()
+    with handler.deadline(0.2):
+        # La sentencia termina sola mientras la cancelación ya está en curso
+        handler.fetch_one("SELECT SLEEP(%s)", (0.25,))
+    left = time.monotonic()
+    assert len(handler.cancels) == 1
+    assert handler.cancels[0] <= left
+    time.sleep(0.4)
+    assert len(handler.cancels) == 1
+
+
+def test_no_cancel_after_block_ends():
+    handler = SleepHandler()
+    handler.connect()
+    with handler.deadline(0.2):
+        handler.fetch_one("SELECT SLEEP(%s)", (0.05,))
+    time.sleep(0.4)
+    assert handler.cancels == []
@@ -0,0 +1,138 @@
+"""
+Pruebas de export_tools: rutas de salida, cabecera CSV y esquema Parquet.
+"""
+
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import gzip
+
+import pytest
+
+from src.config import get_config
+from src.tools import crud_tools, export_tools
+from src.tools.export_tools import _arrow_column, _column_types, _resolve_path, _write_parquet, _write_text
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    settings = get_config().settings
+    monkeypatch.setattr(settings, "export_directory", str(tmp_path / "exports"))
+    monkeypatch.setattr(settings, "export_allow_absolute_paths", False)
+    return tmp_path / "exports"
+
+
+def test_relative_path_goes_to_export_directory(export_dir):
+    target = _resolve_path("orders", "csv", "gzip")
+    assert target == export_dir / "orders.csv.gz"
+    assert _resolve_path("2024/orders.parquet", "parquet", None) == export_dir / "2024" / "orders.parquet"
+
+
+def test_absolute_path_inside_export_directory_is_allowed(export_dir):
+    assert _resolve_path(str(export_dir / "a.csv"), "csv", None) == export_dir / "a.csv"
+
+
+@pytest.mark.parametrize("path", ["/etc/passwd", "../outside.csv", "sub/../../outside.csv"])
+def test_paths_outside_export_directory_are_rejected(export_dir, path):
+    with pytest.raises(PermissionError):
+        _resolve_path(path, "csv", None)
+
+
+def test_absolute_paths_allowed_by_setting(export_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(get_config().settings, "export_allow_absolute_paths", True)
+    assert _resolve_path(str(tmp_path / "other.csv"), "csv", None) == tmp_path / "other.csv"
+
+
+def test_column_types_from_mysql_and_postgres_schemas():
+    mysql = [{"Field": "id", "Type": "INT(11)"}, {"Field": "price", "Type": "decimal(10,2)"}]
+    postgres = [{"column_name": "id", "data_type": "integer"}]
+    assert _column_types(mysql) == {"id": "int(11)", "price": "decimal(10,2)"}
+    assert _column_types(postgres) == {"id": "integer"}
+
+
+def test_csv_empty_result_keeps_header(tmp_path):
+    path = tmp_path / "empty.csv.gz"
+    
+    written = _write_text(str(path), "csv", "gzip", iter([]), ["id", "name"])
+    
+    assert written["rows"] == 0
+    assert gzip.open(path, "rt", newline="").read() == "id,name\r\n"
+
+
+def test_csv_header_follows_given_columns(tmp_path):
+    path = tmp_path / "out.csv"
+    _write_text(str(path), "csv", None, iter([[{"name": "ana", "id": 1}]]), ["id", "name"])
+    assert path.read_text() == "id,name\n1,ana\n"
+
+
+class _EmptyRows:
+    def __iter__(self):
+        return iter(())
+    
+    def close(self):
+        pass
+
+
+class _ExportHandler:
+    cache_scope = "export/empty"
+    
+    def get_table_schema(self, table_name):
+        return [{"Field": "id", "Type": "int(11)"}, {"Field": "name", "Type": "varchar(20)"}]
+    
+    def set_statement_timeout(self, seconds):
+        pass
+    
+    def iter_rows(self, query, params=None, batch_size=None):
+        return _EmptyRows()
+
+
+@pytest.mark.parametrize("columns, header", [(None, "id,name"), (["name"], "name")])
+def test_export_query_without_rows_writes_csv_header(export_dir, monkeypatch, columns, header):
+    @contextmanager
+    def pooled_handler(connection_name=None, database=None, timeout=None):
+        yield _ExportHandler()
+    monkeypatch.setattr(crud_tools, "pooled_handler", pooled_handler)
+    
+    result = export_tools.export_query("users", "empty", format="csv", columns=columns, where={"id": -1})
+    
+    assert result["status"] == "success"
+    assert result["rows"] == 0
+    assert (export_dir / "empty.csv").read_text().splitlines() == [header]
+
+
+def test_parquet_schema_comes_from_table_not_first_batch(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    
+    column_types = {"id": "int(11)", "note": "varchar(20)", "price": "decimal(10,2)",
+                    "created": "datetime", "day": "date", "span": "time", "meta": "json"}
+    first = [{"id": 1, "note": None, "price": Decimal("1.5"), "created": None, "day": None,
+              "span": None, "meta": None}]
+    second = [{"id": 2, "note": "x", "price": Decimal("12345.25"), "created": datetime(2024, 1, 1),
+               "day": date(2024, 1, 2), "span": timedelta(hours=30), "meta": {"a": 1}}]
+    path = tmp_path / "out.parquet"
+    
+    written = _write_parquet(str(path), None, iter([first, second]), column_types)
+    
+    table = pq.read_table(path)
+    assert written["rows"] == 2
+    assert table.schema.field("note").type == pa.string()
+    assert table.schema.field("price").type == pa.decimal128(10, 2)
+    assert table.column("meta").to_pylist() == [None, '{"a": 1}']
+
+
+def test_parquet_empty_result_keeps_schema(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "empty.parquet"
+    _write_parquet(str(path), None, iter([]), {"id": "bigint", "name": "text"})
+    assert pq.read_table(path).schema.names == ["id", "name"]
+
+
+def test_arrow_column_types():
+    pa = pytest.importorskip("pyarrow")
+    assert _arrow_column(pa, "interval")[0] == pa.string()
+    assert _arrow_column(pa, "bigint(20) unsigned")[0] == pa.uint64()
+    assert _arrow_column(pa, "numeric")[0] == pa.string()
+    assert _arrow_column(pa, "time without time zone")[0] == pa.time64("us")
+    assert _arrow_column(pa, "timestamp with time zone")[0] == pa.timestamp("us", tz="UTC")
@@ -0,0 +1,142 @@
+"""
+Pruebas de fanout_tools: mezcla ordenada de varias conexiones con el orden
+de los NULL de cada motor y el texto en colación binaria, y clave de
+concurrencia propia en el executor.
+"""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+import asyncio
+import re
+
+import pytest
+
+from src.config import get_config
+from src.tools import crud_tools, fanout_tools
+from src.tools.fanout_tools import _shard_order_by
+from src.utils import executor
+
+SHARDS = {
+    "my": ("mysql", [{"id": 1, "score": 5, "name": "b"}, {"id": 2, "score": None, "name": "A"},
+                     {"id": 3, "score": 1, "name": "a"}]),
+    "pg": ("postgres", [{"id": 4, "score": None, "name": "B"}, {"id": 5, "score": 3, "name": "c"},
+                        {"id": 6, "score": 7, "name": "C"}]),
+}
+
+SCHEMAS = {
+    "mysql": [{"Field": "id", "Type": "int(11)"}, {"Field": "score", "Type": "int(11)"},
+              {"Field": "name", "Type": "varchar(20)"}],
+    "postgres": [{"column_name": "id", "data_type": "integer"}, {"column_name": "score", "data_type": "integer"},
+                 {"column_name": "name", "data_type": "character varying"}],
+}
+
+
+def _engine_sort(rows, order_by, dialect):
+    """
+    Ordena como el motor: NULLS FIRST/LAST explícito o el orden por defecto
+    del dialecto, y el texto sin distinguir mayúsculas (utf8mb4_0900_ai_ci,
+    es_ES...) salvo que se pida una colación binaria.
+    """
+    column = re.match(r"(?:CONVERT\()?(\w+)", order_by).group(1)
+    descending = " DESC" in order_by
+    if "NULLS" in order_by:
+        nulls_first = "NULLS FIRST" in order_by
+    else:
+        nulls_first = descending if dialect == "postgres" else not descending
+    binary = "COLLATE" in order_by
+    
+    def key(row):
+        value = row[column]
+        return value.casefold() if isinstance(value, str) and not binary else value
+    
+    present = sorted((row for row in rows if row[column] is not None), key=key, reverse=descending)
+    missing = [row for row in rows if row[column] is None]
+    return missing + present if nulls_first else present + missing
+
+
+@pytest.fixture
+def shards(monkeypatch):
+    config = get_config()
+    monkeypatch.setattr(config, "resolve_connections", lambda targets: list(SHARDS))
+    monkeypatch.setattr(config, "get_connection", lambda name=None: SimpleNamespace(type=SHARDS[name][0]))
+    
+    @contextmanager
+    def pooled_handler(connection_name=None, database=None, timeout=None):
+        dialect = SHARDS[connection_name][0]
+        yield SimpleNamespace(cache_scope=f"fanout/{connection_name}",
+                              get_table_schema=lambda table_name: SCHEMAS[dialect])
+    
+    def select_records(table_name, columns, where, limit, order_by, connection_name, **kwargs):
+        dialect, rows = SHARDS[connection_name]
+        return {"status": "success", "records": _engine_sort(rows, order_by, dialect)[:limit]}
+    
+    monkeypatch.setattr(crud_tools, "pooled_handler", pooled_handler)
+    monkeypatch.setattr(crud_tools, "select_records", select_records)
+
+
+@pytest.mark.parametrize("dialect, expected", [
+    ("mysql", "score DESC, id ASC"),
+    ("postgres", "score DESC NULLS LAST, id ASC NULLS FIRST"),
+    ("postgresql", "score DESC NULLS LAST, id ASC NULLS FIRST"),
+])
+def test_shard_order_by_places_nulls_as_minimum(dialect, expected):
+    assert _shard_order_by([("score", "DESC"), ("id", "ASC")], dialect) == expected
+    assert _shard_order_by([], dialect) is None
+
+
+@pytest.mark.parametrize("dialect, expected", [
+    ("mysql", "CONVERT(name USING utf8mb4) COLLATE utf8mb4_bin ASC, id DESC"),
+    ("postgres", 'name COLLATE "C" ASC NULLS FIRST, id DESC NULLS LAST'),
+])
+def test_shard_order_by_sorts_text_by_code_point(dialect, expected):
+    assert _shard_order_by([("name", "ASC"), ("id", "DESC")], dialect, {"name"}) == expected
+
+
+@pytest.mark.parametrize("direction, expected", [
+    ("ASC", ["A", "B", "C", "a", "b", "c"]),
+    ("DESC", ["c", "b", "a", "C", "B", "A"]),
+])
+def test_fanout_select_merges_mixed_case_text(shards, direction, expected):
+    result = fanout_tools.fanout_select("scores", ["*"], order_by=f"name {direction}", limit=10)
+    
+    assert [record["name"] for record in result["records"]] == expected
+
+
+@pytest.mark.parametrize("direction, expected", [
+    ("ASC", [2, 4, 3]),
+    ("DESC", [6, 1, 5]),
+])
+def test_fanout_select_merges_mixed_dialects(shards, direction, expected):
+    result = fanout_tools.fanout_select("scores", ["*"], order_by=f"score {direction}", limit=3)
+    
+    assert result["status"] == "success"
+    assert [record["id"] for record in result["records"]] == expected
+
+
+def test_fanout_select_returns_all_rows_in_global_order(shards):
+    result = fanout_tools.fanout_select("scores", ["*"], order_by="score", limit=10)
+    
+    scores = [record["score"] for record in result["records"]]
+    assert scores == [None, None, 1, 3, 5, 7]
+
+
+def test_offload_uses_explicit_concurrency_key(monkeypatch):
+    keys = []
+    
+    async def run_blocking(func, *args, concurrency_key=None, **kwargs):
+        keys.append(concurrency_key)
+        return func(*args, **kwargs)
+    
+    monkeypatch.setattr(executor, "run_blocking", run_blocking)
+    
+    @executor.offload(concurrency_key=fanout_tools.CONCURRENCY_KEY)
+    def fanout_tool(table_name, targets):
+        return "fanout"
+    
+    @executor.offload
+    def single_tool(table_name, connection_name=None):
+        return "single"
+    
+    assert asyncio.run(fanout_tool("t", ["*"])) == "fanout"
+    assert asyncio.run(single_tool("t", connection_name="pg")) == "single"
+    assert keys == [fanout_tools.CONCURRENCY_KEY, "pg"]
@@ -0,0 +1,177 @@
+"""
+Pruebas de las funciones puras de import_tools: conversión de tipos,
+lectura con offsets y reanudación, y aislamiento de filas.
+"""
+
+from contextlib import contextmanager
+from datetime import date, datetime, time
+from decimal import Decimal
+import gzip
+import json
+
+import pytest
+
+from src.tools import crud_tools, import_tools
+from src.tools.import_tools import RejectedRow, _Column, _converter, _LineSource, _open_source, _records
+
+
+@pytest.mark.parametrize("column_type, raw, expected", [
+    ("int(11)", "42", 42),
+    ("bigint(20) unsigned", "7", 7),
+    ("integer", "-3", -3),
+    ("int4", "5", 5),
+    ("bigserial", "9", 9),
+    ("tinyint(1)", "true", True),
+    ("boolean", "0", False),
+    ("numeric(10,2)", "1.50", Decimal("1.50")),
+    ("double precision", "2.5", 2.5),
+    ("timestamp without time zone", "2024-01-02T03:04:05Z", datetime.fromisoformat("2024-01-02T03:04:05+00:00")),
+    ("datetime", "2024-01-02 03:04:05", datetime(2024, 1, 2, 3, 4, 5)),
+    ("date", "2024-01-02", date(2024, 1, 2)),
+    ("time", "03:04:05", time(3, 4, 5)),
+    ("jsonb", '{"a": 1}', {"a": 1}),
+    ("bytea", "\\x00ff", b"\x00\xff"),
+    ("varchar(10)", "abc", "abc"),
+])
+def test_converter(column_type, raw, expected):
+    convert, _ = _converter(column_type)
+    assert convert(raw) == expected
+
+
+@pytest.mark.parametrize("column_type", ["interval", "point", "interval day to second"])
+def test_converter_does_not_treat_int_prefixed_types_as_integers(column_type):
+    convert, _ = _converter(column_type)
+    assert convert("1 day") == "1 day"
+
+
+@pytest.mark.parametrize("column_type, length", [
+    ("varchar(10)", 10),
+    ("character varying(20)", 20),
+    ("text", None),
+])
+def test_converter_length(column_type, length):
+    assert _converter(column_type)[1] == length
+
+
+def test_column_coerce_rejects():
+    column = _Column("name", "varchar(3)", nullable=False, has_default=False)
+    with pytest.raises(RejectedRow, match="longitud"):
+        column.coerce("abcd")
+    with pytest.raises(RejectedRow, match="NOT NULL"):
+        column.coerce(None)
+    with pytest.raises(RejectedRow):
+        _Column("n", "int", True, False).coerce("x")
+    assert _Column("n", "int", True, False).coerce(None) is None
+    assert _Column("n", "int", False, True).coerce(None) is None
+
+
+def _write_csv(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("﻿id,name\n")
+        for row in rows:
+            f.write(row + "\n")
+
+
+def _read_all(path, format, offset=0, take=None):
+    """Lee registros desde offset; devuelve (registros, offset tras el último)"""
+    with _open_source(path) as binary:
+        source = _LineSource(binary)
+        records = []
+        for record, error in _records(source, format, offset, ""):
+            records.append(record if error is None else error)
+            if take is not None and len(records) == take:
+                break
+        return records, source.offset
+
+
+ROWS = ['1,a', '2,"multi\nline"', '3,', '4,"comma, inside"', '5,e', '6,f']
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".csv.gz"])
+def test_resume_from_offset_continues_after_last_record(tmp_path, suffix):
+    path = tmp_path / f"data{suffix}"
+    if suffix.endswith(".gz"):
+        plain = tmp_path / "plain.csv"
+        _write_csv(plain, ROWS)
+        path.write_bytes(gzip.compress(plain.read_bytes()))
+    else:
+        _write_csv(path, ROWS)
+    
+    everything, end = _read_all(path, "csv")
+    assert [r["id"] for r in everything] == ["1", "2", "3", "4", "5", "6"]
+    assert everything[0] == {"id": "1", "name": "a"}
+    assert everything[1]["name"] == "multi\nline"
+    assert everything[2]["name"] is None
+    
+    first, offset = _read_all(path, "csv", take=3)
+    rest, rest_end = _read_all(path, "csv", offset=offset)
+    assert first + rest == everything
+    assert rest_end == end
+
+
+def test_ndjson_resume_and_errors(tmp_path):
+    path = tmp_path / "data.ndjson"
+    lines = [json.dumps({"id": i}) for i in range(5)]
+    lines.insert(2, "{broken")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    
+    everything, _ = _read_all(path, "ndjson")
+    assert isinstance(everything[2], str) and "JSON" in everything[2]
+    
+    first, offset = _read_all(path, "ndjson", take=3)
+    rest, _ = _read_all(path, "ndjson", offset=offset)
+    assert first + rest == everything
+
+
+def test_csv_wrong_field_count_is_reported(tmp_path):
+    path = tmp_path / "data.csv"
+    _write_csv(path, ["1,a", "2", "3,c"])
+    records, _ = _read_all(path, "csv")
+    assert records[0] == {"id": "1", "name": "a"}
+    assert "campos" in records[1]
+    assert records[2] == {"id": "3", "name": "c"}
+
+
+class _FailingHandler:
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.rollbacks = 0
+    
+    def insert_many(self, table_name, columns, rows, max_rows):
+        raise RuntimeError("Query execution was interrupted")
+    
+    def is_timeout_error(self, error):
+        return self.timeout
+    
+    def commit(self):
+        pass
+    
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _patch_handler(monkeypatch, handler):
+    @contextmanager
+    def pooled_handler(connection_name=None, database=None, timeout=None):
+        yield handler
+    monkeypatch.setattr(crud_tools, "pooled_handler", pooled_handler)
+
+
+def test_row_isolation_propagates_timeouts(monkeypatch):
+    _patch_handler(monkeypatch, _FailingHandler(timeout=True))
+    rejected = []
+    with pytest.raises(RuntimeError):
+        import_tools._load_rows_individually(None, "t", [(1, {"id": 1})], None,
+                                             lambda *args: rejected.append(args))
+    assert rejected == []
+
+
+def test_row_isolation_rejects_server_errors(monkeypatch):
+    handler = _FailingHandler(timeout=False)
+    _patch_handler(monkeypatch, handler)
+    rejected = []
+    loaded = import_tools._load_rows_individually(None, "t", [(1, {"id": 1}), (2, {"id": 2})], None,
+                                                  lambda *args: rejected.append(args))
+    assert loaded == 0
+    assert [number for number, _, _ in rejected] == [1, 2]
+    assert handler.rollbacks == 2
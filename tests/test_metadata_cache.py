@@ -0,0 +1,88 @@
+"""
+Pruebas de MetadataCache: TTL, expulsión LRU e invalidación por conexión y tabla.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.database import metadata_cache
+from src.database.metadata_cache import MetadataCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(metadata_cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def _loader(calls, value):
+    def load():
+        calls.append(value)
+        return value
+    return load
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = MetadataCache(ttl=10)
+    calls = []
+    
+    assert cache.get("mysql", "columns", "users", _loader(calls, "v1")) == "v1"
+    clock[0] += 9
+    assert cache.get("mysql", "columns", "users", _loader(calls, "v2")) == "v1"
+    clock[0] += 2
+    assert cache.get("mysql", "columns", "users", _loader(calls, "v3")) == "v3"
+    
+    assert calls == ["v1", "v3"]
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_zero_ttl_disables_the_cache(clock):
+    cache = MetadataCache(ttl=0)
+    calls = []
+    cache.get("mysql", "tables", None, _loader(calls, 1))
+    cache.get("mysql", "tables", None, _loader(calls, 2))
+    assert calls == [1, 2]
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = MetadataCache(ttl=60, max_entries=2)
+    calls = []
+    cache.get("mysql", "columns", "a", _loader(calls, "a"))
+    cache.get("mysql", "columns", "b", _loader(calls, "b"))
+    cache.get("mysql", "columns", "a", _loader(calls, "a2"))
+    cache.get("mysql", "columns", "c", _loader(calls, "c"))
+    
+    cache.get("mysql", "columns", "a", _loader(calls, "a3"))
+    cache.get("mysql", "columns", "b", _loader(calls, "b2"))
+    
+    assert calls == ["a", "b", "c", "b2"]
+
+
+def test_invalidate_table_keeps_other_tables_and_drops_table_list(clock):
+    cache = MetadataCache(ttl=60)
+    for scope, kind, name in [("mysql", "tables", None), ("mysql", "columns", "users"),
+                              ("mysql", "indexes", "users"), ("mysql", "columns", "orders"),
+                              ("pg", "columns", "users")]:
+        cache.get(scope, kind, name, lambda: "cached")
+    
+    assert cache.invalidate("mysql", "users") == 3
+    
+    calls = []
+    cache.get("mysql", "columns", "orders", _loader(calls, "orders"))
+    cache.get("pg", "columns", "users", _loader(calls, "pg"))
+    cache.get("mysql", "tables", None, _loader(calls, "tables"))
+    assert calls == ["tables"]
+
+
+def test_invalidate_connection_includes_its_other_databases(clock):
+    cache = MetadataCache(ttl=60)
+    for scope in ("mysql", "mysql/reports", "mysql_replica"):
+        cache.get(scope, "tables", None, lambda: "cached")
+    
+    assert cache.invalidate("mysql") == 2
+    assert cache.get_stats()["entries"] == 1
+    assert cache.invalidate() == 1
@@ -0,0 +1,47 @@
+"""
+Pruebas de las métricas: tamaño de las respuestas sin volver a
+serializarlas y exportador Prometheus con el puerto ocupado.
+"""
+
+import json
+import logging
+import socket
+
+import pytest
+
+from src.utils import metrics
+from src.utils.response_budget import estimate_row_bytes
+
+RECORDS = [{"id": 1, "name": "ana"}, {"id": 2, "name": None}]
+
+
+@pytest.mark.parametrize("result, expected", [
+    ({"status": "success", "count": 2, "records": RECORDS, "truncated": True, "returned_bytes": 512}, (2, 512)),
+    ({"status": "success", "count": 2, "format": "columnar", "bytes": {"rows_format": 90, "columnar": 60}}, (2, 60)),
+    ({"status": "success", "count": 2, "records": RECORDS}, (2, sum(map(estimate_row_bytes, RECORDS)))),
+    ({"status": "success", "record": RECORDS[0]}, (0, estimate_row_bytes(RECORDS[0]))),
+    ({"status": "success", "rows_affected": 3}, (3, estimate_row_bytes({"status": "success", "rows_affected": 3}))),
+    ("texto", (0, 0)),
+])
+def test_result_size(result, expected):
+    assert metrics._result_size(result) == expected
+
+
+def test_result_size_does_not_serialize_the_response(monkeypatch):
+    def dumps(*args, **kwargs):
+        raise AssertionError("la respuesta no debe serializarse para medirla")
+    monkeypatch.setattr(json, "dumps", dumps)
+    
+    assert metrics._result_size({"status": "success", "count": 2, "records": RECORDS})[0] == 2
+
+
+def test_prometheus_exporter_survives_port_in_use(caplog):
+    with socket.socket() as busy:
+        busy.bind(("127.0.0.1", 0))
+        busy.listen()
+        port = busy.getsockname()[1]
+        
+        with caplog.at_level(logging.WARNING, logger=metrics.__name__):
+            metrics.start_prometheus_exporter(port=port)
+    
+    assert f"puerto {port}" in caplog.text
@@ -0,0 +1,173 @@
+"""
+Pruebas de MySQLHandler.bulk_load con un cursor simulado.
+
+El cursor lee de verdad el pipe /dev/fd/N que abre bulk_load y se comporta
+como LOAD DATA LOCAL: las claves duplicadas se descartan con una advertencia
+en lugar de fallar.
+"""
+
+from contextlib import contextmanager
+import re
+
+import pytest
+
+from src.config import get_config
+from src.database.connection import BulkLoadRejected, BulkLoadUnavailable
+from src.database.mysql_handler import MySQLHandler
+from src.tools import crud_tools
+
+
+class FakeCursor:
+    """Cursor que simula LOAD DATA LOCAL INFILE sobre una tabla con clave en la primera columna"""
+    
+    def __init__(self, existing=()):
+        self.keys = set(existing)
+        self.warning_count = 0
+        self._rows = []
+    
+    def execute(self, query, params=None):
+        if query.startswith("LOAD DATA"):
+            path = re.search(r"'(/dev/fd/\d+)'", query).group(1)
+            with open(path, "rb") as pipe:
+                lines = pipe.read().splitlines()
+            loaded = 0
+            self.warning_count = 0
+            self._rows = []
+            for line in lines:
+                key = line.split(b"\t")[0]
+                if key in self.keys:
+                    self.warning_count += 1
+                    self._rows.append({"Level": "Warning", "Code": 1062,
+                                       "Message": f"Duplicate entry '{key.decode()}' for key 'PRIMARY'"})
+                    continue
+                self.keys.add(key)
+                loaded += 1
+            return loaded
+        if query.startswith("SHOW WARNINGS"):
+            return len(self._rows)
+        return 0
+    
+    def fetchall(self):
+        return self._rows
+    
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Conexión que registra commits y rollbacks"""
+    
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+    
+    def begin(self):
+        pass
+    
+    def commit(self):
+        self.commits += 1
+    
+    def rollback(self):
+        self.rollbacks += 1
+    
+    def ping(self, reconnect=False):
+        pass
+    
+    def close(self):
+        pass
+
+
+class FakeMySQLHandler(MySQLHandler):
+    """MySQLHandler sin servidor: solo sustituye la conexión y el cursor"""
+    
+    instances = []
+    
+    def connect(self):
+        self.connection = FakeConnection()
+        self.cursor = FakeCursor()
+        self._is_connected = True
+        self._statement_timeout = None
+        FakeMySQLHandler.instances.append(self)
+    
+    def set_statement_timeout(self, timeout):
+        self._statement_timeout = timeout
+
+
+def _handler():
+    handler = FakeMySQLHandler("localhost", 3306, "test", "", "test", local_infile=True)
+    handler.connect()
+    return handler
+
+
+def test_bulk_load_loads_all_rows():
+    handler = _handler()
+    result = handler.bulk_load("users", ["id", "name"], [(1, "a"), (2, "b"), (3, "c")])
+    assert result["rows"] == 3
+    assert result["warnings"] == 0
+
+
+def test_bulk_load_duplicate_primary_key_fails():
+    handler = _handler()
+    with pytest.raises(BulkLoadRejected, match="1062"):
+        handler.bulk_load("users", ["id", "name"], [(1, "a"), (1, "b"), (2, "c")])
+
+
+def test_bulk_insert_native_path_rolls_back_on_duplicate_key(monkeypatch):
+    kwargs = dict(host="localhost", port=3306, user="test", password="", database="test",
+                  query_timeout=0, local_infile=True)
+    monkeypatch.setattr(crud_tools, "_resolve_connection",
+                        lambda name=None, database=None: ("fake_mysql_bulk", FakeMySQLHandler, kwargs))
+    monkeypatch.setattr(get_config().settings, "bulk_load_threshold", 2)
+    FakeMySQLHandler.instances.clear()
+    
+    result = crud_tools.bulk_insert("users", [{"id": 1, "name": "a"}, {"id": 1, "name": "b"}])
+    
+    assert result["status"] == "error"
+    assert "1062" in result["error"]
+    connection = FakeMySQLHandler.instances[-1].connection
+    assert connection.commits == 0
+    assert connection.rollbacks >= 1
+
+
+class _MixedHandler:
+    """Carga nativa disponible para el primer grupo de columnas y no para el resto"""
+    
+    def __init__(self):
+        self.loads = 0
+    
+    @contextmanager
+    def transaction(self):
+        yield
+    
+    def bulk_load(self, table_name, columns, rows):
+        self.loads += 1
+        if self.loads > 1:
+            raise BulkLoadUnavailable("local_infile desactivado")
+        return {"rows": len(rows)}
+    
+    def insert_many(self, table_name, columns, rows, max_rows):
+        return len(rows), 2
+
+
+@pytest.mark.parametrize("records, method, methods", [
+    ([{"id": 1}, {"id": 2}, {"id": 3, "name": "c"}, {"id": 4, "name": "d"}], "mixed",
+     {"bulk_load": 1, "insert": 2}),
+    ([{"id": 1}, {"id": 2}], "bulk_load", {"bulk_load": 1, "insert": 0}),
+])
+def test_bulk_insert_reports_method_per_group(monkeypatch, records, method, methods):
+    handler = _MixedHandler()
+    
+    @contextmanager
+    def pooled_handler(connection_name=None, database=None, timeout=None):
+        yield handler
+    monkeypatch.setattr(crud_tools, "pooled_handler", pooled_handler)
+    monkeypatch.setattr(crud_tools, "_invalidate_table", lambda connection_name, table_name: None)
+    monkeypatch.setattr(get_config().settings, "bulk_load_threshold", 2)
+    
+    result = crud_tools.bulk_insert("users", records)
+    
+    assert result["status"] == "success"
+    assert result["rows_affected"] == len(records)
+    assert result["method"] == method
+    assert result["methods"] == methods
+    assert result["statements"] == sum(methods.values())
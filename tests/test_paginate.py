@@ -0,0 +1,99 @@
+"""
+Pruebas de paginate_records: columnas nulas en order_by y tokens con
+valores tipados (fechas, decimales, binarios).
+"""
+
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+import itertools
+
+import pytest
+
+from src.tools import crud_tools
+from src.tools.crud_tools import _decode_page_token, _encode_page_token, _nullable_columns
+
+_scopes = itertools.count()
+
+
+class _PageHandler:
+    """Handler que devuelve filas fijas y guarda la última consulta"""
+    
+    def __init__(self, rows, nullable=("note",)):
+        self.cache_scope = f"paginate/{next(_scopes)}"
+        self.rows = rows
+        self.nullable = nullable
+        self.queries = []
+    
+    def get_indexes(self, table_name):
+        return [{"name": "PRIMARY", "columns": ["id"], "unique": True, "primary": True, "nullable": False}]
+    
+    def get_table_schema(self, table_name):
+        return [{"Field": name, "Type": "varchar(10)", "Null": "YES" if name in self.nullable else "NO"}
+                for name in ("id", "created_at", "note")]
+    
+    def fetch_all(self, query, params=None):
+        self.queries.append((query, params))
+        return self.rows
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    handler = _PageHandler([
+        {"id": 1, "created_at": datetime(2024, 1, 1, 8, 30), "note": None},
+        {"id": 2, "created_at": datetime(2024, 1, 2, 9, 45, 0, 123456), "note": "b"},
+        {"id": 3, "created_at": datetime(2024, 1, 3), "note": "c"},
+    ])
+    
+    @contextmanager
+    def pooled_handler(connection_name=None, database=None, timeout=None):
+        yield handler
+    monkeypatch.setattr(crud_tools, "pooled_handler", pooled_handler)
+    return handler
+
+
+@pytest.mark.parametrize("value", [
+    datetime(2024, 1, 2, 9, 45, 0, 123456),
+    datetime(2024, 1, 2, 9, 45, tzinfo=timezone.utc),
+    date(2024, 1, 2),
+    time(9, 45, 30),
+    timedelta(days=-1, seconds=5, microseconds=7),
+    Decimal("12.3400"),
+    b"\x00\xff\x10",
+    "texto",
+    42,
+    None,
+])
+def test_page_token_keeps_value_types(value):
+    decoded = _decode_page_token(_encode_page_token("sig", [value, 7]), "sig")
+    
+    assert decoded == [value, 7]
+    assert type(decoded[0]) is type(value)
+
+
+def test_paginate_seeks_from_datetime(handler):
+    first = crud_tools.paginate_records("events", order_by="created_at", page_size=2)
+    assert first["has_more"]
+    
+    crud_tools.paginate_records("events", order_by="created_at", page_size=2,
+                                page_token=first["next_page_token"])
+    
+    query, params = handler.queries[-1]
+    assert "(created_at, id) > (%s, %s)" in query
+    assert params == (datetime(2024, 1, 2, 9, 45, 0, 123456), 2)
+
+
+def test_paginate_rejects_nullable_order_column(handler):
+    result = crud_tools.paginate_records("events", order_by="note", page_size=2)
+    
+    assert result["status"] == "error"
+    assert "NULL" in result["error"]
+    assert handler.queries == []
+
+
+def test_nullable_columns_for_both_engines():
+    mysql = [{"Field": "id", "Null": "NO"}, {"Field": "Note", "Null": "YES"}]
+    postgres = [{"column_name": "id", "is_nullable": "NO"}, {"column_name": "note", "is_nullable": "YES"}]
+    
+    assert _nullable_columns(mysql) == {"note"}
+    assert _nullable_columns(postgres) == {"note"}
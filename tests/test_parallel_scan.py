@@ -0,0 +1,146 @@
+"""
+Pruebas del reparto de rangos del modo paralelo: split_key_range,
+key_ranges y el plan de consultas de crud_tools._plan_parallel_scan.
+"""
+
+import itertools
+
+import pytest
+
+from src.database.parallel_scan import key_ranges, split_key_range
+from src.tools.crud_tools import _plan_parallel_scan
+
+_scopes = itertools.count()
+
+
+def _range_of(ranges, key):
+    """Índices de los rangos [desde, hasta) que contienen key"""
+    return [i for i, (start, end) in enumerate(ranges)
+            if (start is None or key >= start) and (end is None or key < end)]
+
+
+def test_split_even():
+    assert split_key_range(1, 1000, 4) == [251, 501, 751]
+    assert split_key_range(0, 99, 2) == [50]
+
+
+@pytest.mark.parametrize("low, high, partitions", [
+    (5, 5, 4),
+    (10, 1, 4),
+    (1, 1000, 1),
+    (1, 1000, 0),
+])
+def test_split_unsplittable(low, high, partitions):
+    assert split_key_range(low, high, partitions) == []
+
+
+def test_split_small_range_deduplicates_boundaries():
+    assert split_key_range(1, 3, 8) == [2, 3]
+
+
+def test_split_uses_histogram_quantiles_across_gaps():
+    histogram = [1, 2, 3, 4, 5, 1000, 2000, 3000, 4000, 5000, 100000]
+    
+    assert split_key_range(1, 100000, 2, histogram) == [1000]
+    assert split_key_range(1, 100000, 5, histogram) == [3, 5, 2000, 4000]
+
+
+def test_split_ignores_short_histogram():
+    assert split_key_range(1, 1000, 4, [1, 500, 1000]) == [251, 501, 751]
+
+
+def test_split_drops_stale_histogram_bounds_outside_range():
+    assert split_key_range(10, 20, 2, [0, 5, 30, 40, 50]) == []
+
+
+def test_key_ranges_are_open_ended():
+    assert key_ranges([]) == [(None, None)]
+    assert key_ranges([10, 20]) == [(None, 10), (10, 20), (20, None)]
+
+
+@pytest.mark.parametrize("low, high, partitions, histogram", [
+    (1, 1000, 4, None),
+    (-50, 50, 7, None),
+    (1, 3, 8, None),
+    (1, 100000, 5, [1, 2, 3, 4, 5, 1000, 2000, 3000, 4000, 5000, 100000]),
+])
+def test_key_ranges_cover_every_key_once(low, high, partitions, histogram):
+    ranges = key_ranges(split_key_range(low, high, partitions, histogram))
+    keys = set(range(low - 10, high + 10)) | set(histogram or [])
+    
+    assert all(len(_range_of(ranges, key)) == 1 for key in keys)
+
+
+class _FakeHandler:
+    """Handler mínimo con índices, límites MIN/MAX e histograma fijos"""
+    
+    def __init__(self, low, high, histogram=None, key=("id",)):
+        self.cache_scope = f"test/{next(_scopes)}"
+        self.low, self.high, self.histogram, self.key = low, high, histogram, list(key)
+        self.bounds = None
+    
+    def get_indexes(self, table_name):
+        return [{"name": "PRIMARY", "columns": self.key, "unique": True, "primary": True, "nullable": False}]
+    
+    def fetch_one(self, query, params=None):
+        self.bounds = (query, params)
+        return {"low": self.low, "high": self.high}
+    
+    def key_histogram(self, table_name, key):
+        if isinstance(self.histogram, Exception):
+            raise self.histogram
+        return self.histogram
+
+
+def test_plan_builds_range_queries_with_filters():
+    handler = _FakeHandler(1, 1000)
+    
+    queries, ordered = _plan_parallel_scan(handler, "events", ["id", "name"], {"kind": "a"}, None, 10, 4)
+    
+    assert not ordered
+    assert handler.bounds == ("SELECT MIN(id) AS low, MAX(id) AS high FROM events WHERE kind = %s", ("a",))
+    assert queries == [
+        ("SELECT id, name FROM events WHERE kind = %s AND id < %s LIMIT 10", ("a", 251)),
+        ("SELECT id, name FROM events WHERE kind = %s AND id >= %s AND id < %s LIMIT 10", ("a", 251, 501)),
+        ("SELECT id, name FROM events WHERE kind = %s AND id >= %s AND id < %s LIMIT 10", ("a", 501, 751)),
+        ("SELECT id, name FROM events WHERE kind = %s AND id >= %s LIMIT 10", ("a", 751)),
+    ]
+
+
+def test_plan_descending_reverses_ranges():
+    queries, ordered = _plan_parallel_scan(_FakeHandler(0, 99), "events", None, None, "id DESC", None, 2)
+    
+    assert ordered
+    assert queries == [
+        ("SELECT * FROM events WHERE id >= %s ORDER BY id DESC", (50,)),
+        ("SELECT * FROM events WHERE id < %s ORDER BY id DESC", (50,)),
+    ]
+
+
+def test_plan_uses_histogram_and_survives_its_failure():
+    histogram = [1, 2, 3, 4, 5, 1000, 2000, 3000, 4000, 5000, 100000]
+    queries, _ = _plan_parallel_scan(_FakeHandler(1, 100000, histogram), "events", None, None, "id", None, 2)
+    assert [params for _, params in queries] == [(1000,), (1000,)]
+    
+    queries, _ = _plan_parallel_scan(_FakeHandler(0, 99, RuntimeError("sin pg_stats")), "events",
+                                     None, None, None, None, 2)
+    assert [params for _, params in queries] == [(50,), (50,)]
+
+
+def test_plan_empty_table_runs_a_single_query():
+    queries, ordered = _plan_parallel_scan(_FakeHandler(None, None), "events", None, None, "id", 5, 4)
+    
+    assert queries == [("SELECT * FROM events ORDER BY id LIMIT 5", ())]
+    assert ordered
+
+
+@pytest.mark.parametrize("handler, order_by, message", [
+    (_FakeHandler(1, 10, key=("a", "b")), None, "una sola columna"),
+    (_FakeHandler(1, 10), "name", "solo se puede ordenar"),
+    (_FakeHandler(1, 10), "id, name", "solo se puede ordenar"),
+    (_FakeHandler("a", "z"), None, "clave entera"),
+    (_FakeHandler(False, True), None, "clave entera"),
+])
+def test_plan_rejects_unsupported_tables(handler, order_by, message):
+    with pytest.raises(ValueError, match=message):
+        _plan_parallel_scan(handler, "events", None, None, order_by, None, 4)
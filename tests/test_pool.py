@@ -0,0 +1,193 @@
+"""
+Pruebas del pool acotado de handlers (_HandlerPool): espera al máximo,
+PoolTimeoutError, reseteo de sesión al devolver y validación antes de prestar.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.database.connection import DatabaseHandler, PoolTimeoutError, _HandlerPool
+
+
+class PoolHandler(DatabaseHandler):
+    """Handler sin servidor: ping falla si alive es False y rollback cuenta las llamadas"""
+    
+    def __init__(self, query_timeout=30):
+        super().__init__("fake", 0, "test", "", "test", query_timeout=query_timeout)
+        self.alive = True
+        self.rollbacks = 0
+        self.fail_rollback = False
+    
+    def connect(self):
+        self._is_connected = True
+    
+    def disconnect(self):
+        self._is_connected = False
+    
+    def execute_query(self, query, params=None):
+        return 0
+    
+    def fetch_one(self, query, params=None):
+        if not self.alive:
+            raise ConnectionError("server has gone away")
+        return {"1": 1}
+    
+    def fetch_all(self, query, params=None):
+        return []
+    
+    def begin_transaction(self):
+        pass
+    
+    def commit(self):
+        pass
+    
+    def rollback(self):
+        if self.fail_rollback:
+            raise ConnectionError("lost connection")
+        self.rollbacks += 1
+    
+    def get_last_insert_id(self):
+        return None
+
+
+def _pool(max_size=2, timeout=5, min_idle=0, max_idle=10, max_lifetime=3600,
+          idle_timeout=600, validate_after=30):
+    return _HandlerPool("fake", PoolHandler, {}, max_size, timeout, min_idle, max_idle,
+                        max_lifetime, idle_timeout, validate_after)
+
+
+def test_acquire_waits_at_max_size_until_release():
+    pool = _pool(max_size=2)
+    first, second = pool.acquire(), pool.acquire()
+    leased = []
+    waiter = threading.Thread(target=lambda: leased.append(pool.acquire(timeout=5)))
+    waiter.start()
+    
+    time.sleep(0.1)
+    assert leased == []
+    assert pool.stats()["waiting"] == 1
+    
+    pool.release(first)
+    waiter.join(1)
+    assert leased == [first]
+    assert pool.stats()["total_created"] == 2
+    pool.release(second)
+
+
+def test_acquire_times_out_when_pool_is_exhausted():
+    pool = _pool(max_size=1)
+    handler = pool.acquire()
+    
+    started = time.monotonic()
+    with pytest.raises(PoolTimeoutError, match="agotado"):
+        pool.acquire(timeout=0.1)
+    
+    assert time.monotonic() - started >= 0.1
+    assert pool.stats()["total_timeouts"] == 1
+    pool.release(handler)
+    assert pool.acquire(timeout=0.1) is handler
+
+
+def test_concurrent_leases_never_exceed_max_size():
+    pool = _pool(max_size=3)
+    lock = threading.Lock()
+    in_use = set()
+    peak = []
+    errors = []
+    
+    def worker():
+        try:
+            for _ in range(50):
+                handler = pool.acquire(timeout=5)
+                with lock:
+                    assert handler not in in_use
+                    in_use.add(handler)
+                    peak.append(len(in_use))
+                time.sleep(0.0005)
+                with lock:
+                    in_use.discard(handler)
+                pool.release(handler)
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert max(peak) <= 3
+    stats = pool.stats()
+    assert stats["total_created"] <= 3
+    assert stats["idle_connections"] == stats["total_connections"]
+
+
+def test_release_resets_the_session():
+    pool = _pool()
+    handler = pool.acquire()
+    handler.set_statement_timeout(None)
+    
+    pool.release(handler)
+    
+    assert handler.rollbacks == 1
+    assert handler._statement_timeout == handler.query_timeout
+    assert pool.acquire() is handler
+
+
+def test_release_evicts_handler_whose_reset_fails():
+    pool = _pool(max_size=1)
+    handler = pool.acquire()
+    handler.fail_rollback = True
+    
+    pool.release(handler)
+    
+    assert not handler.is_connected
+    assert pool.stats()["total_evicted"] == 1
+    assert pool.acquire(timeout=0.1) is not handler
+
+
+def test_idle_handler_is_validated_before_lease():
+    pool = _pool(validate_after=0)
+    handler = pool.acquire()
+    pool.release(handler)
+    time.sleep(0.01)
+    
+    assert pool.acquire() is handler
+    assert pool.stats()["total_pings"] == 1
+    
+    pool.release(handler)
+    handler.alive = False
+    time.sleep(0.01)
+    
+    replacement = pool.acquire()
+    assert replacement is not handler
+    assert not handler.is_connected
+    stats = pool.stats()
+    assert stats["total_dead"] == 1
+    assert stats["total_connections"] == 1
+
+
+def test_keepalive_evicts_dead_idle_handlers():
+    pool = _pool(max_size=3)
+    handlers = [pool.acquire() for _ in range(3)]
+    for handler in handlers:
+        pool.release(handler)
+    handlers[1].alive = False
+    
+    assert pool.keepalive(0) == 1
+    assert pool.stats()["idle_connections"] == 2
+    assert not handlers[1].is_connected
+
+
+def test_evict_idle_keeps_min_idle():
+    pool = _pool(max_size=3, min_idle=1, idle_timeout=0.01)
+    handlers = [pool.acquire() for _ in range(3)]
+    for handler in handlers:
+        pool.release(handler)
+    time.sleep(0.02)
+    
+    assert pool.evict_idle() == 2
+    assert pool.stats()["idle_connections"] == 1
@@ -0,0 +1,122 @@
+"""
+Pruebas de las sentencias preparadas de PostgreSQLHandler tras cambios de esquema.
+"""
+
+import psycopg2.errors
+import psycopg2.extensions
+import pytest
+
+from src.database.postgres_handler import PostgreSQLHandler
+
+
+class FakeSession:
+    """Sesión simulada: ALTER invalida los planes preparados antes de él"""
+    
+    def __init__(self):
+        self.schema_version = 0
+        self.prepared = {}
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+
+
+class FakeCursor:
+    def __init__(self, session):
+        self.session = session
+        self.rowcount = 0
+    
+    def execute(self, query, params=None):
+        session = self.session
+        if query.startswith("PREPARE"):
+            session.prepared[query.split()[1]] = session.schema_version
+        elif query.startswith("EXECUTE"):
+            name = query.split()[1]
+            session.status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+            if session.prepared[name] != session.schema_version:
+                session.status = psycopg2.extensions.TRANSACTION_STATUS_INERROR
+                raise psycopg2.errors.FeatureNotSupported("cached plan must not change result type")
+        elif query == "DEALLOCATE ALL":
+            session.prepared.clear()
+        elif query.startswith("DEALLOCATE"):
+            session.prepared.pop(query.split()[1], None)
+        elif query.startswith("ALTER"):
+            session.schema_version += 1
+    
+    def fetchone(self):
+        return {"id": 1}
+    
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, session):
+        self.session = session
+        self.closed = 0
+    
+    def get_transaction_status(self):
+        return self.session.status
+    
+    def rollback(self):
+        self.session.rollbacks += 1
+        self.session.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    
+    def commit(self):
+        self.session.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    
+    def close(self):
+        self.closed = 1
+
+
+class FakePostgreSQLHandler(PostgreSQLHandler):
+    def connect(self):
+        self.session = FakeSession()
+        self.connection = FakeConnection(self.session)
+        self.cursor = FakeCursor(self.session)
+        self._is_connected = True
+
+
+@pytest.fixture
+def handler():
+    handler = FakePostgreSQLHandler("localhost", 5432, "test", "", "test", statement_cache_size=10)
+    handler.connect()
+    return handler
+
+
+QUERY = "SELECT * FROM users WHERE id = %s"
+
+
+def test_prepared_statement_is_reused(handler):
+    handler.fetch_one_prepared(QUERY, (1,))
+    handler.connection.rollback()
+    handler.fetch_one_prepared(QUERY, (2,))
+    assert handler.statements.get_stats()["hits"] >= 1
+    assert len(handler.session.prepared) == 1
+
+
+def test_plan_changed_by_other_session_is_reprepared(handler):
+    handler.fetch_one_prepared(QUERY, (1,))
+    handler.connection.rollback()
+    # ALTER TABLE desde otra sesión: la caché local no se entera
+    handler.session.schema_version += 1
+    
+    assert handler.fetch_one_prepared(QUERY, (1,)) == {"id": 1}
+    assert handler.session.rollbacks == 2
+    assert handler.statements.invalidations == 1
+    assert len(handler.session.prepared) == 1
+
+
+def test_plan_changed_inside_transaction_raises_and_forgets(handler):
+    handler.fetch_one_prepared(QUERY, (1,))
+    handler.session.schema_version += 1
+    
+    with pytest.raises(psycopg2.errors.FeatureNotSupported):
+        handler.fetch_one_prepared(QUERY, (1,))
+    handler.connection.rollback()
+    assert handler.fetch_one_prepared(QUERY, (1,)) == {"id": 1}
+
+
+def test_ddl_clears_statement_cache(handler):
+    handler.fetch_one_prepared(QUERY, (1,))
+    handler.execute_query("ALTER TABLE users ADD COLUMN age int")
+    assert len(handler.statements) == 0
+    assert handler.session.prepared == {}
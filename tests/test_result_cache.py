@@ -0,0 +1,116 @@
+"""
+Pruebas de ResultCache: TTL global y por tabla, límite de bytes e
+invalidación por tabla y conexión, también desde las herramientas CRUD.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.config import get_config
+from src.database import result_cache
+from src.database.result_cache import ResultCache
+from src.tools import crud_tools
+
+QUERY = "SELECT * FROM users WHERE id = %s"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResultCache(ttl=10)
+    cache.put("mysql", "users", QUERY, (1,), {"id": 1})
+    
+    clock[0] += 9
+    assert cache.get("mysql", "SELECT *  FROM users\n WHERE id = %s", (1,)) == (True, {"id": 1})
+    assert cache.get("mysql", QUERY, (2,)) == (False, None)
+    clock[0] += 2
+    assert cache.get("mysql", QUERY, (1,)) == (False, None)
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_table_ttls_override_and_disable(clock):
+    cache = ResultCache(ttl=10, table_ttls={"`Orders`": 60, "audit": 0})
+    
+    assert not cache.put("mysql", "audit", "SELECT * FROM audit", None, [])
+    assert cache.put("mysql", "orders", "SELECT * FROM orders", None, [])
+    clock[0] += 30
+    assert cache.get("mysql", "SELECT * FROM orders", None)[0]
+
+
+def test_byte_limit_evicts_least_recently_used():
+    cache = ResultCache(max_bytes=40)
+    cache.put("mysql", "users", QUERY, (1,), "x" * 15)
+    cache.put("mysql", "users", QUERY, (2,), "y" * 15)
+    cache.get("mysql", QUERY, (1,))
+    cache.put("mysql", "users", QUERY, (3,), "z" * 15)
+    
+    assert cache.get("mysql", QUERY, (1,))[0]
+    assert not cache.get("mysql", QUERY, (2,))[0]
+    assert cache.get_stats()["evictions"] == 1
+    assert not cache.put("mysql", "users", QUERY, (4,), "w" * 100)
+
+
+def test_invalidate_table_covers_every_database_of_the_connection():
+    cache = ResultCache()
+    cache.put("mysql", "users", QUERY, (1,), 1)
+    cache.put("mysql/reports", "Users", QUERY, (1,), 2)
+    cache.put("mysql", "orders", "SELECT * FROM orders", None, 3)
+    cache.put("pg", "users", QUERY, (1,), 4)
+    
+    assert cache.invalidate_table("mysql", "users") == 2
+    assert cache.get("mysql", "SELECT * FROM orders", None)[0]
+    assert cache.get("pg", QUERY, (1,))[0]
+    assert cache.invalidate_connection("mysql") == 1
+    assert cache.get_stats()["entries"] == 1
+
+
+def test_stale_generation_is_not_stored():
+    cache = ResultCache()
+    generation = cache.generation("mysql", "users")
+    cache.invalidate_table("mysql", "users")
+    
+    assert not cache.put("mysql", "users", QUERY, (1,), 1, generation)
+    assert cache.put("mysql", "users", QUERY, (1,), 1, cache.generation("mysql", "users"))
+
+
+@pytest.fixture
+def tool_cache(monkeypatch):
+    cache = ResultCache()
+    monkeypatch.setattr(result_cache, "_result_cache", cache)
+    monkeypatch.setattr(get_config().settings, "result_cache_enabled", True)
+    monkeypatch.setattr(crud_tools, "_resolve_connection",
+                        lambda connection_name=None, database=None: ("mysql_local", None, {}))
+    return cache
+
+
+def test_writes_invalidate_cached_reads(tool_cache):
+    loads = []
+    
+    def read():
+        loads.append(1)
+        return [{"id": 1}]
+    
+    assert crud_tools._cached_read("mysql_local", "users", QUERY, (1,), read) == ([{"id": 1}], False)
+    assert crud_tools._cached_read("mysql_local", "users", QUERY, (1,), read) == ([{"id": 1}], True)
+    
+    crud_tools._invalidate_table("mysql_local", "users")
+    
+    assert crud_tools._cached_read("mysql_local", "users", QUERY, (1,), read) == ([{"id": 1}], False)
+    assert len(loads) == 2
+
+
+def test_read_racing_a_write_is_not_cached(tool_cache):
+    def read():
+        # Otra herramienta escribe en la tabla mientras se lee
+        crud_tools._invalidate_table("mysql_local", "users")
+        return [{"id": 1}]
+    
+    crud_tools._cached_read("mysql_local", "users", QUERY, (1,), read)
+    
+    assert tool_cache.get_stats()["entries"] == 0